@@ -0,0 +1,28 @@
+"""
+Scripted chat model settings for benchmarking the memory graph offline.
+
+The benchmarks drive `test_utils.scripted_model.ScriptedChatModel`, the same
+model the offline tests use. Every user turn may be remembered here (unmatched
+turns included), and `tool_call_rate` picks which ones deterministically from
+the seed in call order. Pass the model to the graph with `Context(chat_model=...)`.
+"""
+
+from test_utils.scripted_model import DEFAULT_SCENARIOS, Scenario, ScriptedChatModel
+
+BENCHMARK_SCENARIOS = [
+    *(s for s in DEFAULT_SCENARIOS if s.pattern != "."),
+    Scenario(pattern=".", category="other", remember=True, reply="Thanks for sharing! Tell me more."),
+]
+
+
+def benchmark_model(
+    *, latency: float = 0.0, jitter: float = 0.0, tool_call_rate: float = 0.3, seed: int = 0
+) -> ScriptedChatModel:
+    """Return a scripted model that proposes a memory on `tool_call_rate` of user turns."""
+    return ScriptedChatModel(
+        scenarios=BENCHMARK_SCENARIOS,
+        latency=latency,
+        jitter=jitter,
+        remember_rate=tool_call_rate,
+        seed=seed,
+    )
@@ -0,0 +1,177 @@
+"""
+Concurrent load generator for the memory graph.
+
+Simulates many users and threads talking to `builder` compiled with an
+InMemoryStore and MemorySaver, using the deterministic scripted model so no network
+is involved. Interrupts are resumed with "accept" or "reject" at a configurable
+rate. Reports throughput, turn latency, per-node/stage latency percentiles and
+memory growth, and appends the report to bench_output.txt.
+
+Usage (from the repository root):
+    python -m benchmarks.load --users 50 --threads-per-user 2 --turns 10 --concurrency 32 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+OUTPUT_PATH = REPO_ROOT / "bench_output.txt"
+sys.path.insert(0, str(REPO_ROOT / "expert_src"))
+
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.store.memory import InMemoryStore  # noqa: E402
+from langgraph.types import Command  # noqa: E402
+
+from benchmarks.fake_model import benchmark_model  # noqa: E402
+from test_utils.scripted_model import stable_fraction  # noqa: E402
+
+UTTERANCES = [
+    "I work as a data scientist at Google and love my job.",
+    "My favorite hobby is playing guitar every evening.",
+    "I just got promoted to engineering manager on my team.",
+    "We adopted a pet dog last weekend and the family is thrilled.",
+    "The weather has been strange lately.",
+    "I'm learning to cook Thai food on weekends.",
+    "Our office is moving to a new building next month.",
+    "I read a book about the history of maps.",
+]
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99 of `values` in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "mean_ms": statistics.fmean(values) * 1000}
+
+
+def rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def simulate_thread(graph, model, user_id: str, thread_id: str, args, turn_latencies: list, counters: dict):
+    from memory_agent.context import Context
+
+    config = {"configurable": {"thread_id": thread_id, "user_id": user_id}}
+    context = Context(user_id=user_id, chat_model=model)
+    for turn in range(args.turns):
+        text = UTTERANCES[int(stable_fraction(args.seed, thread_id, turn) * len(UTTERANCES))]
+        start = time.perf_counter()
+        res = await graph.ainvoke({"messages": [("user", text)]}, config, context=context)
+        while "__interrupt__" in res:
+            counters["interrupts"] += 1
+            decision = "accept" if stable_fraction(args.seed, "resume", thread_id, turn) < args.accept_rate else "reject"
+            counters[decision] += 1
+            res = await graph.ainvoke(Command(resume=decision), config, context=context)
+        turn_latencies.append(time.perf_counter() - start)
+        counters["turns"] += 1
+
+
+async def run(args) -> dict:
+    from memory_agent import tracing
+    from memory_agent.graph import builder
+
+    model = benchmark_model(
+        latency=args.latency, jitter=args.jitter, tool_call_rate=args.tool_call_rate, seed=args.seed
+    )
+    tracing.enable()
+    tracing.tracer.reset()
+
+    store = InMemoryStore()
+    graph = builder.compile(store=store, checkpointer=MemorySaver())
+
+    tracemalloc.start()
+    rss_before = rss_mb()
+    turn_latencies: list[float] = []
+    counters = {"turns": 0, "interrupts": 0, "accept": 0, "reject": 0}
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(user_id: str, thread_id: str):
+        async with slots:
+            await simulate_thread(graph, model, user_id, thread_id, args, turn_latencies, counters)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            bounded(f"user-{u}", f"thread-{u}-{t}")
+            for u in range(args.users)
+            for t in range(args.threads_per_user)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "config": vars(args),
+        "wall_s": elapsed,
+        "throughput_turns_per_s": counters["turns"] / elapsed if elapsed else 0.0,
+        "counters": counters,
+        "turn_latency": percentiles(turn_latencies),
+        "stages": tracing.tracer.snapshot(),
+        "memory": {
+            "tracemalloc_current_mb": current / 2**20,
+            "tracemalloc_peak_mb": peak / 2**20,
+            "rss_peak_before_mb": rss_before,
+            "rss_peak_after_mb": rss_mb(),
+        },
+    }
+
+
+def format_report(result: dict) -> str:
+    cfg = result["config"]
+    lines = [
+        f"== load: {cfg['users']} users x {cfg['threads_per_user']} threads x {cfg['turns']} turns, "
+        f"concurrency {cfg['concurrency']}, model latency {cfg['latency']}s ==",
+        f"wall time: {result['wall_s']:.2f}s  throughput: {result['throughput_turns_per_s']:.1f} turns/s",
+        f"counters: {json.dumps(result['counters'])}",
+        "turn latency: " + "  ".join(f"{k} {v:.1f}" for k, v in result["turn_latency"].items()),
+        "stage latency (ms):",
+    ]
+    for name, s in result["stages"].items():
+        lines.append(
+            f"  {name:<28} n={s['count']:<6} p50 {s['p50'] * 1000:8.2f}  p95 {s['p95'] * 1000:8.2f}  p99 {s['p99'] * 1000:8.2f}"
+        )
+    mem = result["memory"]
+    lines.append(
+        f"memory: tracemalloc current {mem['tracemalloc_current_mb']:.1f} MB, peak {mem['tracemalloc_peak_mb']:.1f} MB; "
+        f"RSS peak {mem['rss_peak_before_mb']:.1f} -> {mem['rss_peak_after_mb']:.1f} MB"
+    )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the memory graph with concurrent simulated users.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--threads-per-user", type=int, default=2)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=32, help="threads in flight at once")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake model seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--tool-call-rate", type=float, default=0.3)
+    parser.add_argument("--accept-rate", type=float, default=0.8, help="share of interrupts resumed with accept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the raw result as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    report = format_report(result)
+    print(json.dumps(result, indent=2) if args.json else report)
+    with open(OUTPUT_PATH, "a") as f:
+        f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
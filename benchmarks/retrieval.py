@@ -0,0 +1,274 @@
+"""
+Retrieval scaling benchmark for the memory store.
+
+Measures the search `call_model` issues, `asearch(("memories", user_id, category),
+query=..., limit=10)`, as the store grows, for each store backend and index
+type. Items are spread round-robin over --users user namespaces, so the sharded
+backend distributes them across its shards; queries go to random users. Every
+case runs in a fresh interpreter so memory numbers are not polluted by earlier
+cases. For each case we report population time (writes without indexing),
+indexing time (rewriting the same items with the index enabled), RSS growth
+and search latency percentiles measured after one warmup query.
+
+Once a backend/index pair exceeds --build-budget or --query-budget at some size,
+larger sizes are skipped for it and recorded as "over_budget". That is the size
+where the backend falls over.
+
+One JSON object per case is appended to --out (JSONL), and a summary table is
+appended to bench_output.txt.
+
+Usage (from the repository root):
+    python -m benchmarks.retrieval --sizes 10,1000,100000 --backends memory,sqlite --indexes none,vector
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import pathlib
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+SRC_PATH = REPO_ROOT / "expert_src"
+OUTPUT_PATH = REPO_ROOT / "bench_output.txt"
+RESULTS_PATH = REPO_ROOT / "bench_retrieval.jsonl"
+
+BACKENDS = ("memory", "sqlite", "sharded")
+INDEXES = ("none", "vector")
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+EMBED_DIMS = 64
+PUT_BATCH = 1000
+
+VOCABULARY = (
+    "guitar hiking coffee python manager google family dog cat travel japan cooking "
+    "running piano books movies startup promotion garden chess soccer vegan sushi "
+    "paris climbing photography painting podcast marathon yoga wine jazz sister"
+).split()
+
+
+def fake_embed(texts: list[str]) -> list[list[float]]:
+    """Deterministic hashing-trick embedding, so no embedding API is needed."""
+    vectors = []
+    for text in texts:
+        vec = [0.0] * EMBED_DIMS
+        for word in text.lower().split():
+            h = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little")
+            vec[h % EMBED_DIMS] += 1.0 if h & 1 << 31 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        vectors.append([v / norm for v in vec])
+    return vectors
+
+
+def memory_text(rng: random.Random) -> str:
+    return "User mentioned " + " ".join(rng.choices(VOCABULARY, k=8))
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def user_namespace(user: int) -> tuple[str, ...]:
+    return ("memories", f"bench-user-{user}", "personal")
+
+
+def index_config(index: str):
+    if index == "none":
+        return None
+    return {"dims": EMBED_DIMS, "embed": fake_embed, "fields": ["content"]}
+
+
+async def open_store(backend: str, index: str, workdir: str):
+    """Return the store and, for SQLite, the context manager to exit when done."""
+    from langgraph.store.memory import InMemoryStore
+
+    if backend == "memory":
+        return InMemoryStore(index=index_config(index)), None
+    if backend == "sharded":
+        from memory_agent.sharding import ShardedStore
+
+        return ShardedStore([InMemoryStore(index=index_config(index)) for _ in range(4)]), None
+    if backend == "sqlite":
+        from langgraph.store.sqlite.aio import AsyncSqliteStore
+
+        # The vector index needs the sqlite-vec extension; setup() fails without it.
+        cm = AsyncSqliteStore.from_conn_string(os.path.join(workdir, "store.db"), index=index_config(index))
+        store = await cm.__aenter__()
+        await store.setup()
+        return store, cm
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+async def run_case(backend: str, index: str, size: int, queries: int, seed: int, users: int) -> dict:
+    from langgraph.store.base import PutOp
+
+    if queries < 1 or users < 1:
+        raise ValueError("queries and users must be at least 1")
+    rng = random.Random(seed)
+    items = [
+        (user_namespace(i % users), f"mem-{i}", {"content": memory_text(rng), "context": "benchmark"})
+        for i in range(size)
+    ]
+    with tempfile.TemporaryDirectory() as workdir:
+        rss_start = rss_mb()
+        store, cm = await open_store(backend, index, workdir)
+        try:
+
+            async def write(index_items: bool) -> float:
+                start = time.perf_counter()
+                for offset in range(0, size, PUT_BATCH):
+                    await store.abatch(
+                        [
+                            PutOp(namespace, key, value, index=None if index_items else False)
+                            for namespace, key, value in items[offset : offset + PUT_BATCH]
+                        ]
+                    )
+                return time.perf_counter() - start
+
+            populate_s = await write(index_items=False)
+            index_s = await write(index_items=True) if index != "none" else 0.0
+            rss_built = rss_mb()
+
+            def query() -> tuple[tuple[str, ...], str]:
+                return user_namespace(rng.randrange(min(users, size) or 1)), " ".join(rng.choices(VOCABULARY, k=4))
+
+            # Warm caches and lazily built structures before timing.
+            namespace, text = query()
+            await store.asearch(namespace, query=text, limit=10)
+
+            latencies = []
+            hits = 0
+            for _ in range(queries):
+                namespace, text = query()
+                t0 = time.perf_counter()
+                results = await store.asearch(namespace, query=text, limit=10)
+                latencies.append(time.perf_counter() - t0)
+                hits += len(results)
+        finally:
+            if cm is not None:
+                await cm.__aexit__(None, None, None)
+
+    latencies.sort()
+    return {
+        "backend": backend,
+        "index": index,
+        "size": size,
+        "users": users,
+        "status": "ok",
+        "populate_s": populate_s,
+        "index_s": index_s,
+        "build_s": populate_s + index_s,
+        "rss_growth_mb": rss_built - rss_start,
+        "queries": queries,
+        "results_per_query": hits / queries,
+        "search_ms": {
+            "p50": latencies[len(latencies) // 2] * 1000,
+            "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000,
+            "p99": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+            "mean": statistics.fmean(latencies) * 1000,
+        },
+    }
+
+
+def run_isolated(backend: str, index: str, size: int, args: argparse.Namespace) -> dict:
+    """Run one case in a fresh interpreter and return its result."""
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.retrieval",
+        "--case",
+        f"{backend}:{index}:{size}",
+        "--queries",
+        str(args.queries),
+        "--seed",
+        str(args.seed),
+        "--users",
+        str(args.users),
+    ]
+    try:
+        proc = subprocess.run(
+            cmd, cwd=REPO_ROOT, capture_output=True, text=True, timeout=args.case_timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"backend": backend, "index": index, "size": size, "status": "timeout"}
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+        return {"backend": backend, "index": index, "size": size, "status": "error", "error": error}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def format_row(result: dict) -> str:
+    label = f"{result['backend']:>8} {result['index']:>6} {result['size']:>9}"
+    if result["status"] != "ok":
+        return f"{label}  {result['status']} {result.get('error', '')}".rstrip()
+    s = result["search_ms"]
+    return (
+        f"{label}  populate {result['populate_s']:8.2f} s  index {result['index_s']:8.2f} s  rss +{result['rss_growth_mb']:7.1f} MB  "
+        f"search p50 {s['p50']:8.2f}  p95 {s['p95']:8.2f}  p99 {s['p99']:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory retrieval latency as namespaces grow.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--indexes", default=",".join(INDEXES))
+    parser.add_argument("--queries", type=int, default=200, help="searches per case")
+    parser.add_argument("--users", type=int, default=16, help="user namespaces the items are spread over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--build-budget", type=float, default=300.0, help="seconds before larger sizes are skipped")
+    parser.add_argument("--query-budget", type=float, default=100.0, help="p95 ms before larger sizes are skipped")
+    parser.add_argument("--case-timeout", type=float, default=1800.0)
+    parser.add_argument("--out", default=str(RESULTS_PATH), help="JSONL file to append results to")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.queries < 1:
+        parser.error("--queries must be at least 1")
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+
+    sys.path.insert(0, str(SRC_PATH))
+    if args.case:
+        backend, index, size = args.case.split(":")
+        print(json.dumps(asyncio.run(run_case(backend, index, int(size), args.queries, args.seed, args.users))))
+        return
+
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    run_id = time.strftime("%Y%m%dT%H%M%S")
+    lines = [f"== retrieval ({args.queries} queries per case over {args.users} users, limit=10) =="]
+    with open(args.out, "a") as out:
+        for backend in args.backends.split(","):
+            for index in args.indexes.split(","):
+                over_budget = False
+                for size in sizes:
+                    if over_budget:
+                        result = {"backend": backend, "index": index, "size": size, "status": "over_budget"}
+                    else:
+                        result = run_isolated(backend, index, size, args)
+                        over_budget = result["status"] != "ok" or (
+                            result["build_s"] > args.build_budget or result["search_ms"]["p95"] > args.query_budget
+                        )
+                    result["run_id"] = run_id
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+                    lines.append(format_row(result))
+                    print(lines[-1], flush=True)
+
+    with open(OUTPUT_PATH, "a") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
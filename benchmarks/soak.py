@@ -0,0 +1,207 @@
+"""
+Long-conversation soak test for the memory graph.
+
+Runs thousands of turns through `builder` with the deterministic fake model,
+either on a single thread (one ever-growing conversation) or spread over many
+threads in parallel. At regular intervals it samples:
+
+- process RSS and the top `tracemalloc` allocation sites,
+- the size of `State.messages` of the sampled thread (count and characters),
+- the checkpointer footprint (checkpoints, writes and serialized bytes for
+  MemorySaver; file size for SQLite).
+
+Samples are appended as JSONL to --samples-out. The growth report, with a
+least-squares slope per 1k turns for each series, is appended to
+bench_output.txt. Series whose slope exceeds the given limits are flagged.
+
+Usage (from the repository root):
+    python -m benchmarks.soak --mode single --turns 10000 --sample-every 500
+    python -m benchmarks.soak --mode parallel --threads 50 --turns 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import AsyncExitStack
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+OUTPUT_PATH = REPO_ROOT / "bench_output.txt"
+SAMPLES_PATH = REPO_ROOT / "bench_soak.jsonl"
+sys.path.insert(0, str(REPO_ROOT / "expert_src"))
+
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.store.memory import InMemoryStore  # noqa: E402
+from langgraph.types import Command  # noqa: E402
+
+from benchmarks.fake_model import benchmark_model  # noqa: E402
+from benchmarks.load import UTTERANCES  # noqa: E402
+from benchmarks.retrieval import rss_mb  # noqa: E402
+
+TOP_ALLOCATIONS = 5
+
+
+def serialized_bytes(obj) -> int:
+    """Sum the sizes of all bytes objects nested in dicts, lists and tuples."""
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(serialized_bytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(serialized_bytes(v) for v in obj)
+    return 0
+
+
+def checkpointer_footprint(saver, db_path: str | None) -> dict:
+    """Return the size of what the checkpointer is holding on to."""
+    if db_path is not None:
+        return {"db_bytes": sum(os.path.getsize(p) for p in (db_path, db_path + "-wal") if os.path.exists(p))}
+    checkpoints = sum(len(by_id) for by_ns in saver.storage.values() for by_id in by_ns.values())
+    return {
+        "checkpoints": checkpoints,
+        "pending_writes": sum(len(w) for w in saver.writes.values()),
+        "serialized_bytes": serialized_bytes(saver.storage)
+        + serialized_bytes(saver.writes)
+        + serialized_bytes(getattr(saver, "blobs", {})),
+    }
+
+
+def slope_per_1k(points: list[tuple[float, float]]) -> float:
+    """Least-squares slope of y over x, scaled to per 1000 x."""
+    if len(points) < 2:
+        return 0.0
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return 0.0
+    return 1000 * sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+async def sample(graph, saver, db_path, config: dict, turns: int, started: float) -> dict:
+    state = await graph.aget_state(config)
+    messages = state.values.get("messages", [])
+    snapshot = tracemalloc.take_snapshot()
+    top = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+    current, _ = tracemalloc.get_traced_memory()
+    return {
+        "turns": turns,
+        "elapsed_s": time.perf_counter() - started,
+        "rss_mb": rss_mb(),
+        "traced_mb": current / 2**20,
+        "messages": len(messages),
+        "message_chars": sum(len(str(m.content)) for m in messages),
+        "checkpointer": checkpointer_footprint(saver, db_path),
+        "top_allocations": [{"site": str(s.traceback[0]), "kib": s.size / 1024, "count": s.count} for s in top],
+    }
+
+
+async def run(args) -> list[dict]:
+    from memory_agent.context import Context
+    from memory_agent.graph import builder
+
+    model = benchmark_model(tool_call_rate=args.tool_call_rate, seed=args.seed)
+    threads = 1 if args.mode == "single" else args.threads
+
+    async with AsyncExitStack() as stack:
+        db_path = None
+        if args.checkpointer == "sqlite":
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+            workdir = stack.enter_context(tempfile.TemporaryDirectory())
+            db_path = os.path.join(workdir, "checkpoints.db")
+            saver = await stack.enter_async_context(AsyncSqliteSaver.from_conn_string(db_path))
+        else:
+            saver = MemorySaver()
+        graph = builder.compile(store=InMemoryStore(), checkpointer=saver)
+
+        tracemalloc.start(args.trace_frames)
+        started = time.perf_counter()
+        samples: list[dict] = []
+        done = 0
+        lock = asyncio.Lock()
+        # The first thread is the one whose state is sampled.
+        sampled_config = {"configurable": {"thread_id": "soak-0", "user_id": "soak-user-0"}}
+
+        async def conversation(index: int, turns: int):
+            nonlocal done
+            user_id = f"soak-user-{index % args.users}"
+            config = {"configurable": {"thread_id": f"soak-{index}", "user_id": user_id}}
+            context = Context(user_id=user_id, chat_model=model)
+            for turn in range(turns):
+                text = UTTERANCES[(index + turn) % len(UTTERANCES)]
+                res = await graph.ainvoke({"messages": [("user", text)]}, config, context=context)
+                while "__interrupt__" in res:
+                    res = await graph.ainvoke(Command(resume="accept"), config, context=context)
+                async with lock:
+                    done += 1
+                    if done % args.sample_every == 0:
+                        samples.append(await sample(graph, saver, db_path, sampled_config, done, started))
+                        print(json.dumps({k: samples[-1][k] for k in ("turns", "rss_mb", "messages")}), flush=True)
+
+        per_thread, extra = divmod(args.turns, threads)
+        await asyncio.gather(*(conversation(i, per_thread + (i < extra)) for i in range(threads)))
+        tracemalloc.stop()
+    return samples
+
+
+def growth_report(args, samples: list[dict]) -> str:
+    series = {
+        "rss_mb": [(s["turns"], s["rss_mb"]) for s in samples],
+        "traced_mb": [(s["turns"], s["traced_mb"]) for s in samples],
+        "messages": [(s["turns"], s["messages"]) for s in samples],
+        "message_chars": [(s["turns"], s["message_chars"]) for s in samples],
+    }
+    for key in samples[0]["checkpointer"]:
+        series[f"checkpointer.{key}"] = [(s["turns"], s["checkpointer"][key]) for s in samples]
+    limits = {"rss_mb": args.max_rss_slope, "traced_mb": args.max_rss_slope}
+
+    lines = [
+        f"== soak ({args.mode}, {args.turns} turns, {1 if args.mode == 'single' else args.threads} threads, "
+        f"checkpointer={args.checkpointer}) =="
+    ]
+    for name, points in series.items():
+        slope = slope_per_1k(points)
+        flag = "  <-- GROWTH" if name in limits and slope > limits[name] else ""
+        lines.append(f"  {name:<30} first {points[0][1]:>14.1f}  last {points[-1][1]:>14.1f}  per 1k turns {slope:>12.2f}{flag}")
+    lines.append("  top allocations at end:")
+    lines.extend(f"    {a['kib']:10.1f} KiB  {a['count']:8d}  {a['site']}" for a in samples[-1]["top_allocations"])
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak the memory graph and track memory and checkpoint growth.")
+    parser.add_argument("--mode", choices=("single", "parallel"), default="single")
+    parser.add_argument("--turns", type=int, default=10_000, help="total turns across all threads")
+    parser.add_argument("--threads", type=int, default=32, help="threads in parallel mode")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--sample-every", type=int, default=500)
+    parser.add_argument("--checkpointer", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--tool-call-rate", type=float, default=0.2)
+    parser.add_argument("--trace-frames", type=int, default=1, help="tracemalloc frames per allocation")
+    parser.add_argument("--max-rss-slope", type=float, default=50.0, help="MB per 1k turns before flagging growth")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples-out", default=str(SAMPLES_PATH))
+    args = parser.parse_args()
+
+    samples = asyncio.run(run(args))
+    with open(args.samples_out, "a") as f:
+        for s in samples:
+            f.write(json.dumps({"mode": args.mode, "checkpointer": args.checkpointer, **s}) + "\n")
+    if not samples:
+        print("No samples taken; lower --sample-every.")
+        return
+    report = growth_report(args, samples)
+    print(report)
+    with open(OUTPUT_PATH, "a") as f:
+        f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
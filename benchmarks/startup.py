@@ -0,0 +1,106 @@
+"""
+Cold-start benchmark for the memory_agent package.
+
+Each sample runs in a fresh interpreter and reports the time to import
+`memory_agent`, and the latency of the first and second graph invocations.
+Pass --fake to replace the chat model with the scripted one so the numbers reflect
+local overhead only (no network).
+
+Usage (from the repository root):
+    python -m benchmarks.startup --samples 10 --fake
+"""
+
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+SRC_PATH = REPO_ROOT / "expert_src"
+OUTPUT_PATH = REPO_ROOT / "bench_output.txt"
+
+SAMPLE_SCRIPT = """
+import asyncio, json, sys, time
+sys.path.insert(0, {src!r})
+sys.path.insert(0, {root!r})
+fake = {fake!r}
+
+t0 = time.perf_counter()
+import memory_agent
+t_import = time.perf_counter() - t0
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.store.memory import InMemoryStore
+from memory_agent.context import Context
+import memory_agent.graph as graph_module
+
+model = None
+if fake:
+    from test_utils.scripted_model import ScriptedChatModel
+
+    model = ScriptedChatModel()
+
+t0 = time.perf_counter()
+app = graph_module.builder.compile(store=InMemoryStore(), checkpointer=MemorySaver())
+t_compile = time.perf_counter() - t0
+
+async def invoke(thread_id):
+    t0 = time.perf_counter()
+    await app.ainvoke(
+        {{"messages": [("user", "I am Andrew Garfield")]}},
+        {{"configurable": {{"thread_id": thread_id}}}},
+        context=Context(user_id="bench", chat_model=model),
+    )
+    return time.perf_counter() - t0
+
+first = asyncio.run(invoke("first"))
+second = asyncio.run(invoke("second"))
+print(json.dumps({{"import_s": t_import, "compile_s": t_compile, "first_invoke_s": first, "second_invoke_s": second}}))
+"""
+
+
+def run_sample(fake: bool) -> dict:
+    """Run one cold start in a fresh interpreter and return its timings."""
+    script = SAMPLE_SCRIPT.format(src=str(SRC_PATH), root=str(REPO_ROOT), fake=fake)
+    proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list[dict]) -> dict:
+    """Return median/min/max per metric across samples."""
+    summary = {}
+    for key in samples[0]:
+        values = [s[key] for s in samples]
+        summary[key] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory_agent import and first-invocation latency.")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--fake", action="store_true", help="use the scripted chat model (no network)")
+    args = parser.parse_args()
+
+    samples = [run_sample(args.fake) for _ in range(args.samples)]
+    summary = summarize(samples)
+
+    lines = [f"== startup ({args.samples} samples, fake={args.fake}) =="]
+    for key, stats in summary.items():
+        lines.append(
+            f"{key:>16}: median {stats['median'] * 1000:8.1f} ms  "
+            f"min {stats['min'] * 1000:8.1f} ms  max {stats['max'] * 1000:8.1f} ms"
+        )
+    report = "\n".join(lines)
+    print(report)
+    with open(OUTPUT_PATH, "a") as f:
+        f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
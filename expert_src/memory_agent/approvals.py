@@ -0,0 +1,207 @@
+"""List and resolve pending memory approvals across many paused threads.
+
+Threads stop at the `interrupt` in `tools.upsert_memory` until someone resumes
+them. This module finds every paused thread by scanning the checkpointer and
+resumes many of them at once with bounded parallelism.
+
+Threads should be invoked with ``user_id`` in ``config["configurable"]`` (the
+server does this) so the user shows up in checkpoint metadata; it is needed to
+rebuild the runtime `Context` on resume. Threads without a user are skipped
+unless a `context_factory` that handles them is passed.
+
+Usage:
+    python -m memory_agent.approvals list --checkpoints checkpoints.sqlite
+    python -m memory_agent.approvals resolve --checkpoints checkpoints.sqlite \\
+        --store memories.sqlite --decision accept --user alice
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any, Literal, Optional
+
+from langgraph.types import Command
+
+from memory_agent.context import Context
+
+logger = logging.getLogger(__name__)
+
+INTERRUPT_CHANNEL = "__interrupt__"
+
+
+@dataclass(frozen=True, kw_only=True)
+class PendingApproval:
+    """A proposed memory waiting for a human decision."""
+
+    thread_id: str
+    interrupt_id: Optional[str]
+    user_id: Optional[str]
+    value: Any
+
+
+@dataclass(kw_only=True)
+class ResumeResult:
+    """Outcome of resuming one thread."""
+
+    thread_id: str
+    ok: bool
+    skipped: bool = False
+    """The thread was not resumed, e.g. because its checkpoint has no user_id."""
+
+    still_pending: int = 0
+    error: Optional[str] = None
+
+
+async def list_pending(graph: Any, *, user_ids: Optional[Iterable[str]] = None) -> AsyncIterator[PendingApproval]:
+    """Yield pending approvals for every thread whose latest checkpoint is interrupted."""
+    wanted = set(user_ids) if user_ids is not None else None
+    seen: set[str] = set()
+    async for tup in graph.checkpointer.alist(None):
+        configurable = tup.config["configurable"]
+        thread_id = configurable["thread_id"]
+        # Checkpoints come newest first per thread; only the latest one matters.
+        if thread_id in seen or configurable.get("checkpoint_ns"):
+            continue
+        seen.add(thread_id)
+        if not any(channel == INTERRUPT_CHANNEL for _, channel, _ in tup.pending_writes or ()):
+            continue
+        user_id = (tup.metadata or {}).get("user_id")
+        if wanted is not None and user_id not in wanted:
+            continue
+        state = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+        for intr in state.interrupts:
+            yield PendingApproval(
+                thread_id=thread_id,
+                interrupt_id=getattr(intr, "id", None),
+                user_id=user_id,
+                value=intr.value,
+            )
+
+
+async def resolve(
+    graph: Any,
+    decisions: Iterable[tuple[PendingApproval, Literal["accept", "reject"]]],
+    *,
+    concurrency: int = 32,
+    context_factory: Optional[Callable[[Optional[str]], Context]] = None,
+) -> list[ResumeResult]:
+    """Apply decisions and resume the affected threads, `concurrency` at a time.
+
+    By default each thread resumes with `Context(user_id=...)` from its
+    checkpoint metadata, and threads without a user_id are skipped rather
+    than writing their memories under some default user.
+    """
+    by_thread: dict[str, list[tuple[PendingApproval, str]]] = defaultdict(list)
+    for pending, decision in decisions:
+        by_thread[pending.thread_id].append((pending, decision))
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def resume(thread_id: str, items: list[tuple[PendingApproval, str]]) -> ResumeResult:
+        if all(p.interrupt_id is not None for p, _ in items):
+            command = Command(resume={p.interrupt_id: d for p, d in items})
+        else:
+            command = Command(resume=items[0][1])
+        user_id = items[0][0].user_id
+        if context_factory is None and user_id is None:
+            return ResumeResult(
+                thread_id=thread_id, ok=False, skipped=True, error="checkpoint metadata has no user_id"
+            )
+        context = context_factory(user_id) if context_factory is not None else Context(user_id=user_id)
+        config = {"configurable": {"thread_id": thread_id, "user_id": user_id}}
+        async with slots:
+            try:
+                out = await graph.ainvoke(command, config, context=context)
+            except Exception as e:
+                logger.exception("Failed to resume thread %s", thread_id)
+                return ResumeResult(thread_id=thread_id, ok=False, error=f"{type(e).__name__}: {e}")
+        return ResumeResult(thread_id=thread_id, ok=True, still_pending=len(out.get("__interrupt__", [])))
+
+    return list(await asyncio.gather(*(resume(t, items) for t, items in by_thread.items())))
+
+
+async def resolve_all(
+    graph: Any,
+    decision: Literal["accept", "reject"],
+    *,
+    user_ids: Optional[Iterable[str]] = None,
+    thread_ids: Optional[Iterable[str]] = None,
+    concurrency: int = 32,
+    context_factory: Optional[Callable[[Optional[str]], Context]] = None,
+) -> list[ResumeResult]:
+    """Give every pending approval (optionally filtered) the same decision."""
+    wanted_threads = set(thread_ids) if thread_ids is not None else None
+    pending = [
+        (p, decision)
+        async for p in list_pending(graph, user_ids=user_ids)
+        if wanted_threads is None or p.thread_id in wanted_threads
+    ]
+    return await resolve(graph, pending, concurrency=concurrency, context_factory=context_factory)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    from memory_agent.graph import builder
+    from memory_agent.transfer import open_sqlite_store
+
+    async with contextlib.AsyncExitStack() as stack:
+        checkpointer = await stack.enter_async_context(AsyncSqliteSaver.from_conn_string(args.checkpoints))
+        # `list` only reads checkpoints; `resolve` requires --store.
+        store = await stack.enter_async_context(open_sqlite_store(args.store)) if args.store else None
+        graph = builder.compile(checkpointer=checkpointer, store=store)
+
+        if args.command == "list":
+            async for pending in list_pending(graph, user_ids=args.user):
+                print(json.dumps(asdict(pending), default=str))
+            return
+
+        results = await resolve_all(
+            graph,
+            args.decision,
+            user_ids=args.user,
+            thread_ids=args.thread,
+            concurrency=args.concurrency,
+        )
+        failed = [r for r in results if not r.ok and not r.skipped]
+        skipped = [r for r in results if r.skipped]
+        logger.info(
+            "Resumed %d threads (%d failed, %d skipped)",
+            len(results) - len(failed) - len(skipped),
+            len(failed),
+            len(skipped),
+        )
+        for r in failed:
+            logger.error("%s: %s", r.thread_id, r.error)
+        for r in skipped:
+            logger.warning("Skipped %s: %s", r.thread_id, r.error)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Review pending memory approvals in bulk.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_cmd = sub.add_parser("list", help="print pending approvals as JSONL")
+    resolve_cmd = sub.add_parser("resolve", help="accept or reject pending approvals and resume threads")
+    resolve_cmd.add_argument("--decision", choices=["accept", "reject"], required=True)
+    resolve_cmd.add_argument("--thread", action="append", help="only this thread (repeatable)")
+    resolve_cmd.add_argument("--store", required=True, help="SQLite memory store used when resuming")
+    resolve_cmd.add_argument("--concurrency", type=int, default=32)
+    for p in (list_cmd, resolve_cmd):
+        p.add_argument("--checkpoints", required=True, help="SQLite checkpoint file")
+        p.add_argument("--user", action="append", help="only this user (repeatable)")
+    list_cmd.set_defaults(store=None)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["PendingApproval", "ResumeResult", "list_pending", "resolve", "resolve_all"]
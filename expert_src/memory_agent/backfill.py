@@ -0,0 +1,258 @@
+"""Extract memories from historical transcripts in bulk.
+
+Transcripts are read from JSONL, one conversation per line::
+
+    {"user_id": "...", "thread_id": "...", "messages": [{"role": "user", "content": "..."}, ...]}
+
+Instead of replaying each conversation as interactive turns, every transcript
+gets a single extraction call to the tool-bound model. Calls run concurrently,
+proposed memories go through an approval callback instead of `interrupt`, and
+accepted memories are written to the store in batches. Progress is checkpointed
+after each chunk so an interrupted job can be resumed.
+
+Failed extraction calls are retried. Transcripts that still fail are appended to
+``<input>.failed.jsonl`` before the chunk is committed, so they can be replayed
+later with ``--in <input>.failed.jsonl``.
+
+Usage:
+    python -m memory_agent.backfill --in transcripts.jsonl.gz --db memories.sqlite --resume
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import pathlib
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+from langgraph.store.base import BaseStore, PutOp
+
+from memory_agent import digest, prompts
+from memory_agent.policy import ApprovalPolicy
+from memory_agent.transfer import open_jsonl, open_sqlite_store
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("personal", "professional", "other")
+MAX_REPORTED_ERRORS = 100
+
+Approver = Callable[[str, dict], bool]
+"""Decide whether to keep a proposed memory: (user_id, upsert_memory args) -> accept."""
+
+FailureHandler = Callable[[int, dict, BaseException], None]
+"""Called with (line number, transcript, error) for transcripts that failed every attempt."""
+
+
+def accept_all(user_id: str, args: dict) -> bool:
+    """Approve every proposed memory."""
+    return True
+
+
+@dataclass(kw_only=True)
+class BackfillStats:
+    """Counters for a backfill run."""
+
+    transcripts: int = 0
+    failed: int = 0
+    proposed: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def _extraction_prompt(messages: list[dict]) -> list[dict]:
+    system = prompts.SYSTEM_PROMPT.format(user_info="", time=datetime.now().isoformat())
+    return [{"role": "system", "content": system}, *messages]
+
+
+def _memory_key(transcript: dict, lineno: int, index: int, args: dict) -> str:
+    # Keys are derived from the transcript position so re-running a chunk after
+    # a crash overwrites the same items instead of duplicating them.
+    if args.get("memory_id"):
+        return str(args["memory_id"])
+    source = transcript.get("thread_id") or f"line-{lineno}"
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"backfill/{source}/{index}"))
+
+
+async def backfill_chunk(
+    store: BaseStore,
+    model: Any,
+    chunk: list[tuple[int, dict]],
+    *,
+    approve: Approver = accept_all,
+    concurrency: int = 16,
+    retries: int = 2,
+    retry_delay: float = 1.0,
+    on_failure: Optional[FailureHandler] = None,
+    stats: BackfillStats,
+) -> None:
+    """Run extraction over one chunk of (line number, transcript) pairs and write results.
+
+    Failed calls are retried up to `retries` times with exponential backoff;
+    transcripts that still fail are passed to `on_failure`.
+    """
+    requests = [_extraction_prompt(t["messages"]) for _, t in chunk]
+    responses: list[Any] = [None] * len(chunk)
+    pending = list(range(len(chunk)))
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+        results = await model.abatch(
+            [requests[i] for i in pending], config={"max_concurrency": concurrency}, return_exceptions=True
+        )
+        for i, result in zip(pending, results):
+            responses[i] = result
+        pending = [i for i in pending if isinstance(responses[i], Exception)]
+        if not pending:
+            break
+
+    puts: list[PutOp] = []
+    for (lineno, transcript), response in zip(chunk, responses):
+        stats.transcripts += 1
+        if isinstance(response, Exception):
+            stats.failed += 1
+            if len(stats.errors) < MAX_REPORTED_ERRORS:
+                stats.errors.append(f"line {lineno}: {type(response).__name__}: {response}")
+            if on_failure is not None:
+                on_failure(lineno, transcript, response)
+            continue
+        user_id = str(transcript.get("user_id", "default"))
+        for index, tc in enumerate(getattr(response, "tool_calls", [])):
+            if tc["name"] != "upsert_memory":
+                continue
+            args = tc["args"]
+            stats.proposed += 1
+            if not approve(user_id, args):
+                stats.rejected += 1
+                continue
+            stats.accepted += 1
+            category = args.get("category") if args.get("category") in CATEGORIES else "other"
+            puts.append(
+                PutOp(
+                    ("memories", user_id, category),
+                    _memory_key(transcript, lineno, index, args),
+                    {"content": args.get("content", ""), "context": args.get("context", "")},
+                )
+            )
+    if puts:
+        await store.abatch(puts)
+        await digest.update_digests(store, [(op.namespace[1], op.namespace[2], op.key, op.value) for op in puts])
+
+
+async def backfill(
+    store: BaseStore,
+    transcripts: Iterable[str],
+    *,
+    model: Optional[Any] = None,
+    approve: Approver = accept_all,
+    concurrency: int = 16,
+    chunk_size: int = 256,
+    start: int = 0,
+    retries: int = 2,
+    retry_delay: float = 1.0,
+    on_failure: Optional[FailureHandler] = None,
+    on_commit: Optional[Callable[[int], None]] = None,
+) -> BackfillStats:
+    """Extract memories from JSONL transcript lines, starting at line `start`.
+
+    `on_commit` is called with the next line offset after each chunk's memories
+    have been written, which is the point a resumed job restarts from. A
+    resumed job does not revisit failed transcripts; `on_failure` must keep
+    them (the CLI appends them to a replayable failures file).
+    """
+    if model is None:
+        from memory_agent.graph import get_llm_with_tools
+
+        model = get_llm_with_tools()
+    stats = BackfillStats()
+    lines = itertools.islice(enumerate(transcripts), start, None)
+    while batch := list(itertools.islice(lines, chunk_size)):
+        chunk = [(lineno, json.loads(line)) for lineno, line in batch if line.strip()]
+        await backfill_chunk(
+            store,
+            model,
+            chunk,
+            approve=approve,
+            concurrency=concurrency,
+            retries=retries,
+            retry_delay=retry_delay,
+            on_failure=on_failure,
+            stats=stats,
+        )
+        if on_commit is not None:
+            on_commit(batch[-1][0] + 1)
+        logger.info(
+            "Processed %d transcripts (%d accepted, %d failed)",
+            stats.transcripts,
+            stats.accepted,
+            stats.failed,
+        )
+    return stats
+
+
+async def _run(args: argparse.Namespace) -> None:
+    path = pathlib.Path(args.input)
+    offset_path = path.with_name(path.name + ".offset")
+    start = int(offset_path.read_text()) if args.resume and offset_path.exists() else 0
+    failed_path = path.with_name(path.name + ".failed.jsonl")
+
+    def commit(offset: int) -> None:
+        offset_path.write_text(str(offset))
+
+    def record_failure(lineno: int, transcript: dict, error: BaseException) -> None:
+        with open(failed_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(transcript, ensure_ascii=False) + "\n")
+
+    policy = ApprovalPolicy.from_file(args.policy) if args.policy else None
+    approve = policy.approver(undecided=args.undecided) if policy else accept_all
+
+    async with open_sqlite_store(args.db) as store:
+        with open_jsonl(path, "r") as lines:
+            stats = await backfill(
+                store,
+                lines,
+                approve=approve,
+                concurrency=args.concurrency,
+                chunk_size=args.chunk_size,
+                start=start,
+                retries=args.retries,
+                on_failure=record_failure,
+                on_commit=commit,
+            )
+    logger.info("Backfill finished: %s", stats)
+    if stats.failed:
+        logger.warning("%d transcripts failed; replay them with --in %s", stats.failed, failed_path)
+    if policy is not None:
+        logger.info("Policy decisions: %s", policy.stats())
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Extract memories from historical transcripts.")
+    parser.add_argument("--in", dest="input", required=True, help="transcripts file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--db", required=True, help="SQLite store file")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent model calls")
+    parser.add_argument("--chunk-size", type=int, default=256, help="transcripts per checkpoint")
+    parser.add_argument("--resume", action="store_true", help="continue from the last committed offset")
+    parser.add_argument("--retries", type=int, default=2, help="retries per failed extraction call")
+    parser.add_argument("--policy", help="JSON approval policy file (default: accept everything)")
+    parser.add_argument(
+        "--undecided",
+        choices=["accept", "reject"],
+        default="accept",
+        help="what to do with proposals the policy does not decide",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["BackfillStats", "accept_all", "backfill", "backfill_chunk"]
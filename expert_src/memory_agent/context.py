@@ -1,11 +1,15 @@
 """Define the runtime context information for the agent."""
 
+import functools
 import os
 from dataclasses import dataclass, field, fields
+from typing import Optional
 
+from langchain_core.language_models import BaseChatModel
 from typing_extensions import Annotated
 
 from memory_agent import prompts
+from memory_agent.policy import ApprovalPolicy
 
 
 @dataclass(kw_only=True)
@@ -25,11 +29,62 @@ class Context:
 
     system_prompt: str = prompts.SYSTEM_PROMPT
 
+    chat_model: Optional[BaseChatModel] = None
+    """A chat model instance to use instead of the default one.
+
+    Lets tests and benchmarks run the graph against a fake or recorded model.
+    """
+
+    approval_policy: Optional[ApprovalPolicy] = None
+    """Rules that accept or reject proposed memories before asking a human.
+
+    The APPROVAL_POLICY env var names a JSON policy file.
+    """
+
+    use_profile_digest: bool = False
+    """Inject the per-category profile digest instead of searching memories when it is fresh."""
+
+    profile_digest_max_age: float = 24 * 60 * 60
+    """Seconds after its last update before a digest is considered stale."""
+
+    topic_drift_threshold: float = 0.8
+    """Reclassify the conversation only when lexical drift (1 - similarity) exceeds this.
+
+    Lower values reclassify more often.
+    """
+
     def __post_init__(self):
         """Fetch env vars for attributes that were not passed as args."""
-        for f in fields(self):
-            if not f.init:
-                continue
+        for name, (default, value) in _env_overrides().items():
+            if getattr(self, name) == default:
+                setattr(self, name, value)
+
+
+# Env vars for fields that hold objects; other non-scalar fields are not read from env.
+_ENV_PARSERS = {"approval_policy": ApprovalPolicy.from_file}
+
+
+@functools.cache
+def _env_overrides() -> dict:
+    """Resolve env var overrides for Context fields once per process.
+
+    Call `_env_overrides.cache_clear()` after changing the environment.
+    """
+    return {
+        f.name: (f.default, _coerce(f.name, f.default, os.environ[f.name.upper()]))
+        for f in fields(Context)
+        if f.init
+        and f.name.upper() in os.environ
+        and (isinstance(f.default, (str, bool, int, float)) or f.name in _ENV_PARSERS)
+    }
+
 
-            if getattr(self, f.name) == f.default:
-                setattr(self, f.name, os.environ.get(f.name.upper(), f.default))
+def _coerce(name: str, default, value: str):
+    """Convert an env var string to the type of the field's default."""
+    if name in _ENV_PARSERS:
+        return _ENV_PARSERS[name](value)
+    if isinstance(default, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, (int, float)):
+        return type(default)(value)
+    return value
@@ -0,0 +1,162 @@
+"""Maintain a compact per-user, per-category profile digest of stored memories.
+
+`tools.upsert_memory` folds every stored memory into a digest kept under
+``("profiles", user_id)`` with the category as key; bulk writers (import,
+backfill, recategorization) fold theirs in with `update_digests`. `call_model` can inject that
+digest instead of running a similarity search when it is fresh and the latest
+message does not ask about specific past details.
+"""
+
+import asyncio
+import re
+import time
+import weakref
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langgraph.store.base import BaseStore
+
+DIGEST_NAMESPACE = "profiles"
+MAX_ENTRIES = 50
+MAX_ENTRY_CHARS = 200
+
+# Questions about specific past details are better served by a similarity search.
+_DETAIL_PATTERN = re.compile(
+    r"\b(remember|recall|did i|have i|what (is|was|are|were) my|when did|told you)\b",
+    re.IGNORECASE,
+)
+
+
+# Concurrent upserts for one user and category would otherwise race on the
+# read-modify-write below and drop entries.
+_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of `text` (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def format_digest(value: dict) -> str:
+    """Render a stored digest as prompt text.
+
+    Memory ids are kept so the model can still pass `memory_id` to update an
+    existing memory instead of creating a duplicate.
+    """
+    return "\n".join(f"- [{memory_id}] {entry}" for memory_id, entry in value["entries"].items())
+
+
+async def update_digest(
+    store: BaseStore, user_id: str, category: str, memory_id: str, memory: dict
+) -> None:
+    """Fold a newly written memory into the user's digest for `category`."""
+    await _update(store, user_id, category, [(memory_id, memory)])
+
+
+async def update_digests(store: BaseStore, memories: Iterable[tuple[str, str, str, dict]]) -> None:
+    """Fold many written memories, as (user_id, category, memory_id, value), into their digests.
+
+    Each digest is read and written once, however many of its memories are
+    in the batch.
+    """
+    grouped: dict[tuple[str, str], list[tuple[str, dict]]] = defaultdict(list)
+    for user_id, category, memory_id, memory in memories:
+        grouped[(user_id, category)].append((memory_id, memory))
+    await asyncio.gather(
+        *(_update(store, user_id, category, items) for (user_id, category), items in grouped.items())
+    )
+
+
+async def _update(store: BaseStore, user_id: str, category: str, memories: list[tuple[str, dict]]) -> None:
+    namespace = (DIGEST_NAMESPACE, user_id)
+    lock = _locks.setdefault((id(store), user_id, category), asyncio.Lock())
+    async with lock:
+        await _fold(store, namespace, category, memories)
+
+
+async def _fold(
+    store: BaseStore, namespace: tuple[str, str], category: str, memories: list[tuple[str, dict]]
+) -> None:
+    item = await store.aget(namespace, category)
+    value = item.value if item is not None else {"entries": {}, "raw_tokens": {}}
+
+    entries: dict[str, str] = value["entries"]
+    raw_tokens: dict[str, int] = value["raw_tokens"]
+    for memory_id, memory in memories:
+        # Re-inserting moves an updated memory to the end, so eviction drops the oldest.
+        entries.pop(memory_id, None)
+        raw_tokens.pop(memory_id, None)
+        entries[memory_id] = " ".join(str(memory.get("content", "")).split())[:MAX_ENTRY_CHARS]
+        raw_tokens[memory_id] = estimate_tokens(f"[{memory_id}]: {memory}")
+    while len(entries) > MAX_ENTRIES:
+        oldest = next(iter(entries))
+        del entries[oldest]
+        del raw_tokens[oldest]
+
+    value["updated_at"] = time.time()
+    await store.aput(namespace, category, value, index=False)
+
+
+def needs_detail(messages: list) -> bool:
+    """Return True if the latest message asks about specific remembered details."""
+    if not messages:
+        return False
+    content = messages[-1].content
+    return isinstance(content, str) and bool(_DETAIL_PATTERN.search(content))
+
+
+@dataclass(kw_only=True)
+class DigestMetrics:
+    """Compare the size of injected digests to the raw memories they summarise."""
+
+    hits: int = 0
+    fallbacks: int = 0
+    digest_tokens: int = 0
+    raw_tokens: int = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "digest_tokens": self.digest_tokens,
+            "raw_tokens": self.raw_tokens,
+            "compression_ratio": self.digest_tokens / self.raw_tokens if self.raw_tokens else None,
+        }
+
+
+metrics = DigestMetrics()
+
+
+async def load_digest(
+    store: BaseStore, user_id: str, category: str, messages: list, *, max_age: float
+) -> Optional[str]:
+    """Return the digest text, or None when a full memory search should be used instead.
+
+    That is the case when the digest is missing, older than `max_age` seconds,
+    or the latest message asks about specific details.
+    """
+    item = None
+    if not needs_detail(messages):
+        item = await store.aget((DIGEST_NAMESPACE, user_id), category)
+    if item is None or time.time() - item.value.get("updated_at", 0) > max_age:
+        metrics.fallbacks += 1
+        return None
+    text = format_digest(item.value)
+    metrics.hits += 1
+    metrics.digest_tokens += estimate_tokens(text)
+    metrics.raw_tokens += sum(item.value["raw_tokens"].values())
+    return text
+
+
+__all__ = [
+    "DigestMetrics",
+    "estimate_tokens",
+    "format_digest",
+    "load_digest",
+    "metrics",
+    "needs_detail",
+    "update_digest",
+    "update_digests",
+]
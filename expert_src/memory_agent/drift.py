@@ -0,0 +1,118 @@
+"""Cheap lexical topic-drift detection to avoid reclassifying stable conversations.
+
+The state keeps a decayed bag of words for the current topic. A new human
+message is compared to it with cosine similarity; only when the drift
+(1 - similarity) exceeds the threshold is `get_memory_category` called again.
+Messages without any content words never count as drift.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from memory_agent.state import State
+
+MAX_TOPIC_TERMS = 200
+TOPIC_DECAY = 0.8
+
+_WORD = re.compile(r"[a-z][a-z']{2,}")
+_STOPWORDS = frozenset(
+    "the and for are but not you your with this that have has had was were will "
+    "would can could should about from they them their what when where which who "
+    "how just like really very also into than then there here been being its it's "
+    "i'm i've don't "
+    # Acknowledgements carry no topic.
+    "yes yeah yep okay sure thanks thank please great cool nice good sounds alright got".split()
+)
+
+stats: Counter[str] = Counter()
+"""How often classification was skipped or rerun, and why."""
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            seg.get("text", "") if isinstance(seg, dict) else str(seg) for seg in content
+        )
+    return str(content)
+
+
+def terms(text: str) -> Counter[str]:
+    """Return the content-word counts of `text`."""
+    return Counter(w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS)
+
+
+def similarity(a: dict[str, float], b: dict[str, float]) -> float:
+    """Cosine similarity between two term vectors."""
+    if not a or not b:
+        return 0.0
+    dot = sum(v * b.get(k, 0.0) for k, v in a.items())
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def _merge(topic: dict[str, float], new: dict[str, float]) -> dict[str, float]:
+    merged = {k: v * TOPIC_DECAY for k, v in topic.items()}
+    for k, v in new.items():
+        merged[k] = merged.get(k, 0.0) + v
+    top = sorted(merged.items(), key=lambda kv: kv[1], reverse=True)[:MAX_TOPIC_TERMS]
+    return dict(top)
+
+
+@dataclass(kw_only=True)
+class TopicCheck:
+    """Whether the current turn needs a fresh classification, plus the state to write back."""
+
+    reclassify: bool
+    message_id: Optional[str]
+    new_terms: dict[str, float]
+    topic_terms: dict[str, float]
+    previous_category: Optional[str]
+
+    def update(self, category: str) -> dict:
+        """Return the state update recording `category` as the current topic."""
+        if category != self.previous_category:
+            # A new category starts a new topic.
+            topic = dict(self.new_terms)
+        elif self.new_terms:
+            topic = _merge(self.topic_terms, self.new_terms)
+        else:
+            topic = self.topic_terms
+        return {"category": category, "topic_terms": topic, "classified_message_id": self.message_id}
+
+
+def check(state: State, threshold: float) -> TopicCheck:
+    """Decide whether the latest human message drifted away from the current topic."""
+    last_human = next((m for m in reversed(state.messages) if m.type == "human"), None)
+    message_id = last_human.id if last_human is not None else None
+    new_terms = dict(terms(_text(last_human.content))) if last_human is not None else {}
+
+    if state.category is None:
+        reason, reclassify = "no_category", True
+    elif message_id is not None and message_id == state.classified_message_id:
+        # Re-entering call_model after storing memories: same turn, same topic.
+        reason, reclassify, new_terms = "same_turn", False, {}
+    elif not new_terms:
+        # "ok", "thanks" and the like carry no topic; keep the current one.
+        reason, reclassify = "no_terms", False
+    elif 1.0 - similarity(new_terms, state.topic_terms) > threshold:
+        reason, reclassify = "drift", True
+    else:
+        reason, reclassify = "stable", False
+
+    stats[f"{'reclassified' if reclassify else 'skipped'}:{reason}"] += 1
+    stats["reclassified" if reclassify else "skipped"] += 1
+    return TopicCheck(
+        reclassify=reclassify,
+        message_id=message_id,
+        new_terms=new_terms,
+        topic_terms=state.topic_terms,
+        previous_category=state.category,
+    )
+
+
+__all__ = ["TopicCheck", "check", "similarity", "stats", "terms"]
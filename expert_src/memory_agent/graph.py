@@ -1,45 +1,127 @@
 """Graphs that extract memories on a schedule."""
 
 import asyncio
+import functools
 import logging
+from collections import OrderedDict
 from datetime import datetime
-from typing import cast
+from typing import TYPE_CHECKING, Any, cast
 
-from langchain.chat_models import init_chat_model
+from langgraph.config import get_config
 from langgraph.graph import END, StateGraph
 from langgraph.runtime import Runtime
 from langgraph.store.base import BaseStore
 from langgraph.types import interrupt
 
-from memory_agent import tools, utils
+from memory_agent import digest, drift, tools, usage, utils
 from memory_agent.context import Context
+from memory_agent.singleflight import SingleFlight
 from memory_agent.state import State
+from memory_agent.tracing import span, traced_node
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.runnables import Runnable
 
 logger = logging.getLogger(__name__)
 
-# Initialize the language model to be used for memory extraction
-llm = init_chat_model("anthropic:claude-3-5-sonnet-latest")
+# Concurrent turns for the same user and query share one embedding + search.
+search_flight = SingleFlight("memory_search")
+
+
+@functools.cache
+def get_llm() -> "BaseChatModel":
+    """Return the language model used for memory extraction, creating it on first use."""
+    # Importing langchain's model registry and the provider SDK dominates import
+    # time, so neither happens until the first turn needs a model.
+    from langchain.chat_models import init_chat_model
+
+    return init_chat_model("anthropic:claude-3-5-sonnet-latest")
+
+
+@functools.cache
+def get_llm_with_tools() -> "Runnable":
+    """Return the model with the memory tool bound; the tool schema is built once."""
+    return get_llm().bind_tools([tools.upsert_memory])
 
 
+# Tool-bound wrappers for models passed through Context.chat_model, by id, in
+# least recently used order. Chat models are unhashable and each wrapper holds
+# its model, so a weak-keyed cache could never drop an entry; the size is capped
+# instead. The model is kept alongside so its id cannot be reused while cached.
+MAX_BOUND_MODELS = 32
+_bound_models: OrderedDict[int, tuple["BaseChatModel", "Runnable"]] = OrderedDict()
+
+
+def get_models(context: Context) -> tuple["BaseChatModel", "Runnable"]:
+    """Return the (classifier, tool-bound) models for a run."""
+    chat_model = context.chat_model
+    if chat_model is None:
+        return get_llm(), get_llm_with_tools()
+    key = id(chat_model)
+    cached = _bound_models.get(key)
+    if cached is not None and cached[0] is chat_model:
+        _bound_models.move_to_end(key)
+        return cached
+    cached = _bound_models[key] = (chat_model, chat_model.bind_tools([tools.upsert_memory]))
+    _bound_models.move_to_end(key)
+    while len(_bound_models) > MAX_BOUND_MODELS:
+        _bound_models.popitem(last=False)
+    return cached
+
+
+@traced_node
 async def call_model(state: State, runtime: Runtime[Context]) -> dict:
     """Extract the user's state from the conversation and update the memory."""
     user_id = runtime.context.user_id
     model = runtime.context.model
     system_prompt = runtime.context.system_prompt
+    thread_id = get_config().get("configurable", {}).get("thread_id")
+    llm, llm_with_tools = get_models(runtime.context)
 
-    category = await utils.get_memory_category(state.messages, llm)
+    def record_usage(call_site: str):
+        return lambda response: usage.tracker.record(
+            call_site, response, user_id=user_id, thread_id=thread_id
+        )
 
-    # Retrieve the most recent memories for context
-    memories = await cast(BaseStore, runtime.store).asearch(
-        ("memories", user_id, category),
-        query=str([m.content for m in state.messages[-3:]]),
-        limit=10,
-    )
+    # Only ask the model for a category when the conversation drifted off topic.
+    topic = drift.check(state, runtime.context.topic_drift_threshold)
+    category = state.category
+    if topic.reclassify:
+        with span("call_model", "classify"):
+            category = await utils.get_memory_category(
+                state.messages, llm, on_response=record_usage("classify")
+            )
 
-    # Format memories for inclusion in the prompt
-    formatted = "\n".join(
-        f"[{mem.key}]: {mem.value} (similarity: {mem.score})" for mem in memories
-    )
+    store = cast(BaseStore, runtime.store)
+
+    # Prefer the compact profile digest; fall back to a full search when it is
+    # stale, missing, or the user asks about specific details.
+    formatted = None
+    if runtime.context.use_profile_digest:
+        with span("call_model", "digest"):
+            formatted = await digest.load_digest(
+                store,
+                user_id,
+                category,
+                state.messages,
+                max_age=runtime.context.profile_digest_max_age,
+            )
+
+    if formatted is None:
+        # Retrieve the most recent memories for context
+        namespace = ("memories", user_id, category)
+        query = str([m.content for m in state.messages[-3:]])
+        with span("call_model", "search"):
+            memories = await search_flight.do(
+                (id(store), namespace, query),
+                lambda: store.asearch(namespace, query=query, limit=10),
+            )
+
+        # Format memories for inclusion in the prompt
+        formatted = "\n".join(
+            f"[{mem.key}]: {mem.value} (similarity: {mem.score})" for mem in memories
+        )
     if formatted:
         formatted = f"""
 <memories>
@@ -48,17 +130,21 @@ async def call_model(state: State, runtime: Runtime[Context]) -> dict:
 
     # Prepare the system prompt with user memories and current time
     # This helps the model understand the context and temporal relevance
-    sys = system_prompt.format(user_info=formatted, time=datetime.now().isoformat())
+    with span("call_model", "format_prompt"):
+        sys = system_prompt.format(user_info=formatted, time=datetime.now().isoformat())
 
     # Invoke the language model with the prepared prompt and tools
     # "bind_tools" gives the LLM the JSON schema for all tools in the list so it knows how
     # to use them.
-    msg = await llm.bind_tools([tools.upsert_memory]).ainvoke(
-        [{"role": "system", "content": sys}, *state.messages]
-    )
-    return {"messages": [msg]}
+    with span("call_model", "llm"):
+        msg = await llm_with_tools.ainvoke(
+            [{"role": "system", "content": sys}, *state.messages]
+        )
+    record_usage("respond")(msg)
+    return {"messages": [msg], **topic.update(category)}
 
 
+@traced_node
 async def store_memory(state: State, runtime: Runtime[Context]):
     # Extract tool calls from the last message
     tool_calls = getattr(state.messages[-1], "tool_calls", [])
@@ -70,6 +156,8 @@ async def store_memory(state: State, runtime: Runtime[Context]):
                 **tc["args"],
                 user_id=runtime.context.user_id,
                 store=cast(BaseStore, runtime.store),
+                policy=runtime.context.approval_policy,
+                tool_call_id=tc["id"],
             )
             for tc in tool_calls
         )
@@ -116,4 +204,11 @@ graph.name = "MemoryAgent"
 app = graph
 
 
+def __getattr__(name: str) -> Any:
+    # `llm` used to be built at import time; keep it reachable without paying for it.
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = ["graph"]
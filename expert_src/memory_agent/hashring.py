@@ -0,0 +1,66 @@
+"""Consistent hashing used to route threads and users to workers or shards."""
+
+import bisect
+import hashlib
+from collections.abc import Hashable, Iterable
+from typing import Generic, TypeVar
+
+N = TypeVar("N", bound=Hashable)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing(Generic[N]):
+    """A consistent-hash ring with virtual nodes.
+
+    Adding or removing a node only moves the keys that land on that node's
+    virtual points, so most keys keep their owner when the ring changes.
+    """
+
+    def __init__(self, nodes: Iterable[N] = (), *, replicas: int = 128) -> None:
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: list[N] = []
+        self._nodes: list[N] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> list[N]:
+        """The nodes currently on the ring, in insertion order."""
+        return list(self._nodes)
+
+    def add(self, node: N) -> None:
+        """Place `node` on the ring."""
+        if node in self._nodes:
+            return
+        self._nodes.append(node)
+        for i in range(self.replicas):
+            point = _hash(f"{node!r}#{i}")
+            idx = bisect.bisect(self._points, point)
+            self._points.insert(idx, point)
+            self._owners.insert(idx, node)
+
+    def remove(self, node: N) -> None:
+        """Take `node` off the ring."""
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def get(self, key: str) -> N:
+        """Return the node that owns `key`."""
+        if not self._points:
+            raise LookupError("HashRing has no nodes")
+        idx = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[idx]
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+__all__ = ["HashRing"]
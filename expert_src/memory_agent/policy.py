@@ -0,0 +1,236 @@
+"""Rule-based approval of proposed memories before asking a human.
+
+An `ApprovalPolicy` runs its rules in order and the first rule that returns a
+decision wins. Proposals no rule decides on fall through to the human approval
+`interrupt` in `tools.upsert_memory`.
+
+Policies can be built in code or loaded from JSON::
+
+    {"rules": [
+        {"type": "deny_patterns", "patterns": ["(?i)password", "(?i)social security"]},
+        {"type": "rate_limit", "max_proposals": 20, "window_seconds": 3600},
+        {"type": "auto_accept", "categories": ["personal"], "user_ids": ["alice"]}
+    ]}
+"""
+
+import hashlib
+import json
+import pathlib
+import re
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Literal, Optional, Protocol
+
+Decision = Literal["accept", "reject"]
+
+
+@dataclass(frozen=True, kw_only=True)
+class Proposal:
+    """A memory the model wants to save."""
+
+    user_id: str
+    content: str
+    context: str
+    category: str
+
+    def fingerprint(self) -> str:
+        raw = "\x1f".join((self.user_id, self.category, self.content, self.context))
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class Rule(Protocol):
+    name: str
+    stateful: bool
+    """Whether the rule's decision depends on earlier proposals (never memoized)."""
+
+    def evaluate(self, proposal: Proposal) -> Optional[Decision]:
+        """Return a decision, or None to defer to the next rule."""
+        ...
+
+
+@dataclass(kw_only=True)
+class AutoAcceptCategories:
+    """Accept proposals in the given categories, optionally only for opted-in users."""
+
+    categories: frozenset[str]
+    user_ids: Optional[frozenset[str]] = None
+    """Users who opted in. None means every user."""
+
+    name: str = "auto_accept"
+    stateful: bool = False
+
+    def evaluate(self, proposal: Proposal) -> Optional[Decision]:
+        if proposal.category not in self.categories:
+            return None
+        if self.user_ids is not None and proposal.user_id not in self.user_ids:
+            return None
+        return "accept"
+
+
+@dataclass(kw_only=True)
+class DenyPatterns:
+    """Reject proposals whose content or context matches any of the patterns."""
+
+    patterns: Sequence[str]
+    name: str = "deny_patterns"
+    stateful: bool = False
+    _compiled: list[re.Pattern] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._compiled = [re.compile(p) for p in self.patterns]
+
+    def evaluate(self, proposal: Proposal) -> Optional[Decision]:
+        for pattern in self._compiled:
+            if pattern.search(proposal.content) or pattern.search(proposal.context):
+                return "reject"
+        return None
+
+
+@dataclass(kw_only=True)
+class RateLimit:
+    """Reject proposals once a user has made `max_proposals` within the window."""
+
+    max_proposals: int
+    window_seconds: float
+    name: str = "rate_limit"
+    stateful: bool = True
+    clock: Callable[[], float] = time.monotonic
+    _seen: dict[str, deque] = field(init=False, repr=False, default_factory=lambda: defaultdict(deque))
+
+    def evaluate(self, proposal: Proposal) -> Optional[Decision]:
+        now = self.clock()
+        seen = self._seen[proposal.user_id]
+        while seen and now - seen[0] > self.window_seconds:
+            seen.popleft()
+        if len(seen) >= self.max_proposals:
+            return "reject"
+        seen.append(now)
+        return None
+
+
+RULE_TYPES: dict[str, Callable[..., Rule]] = {
+    "auto_accept": lambda categories, user_ids=None, **kw: AutoAcceptCategories(
+        categories=frozenset(categories),
+        user_ids=frozenset(user_ids) if user_ids is not None else None,
+        **kw,
+    ),
+    "deny_patterns": lambda **kw: DenyPatterns(**kw),
+    "rate_limit": lambda **kw: RateLimit(**kw),
+}
+
+
+class ApprovalPolicy:
+    """Decide on proposed memories with an ordered list of rules.
+
+    Outcomes of the stateless rules are remembered per proposal for
+    `memo_size` proposals. Stateful rules such as `RateLimit` run on every
+    call, because their answer for the same proposal changes over time.
+
+    Decisions made with a `call_id` (the tool call id) are also remembered for
+    `memo_size` calls: `upsert_memory` re-runs from the top when its interrupt
+    is resumed, and the repeat must neither count the proposal again nor
+    overturn what the human was asked about.
+    """
+
+    def __init__(self, rules: Iterable[Rule], *, memo_size: int = 10_000) -> None:
+        self.rules = list(rules)
+        self.counts: Counter[str] = Counter()
+        # fingerprint -> (position of the first stateless rule that decided, its decision),
+        # or (len(rules), None) when no stateless rule decides.
+        self._memo: OrderedDict[str, tuple[int, Optional[Decision]]] = OrderedDict()
+        self._memo_size = memo_size
+        self._calls: OrderedDict[str, Optional[Decision]] = OrderedDict()
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "ApprovalPolicy":
+        """Build a policy from ``{"rules": [{"type": ..., **options}, ...]}``."""
+        rules = []
+        for spec in config.get("rules", []):
+            spec = dict(spec)
+            kind = spec.pop("type")
+            if kind not in RULE_TYPES:
+                raise ValueError(f"Unknown policy rule type: {kind!r}")
+            rules.append(RULE_TYPES[kind](**spec))
+        return cls(rules)
+
+    @classmethod
+    def from_file(cls, path: str | pathlib.Path) -> "ApprovalPolicy":
+        """Load a policy from a JSON file."""
+        return cls.from_dict(json.loads(pathlib.Path(path).read_text()))
+
+    def decide(self, proposal: Proposal, *, call_id: Optional[str] = None) -> Optional[Decision]:
+        """Return "accept" or "reject", or None if a human has to decide.
+
+        A repeated `call_id` gets the decision made the first time, without
+        running the rules or counting it again.
+        """
+        if call_id is not None and call_id in self._calls:
+            self._calls.move_to_end(call_id)
+            return self._calls[call_id]
+        decision = self._decide(proposal)
+        if call_id is not None:
+            self._calls[call_id] = decision
+            if len(self._calls) > self._memo_size:
+                self._calls.popitem(last=False)
+        return decision
+
+    def _decide(self, proposal: Proposal) -> Optional[Decision]:
+        key = proposal.fingerprint()
+        memo = self._memo.get(key)
+        if memo is not None:
+            self._memo.move_to_end(key)
+        stop, memo_decision = memo if memo is not None else (len(self.rules), None)
+
+        decision: Optional[Decision] = None
+        decided_by: Optional[int] = None
+        for position, rule in enumerate(self.rules[:stop]):
+            if memo is not None and not rule.stateful:
+                continue
+            decision = rule.evaluate(proposal)
+            if decision is not None:
+                decided_by = position
+                break
+        if decided_by is None and memo is not None and memo_decision is not None:
+            decided_by, decision = stop, memo_decision
+
+        if decided_by is not None:
+            self.counts[f"{self.rules[decided_by].name}:{decision}"] += 1
+        self.counts[decision or "undecided"] += 1
+
+        # Only remember what the stateless rules said, and only when they all ran.
+        if memo is None and (decided_by is None or not self.rules[decided_by].stateful):
+            self._memo[key] = (len(self.rules) if decided_by is None else decided_by, decision)
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return decision
+
+    def approver(self, undecided: Decision = "accept") -> Callable[[str, dict], bool]:
+        """Adapt the policy to a non-interactive approver, e.g. for backfills."""
+
+        def approve(user_id: str, args: dict) -> bool:
+            proposal = Proposal(
+                user_id=user_id,
+                content=str(args.get("content", "")),
+                context=str(args.get("context", "")),
+                category=str(args.get("category", "")),
+            )
+            return (self.decide(proposal) or undecided) == "accept"
+
+        return approve
+
+    def stats(self) -> dict[str, int]:
+        """Return decision counts, overall and per rule."""
+        return dict(self.counts)
+
+
+__all__ = [
+    "ApprovalPolicy",
+    "AutoAcceptCategories",
+    "Decision",
+    "DenyPatterns",
+    "Proposal",
+    "RateLimit",
+    "Rule",
+]
@@ -19,4 +19,19 @@ Which memory categories are relevant? Choose from: personal, professional, other
     - "other" (for other topics)
 
 Your response should always be one word from personal, professional, or other. 
-"""
\ No newline at end of file
+"""
+
+BATCH_CATEGORY_PROMPT = """
+Classify each of the following memories into a memory category. Choose from: personal, professional, other
+
+    - "professional" (for work related information, skills, achievements)
+    - "personal" (for personal preferences, hobbies, relationships, interests)
+    - "other" (for memories that fit neither)
+
+Memories:
+{memories}
+
+Respond with one line per memory, in the same order, formatted as "<number>: <category>". For example:
+1: personal
+2: professional
+"""
@@ -0,0 +1,159 @@
+"""Move legacy uncategorized memories into category namespaces.
+
+Memories written before categories existed live directly under
+``("memories", user_id)``. This migration classifies them in batches (many
+memories per LLM call) and moves each one to ``("memories", user_id, category)``
+under the same key. Moved items are deleted from the legacy namespace in the
+same store batch, so re-running the migration picks up where it stopped.
+Memories the model fails to classify stay in the legacy namespace and are
+retried by the next run.
+
+Users can be split across processes with --worker-index/--num-workers; each
+process also migrates several users concurrently.
+
+Usage:
+    python -m memory_agent.recategorize --db memories.sqlite --num-workers 4 --worker-index 0
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langgraph.store.base import BaseStore, GetOp, PutOp
+
+from memory_agent import digest, utils
+from memory_agent.transfer import iter_memory_namespaces, iter_namespace_items, open_sqlite_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True)
+class MigrationStats:
+    """Counters for a recategorization run."""
+
+    users: int = 0
+    migrated: int = 0
+    unclassified: int = 0
+    """Memories left in the legacy namespace because the model did not classify them."""
+    llm_calls: int = 0
+
+
+def _owns(user_id: str, worker_index: int, num_workers: int) -> bool:
+    hashed = hashlib.blake2b(user_id.encode(), digest_size=8).digest()
+    return int.from_bytes(hashed, "big") % num_workers == worker_index
+
+
+async def legacy_user_ids(store: BaseStore, *, worker_index: int = 0, num_workers: int = 1):
+    """Yield users that still have memories directly under ``("memories", user_id)``."""
+    async for ns in iter_memory_namespaces(store):
+        if len(ns) == 2 and _owns(ns[1], worker_index, num_workers):
+            yield ns[1]
+
+
+async def migrate_user(
+    store: BaseStore,
+    llm: Any,
+    user_id: str,
+    *,
+    batch_size: int = 50,
+    stats: MigrationStats,
+) -> None:
+    """Classify and move one user's legacy memories, `batch_size` per LLM call."""
+    legacy_ns = ("memories", user_id)
+    # Paging through the namespace while items move out of it would skip
+    # items, so list the keys first and fetch values one batch at a time.
+    keys = [item.key async for item in iter_namespace_items(store, legacy_ns)]
+    migrated = unclassified = 0
+    for start in range(0, len(keys), batch_size):
+        found = await store.abatch([GetOp(legacy_ns, key) for key in keys[start : start + batch_size]])
+        batch = [item for item in found if item is not None]
+        if not batch:
+            continue
+        categories = await utils.get_memory_categories(
+            [str(item.value.get("content", item.value)) for item in batch], llm
+        )
+        stats.llm_calls += 1
+        classified = [(item, category) for item, category in zip(batch, categories) if category is not None]
+        ops = [PutOp((*legacy_ns, category), item.key, item.value) for item, category in classified]
+        ops += [PutOp(legacy_ns, item.key, None) for item, _ in classified]
+        if ops:
+            await store.abatch(ops)
+            await digest.update_digests(
+                store, [(user_id, category, item.key, item.value) for item, category in classified]
+            )
+        migrated += len(classified)
+        unclassified += len(batch) - len(classified)
+    stats.users += 1
+    stats.migrated += migrated
+    stats.unclassified += unclassified
+    logger.info(
+        "Migrated %d legacy memories for user %s, left %d unclassified", migrated, user_id, unclassified
+    )
+
+
+async def migrate(
+    store: BaseStore,
+    *,
+    llm: Optional[Any] = None,
+    batch_size: int = 50,
+    concurrency: int = 8,
+    worker_index: int = 0,
+    num_workers: int = 1,
+) -> MigrationStats:
+    """Migrate every legacy user owned by this worker, `concurrency` users at a time."""
+    if llm is None:
+        from memory_agent.graph import get_llm
+
+        llm = get_llm()
+    stats = MigrationStats()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(user_id: str) -> None:
+        try:
+            await migrate_user(store, llm, user_id, batch_size=batch_size, stats=stats)
+        finally:
+            slots.release()
+
+    # Collect the users first: moving memories changes the namespace listing
+    # we would otherwise be paging through.
+    user_ids = [u async for u in legacy_user_ids(store, worker_index=worker_index, num_workers=num_workers)]
+    tasks = []
+    for user_id in user_ids:
+        await slots.acquire()
+        tasks.append(asyncio.create_task(run(user_id)))
+    await asyncio.gather(*tasks)
+    return stats
+
+
+async def _run(args: argparse.Namespace) -> None:
+    async with open_sqlite_store(args.db) as store:
+        stats = await migrate(
+            store,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            worker_index=args.worker_index,
+            num_workers=args.num_workers,
+        )
+    logger.info("Migration finished: %s", stats)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Move legacy memories into category namespaces.")
+    parser.add_argument("--db", required=True, help="SQLite store file")
+    parser.add_argument("--batch-size", type=int, default=50, help="memories classified per LLM call")
+    parser.add_argument("--concurrency", type=int, default=8, help="users migrated concurrently")
+    parser.add_argument("--worker-index", type=int, default=0)
+    parser.add_argument("--num-workers", type=int, default=1)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["MigrationStats", "migrate", "migrate_user", "legacy_user_ids"]
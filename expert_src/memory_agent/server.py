@@ -0,0 +1,413 @@
+"""Serve the memory graph from a pool of worker processes.
+
+Requests are routed to workers with consistent hashing on the user or thread
+ID, so every turn of a thread lands on the same worker. Each worker runs turns
+of a single thread one at a time and different threads concurrently.
+
+Run with ``python -m memory_agent.server --workers 4 --port 8000``.
+
+Endpoints:
+    POST /invoke   {"thread_id", "user_id", "messages": [...]} or {"resume": ...}
+    GET  /health   liveness and drain status
+    GET  /metrics  request counters and queue depth per worker
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import signal
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Literal, Optional
+
+from memory_agent.hashring import HashRing
+
+logger = logging.getLogger(__name__)
+
+_NO_ITEM = object()
+
+
+@dataclass(kw_only=True)
+class ServerOptions:
+    """Configuration for the serving pool."""
+
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = os.cpu_count() or 1
+    """Number of worker processes."""
+
+    concurrency: int = 16
+    """Maximum number of threads a single worker runs at once."""
+
+    max_queue: int = 256
+    """Requests queued per worker before new ones are rejected with 503."""
+
+    route_by: Literal["user_id", "thread_id"] = "user_id"
+    """Routing key. Routing by user keeps an in-memory store consistent."""
+
+    request_timeout: float = 300.0
+    drain_timeout: float = 30.0
+
+    health_check_interval: float = 1.0
+    """Seconds between checks for dead workers, which are then respawned."""
+
+    store_path: Optional[str] = None
+    """SQLite file for the memory store. Defaults to one in-memory store per worker."""
+
+    checkpoint_path: Optional[str] = None
+    """SQLite file for checkpoints. Defaults to one in-memory saver per worker."""
+
+
+class WorkerUnavailable(RuntimeError):
+    """The worker that owned a request died before replying."""
+
+
+def _serialize_output(out: dict) -> dict:
+    from langchain_core.messages import messages_to_dict
+
+    return {
+        "messages": messages_to_dict(out.get("messages", [])),
+        "interrupts": [
+            {"id": getattr(i, "id", None), "value": i.value}
+            for i in out.get("__interrupt__", [])
+        ],
+    }
+
+
+async def _open_persistence(stack: contextlib.AsyncExitStack, options: ServerOptions):
+    if options.store_path:
+        from langgraph.store.sqlite.aio import AsyncSqliteStore
+
+        store = await stack.enter_async_context(
+            AsyncSqliteStore.from_conn_string(options.store_path)
+        )
+        await store.setup()
+    else:
+        from langgraph.store.memory import InMemoryStore
+
+        store = InMemoryStore()
+
+    if options.checkpoint_path:
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        checkpointer = await stack.enter_async_context(
+            AsyncSqliteSaver.from_conn_string(options.checkpoint_path)
+        )
+    else:
+        from langgraph.checkpoint.memory import MemorySaver
+
+        checkpointer = MemorySaver()
+    return store, checkpointer
+
+
+async def _worker_loop(inbox: mp.Queue, outbox: mp.Queue, options: ServerOptions):
+    from langgraph.types import Command
+
+    from memory_agent.context import Context
+    from memory_agent.graph import builder
+
+    async with contextlib.AsyncExitStack() as stack:
+        store, checkpointer = await _open_persistence(stack, options)
+        graph = builder.compile(store=store, checkpointer=checkpointer)
+
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(options.concurrency)
+        # asyncio.Lock wakes waiters in FIFO order, so turns of a thread run in
+        # the order they arrived. Locks are dropped once nobody holds them.
+        thread_locks: dict[str, asyncio.Lock] = {}
+        lock_users: dict[str, int] = defaultdict(int)
+        running: set[asyncio.Task] = set()
+
+        async def run(job: dict) -> None:
+            thread_id = job["thread_id"]
+            lock = thread_locks.setdefault(thread_id, asyncio.Lock())
+            lock_users[thread_id] += 1
+            try:
+                async with lock, slots:
+                    if "resume" in job:
+                        payload: Any = Command(resume=job["resume"])
+                    else:
+                        payload = {"messages": job["messages"]}
+                    out = await graph.ainvoke(
+                        payload,
+                        {"configurable": {"thread_id": thread_id, "user_id": job["user_id"]}},
+                        context=Context(user_id=job["user_id"]),
+                    )
+                outbox.put((job["id"], True, _serialize_output(out)))
+            except Exception as e:
+                logger.exception("Turn failed for thread %s", thread_id)
+                outbox.put((job["id"], False, f"{type(e).__name__}: {e}"))
+            finally:
+                lock_users[thread_id] -= 1
+                if not lock_users[thread_id]:
+                    del lock_users[thread_id]
+                    del thread_locks[thread_id]
+
+        while (job := await loop.run_in_executor(None, inbox.get)) is not None:
+            task = asyncio.create_task(run(job))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        await asyncio.gather(*running)
+
+
+def _worker_main(inbox: mp.Queue, outbox: mp.Queue, options: ServerOptions) -> None:
+    # The parent process owns shutdown; workers drain when they get a sentinel.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    asyncio.run(_worker_loop(inbox, outbox, options))
+
+
+class WorkerPool:
+    """Route turns to worker processes and collect their results."""
+
+    def __init__(self, options: ServerOptions) -> None:
+        self.options = options
+        self._ctx = mp.get_context("spawn")
+        self._outbox: mp.Queue = self._ctx.Queue()
+        self._inboxes: list[mp.Queue] = [self._ctx.Queue() for _ in range(options.workers)]
+        self._procs = [self._process(i) for i in range(options.workers)]
+        self._ring: HashRing[int] = HashRing(range(options.workers))
+        self._ids = itertools.count()
+        self._pending: dict[int, tuple[int, Future]] = {}
+        self._lock = threading.Lock()
+        self._queued = [0] * options.workers
+        self._draining = False
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self.metrics: dict[str, float] = defaultdict(float)
+
+    def _process(self, worker: int) -> mp.Process:
+        return self._ctx.Process(
+            target=_worker_main,
+            args=(self._inboxes[worker], self._outbox, self.options),
+            name=f"memory-agent-worker-{worker}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        for proc in self._procs:
+            proc.start()
+        self._collector.start()
+
+    def submit(self, job: dict) -> Future:
+        """Queue a turn on the worker that owns its thread or user."""
+        worker = self._ring.get(str(job[self.options.route_by]))
+        fut: Future = Future()
+        with self._lock:
+            if self._draining:
+                raise RuntimeError("server is draining")
+            if self._queued[worker] >= self.options.max_queue:
+                self.metrics["rejected_total"] += 1
+                raise OverflowError(f"worker {worker} queue is full")
+            job_id = next(self._ids)
+            self._pending[job_id] = (worker, fut)
+            self._queued[worker] += 1
+            self.metrics["requests_total"] += 1
+            # Under the lock, so a respawn cannot swap the inbox in between.
+            self._inboxes[worker].put({**job, "id": job_id})
+        return fut
+
+    def _collect(self) -> None:
+        # Health checks run on a deadline, so steady traffic from healthy
+        # workers cannot keep a dead one from being noticed.
+        interval = self.options.health_check_interval
+        next_check = time.monotonic() + interval
+        while True:
+            try:
+                item = self._outbox.get(timeout=max(0.0, next_check - time.monotonic()))
+            except queue.Empty:
+                item = _NO_ITEM
+            if time.monotonic() >= next_check:
+                self.check_workers()
+                next_check = time.monotonic() + interval
+            if item is _NO_ITEM:
+                continue
+            if item is None:
+                return
+            job_id, ok, result = item
+            with self._lock:
+                pending = self._pending.pop(job_id, None)
+                if pending is None:
+                    # Its worker was declared dead and the request already failed.
+                    continue
+                worker, fut = pending
+                self._queued[worker] -= 1
+                self.metrics["completed_total" if ok else "errors_total"] += 1
+            if ok:
+                fut.set_result(result)
+            else:
+                fut.set_exception(RuntimeError(result))
+
+    def check_workers(self) -> list[int]:
+        """Fail the requests of dead workers and respawn them; return their indexes.
+
+        A respawned worker gets a fresh inbox, so requests that were already
+        failed are not replayed. With the default in-memory store, the memories
+        held by the dead worker are lost.
+        """
+        dead = []
+        with self._lock:
+            if self._draining:
+                return dead
+            for worker, proc in enumerate(self._procs):
+                if proc.exitcode is None:
+                    continue
+                logger.error("Worker %d exited with code %s, respawning", worker, proc.exitcode)
+                dead.append(worker)
+                failed = [job_id for job_id, (w, _) in self._pending.items() if w == worker]
+                for job_id in failed:
+                    _, fut = self._pending.pop(job_id)
+                    fut.set_exception(WorkerUnavailable(f"worker {worker} died"))
+                self._queued[worker] = 0
+                self.metrics["worker_restarts_total"] += 1
+                self.metrics["errors_total"] += len(failed)
+                self._inboxes[worker] = self._ctx.Queue()
+                self._procs[worker] = self._process(worker)
+                self._procs[worker].start()
+        return dead
+
+    def drain(self) -> None:
+        """Stop taking requests, let queued turns finish, then stop workers."""
+        with self._lock:
+            self._draining = True
+        deadline = time.monotonic() + self.options.drain_timeout
+        while self.in_flight() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for proc in self._procs:
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.terminate()
+        self._outbox.put(None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def health(self) -> dict:
+        alive = sum(p.is_alive() for p in self._procs)
+        status = "draining" if self._draining else ("ok" if alive == len(self._procs) else "degraded")
+        return {"status": status, "workers": len(self._procs), "alive": alive}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                **self.metrics,
+                "in_flight": len(self._pending),
+                "queued_per_worker": list(self._queued),
+            }
+
+
+def _make_handler(pool: WorkerPool) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: HTTPStatus, body: Any) -> None:
+            data = json.dumps(body, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                health = pool.health()
+                ok = health["status"] == "ok"
+                self._reply(HTTPStatus.OK if ok else HTTPStatus.SERVICE_UNAVAILABLE, health)
+            elif self.path == "/metrics":
+                self._reply(HTTPStatus.OK, pool.snapshot())
+            else:
+                self._reply(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            if self.path != "/invoke":
+                self._reply(HTTPStatus.NOT_FOUND, {"error": "not found"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                job = {"thread_id": str(body["thread_id"]), "user_id": str(body.get("user_id", "default"))}
+                if "resume" in body:
+                    job["resume"] = body["resume"]
+                else:
+                    job["messages"] = body["messages"]
+            except (ValueError, KeyError) as e:
+                self._reply(HTTPStatus.BAD_REQUEST, {"error": f"invalid request: {e}"})
+                return
+            try:
+                fut = pool.submit(job)
+            except (RuntimeError, OverflowError) as e:
+                self._reply(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)})
+                return
+            try:
+                self._reply(HTTPStatus.OK, fut.result(timeout=pool.options.request_timeout))
+            except TimeoutError:
+                self._reply(HTTPStatus.GATEWAY_TIMEOUT, {"error": "turn timed out"})
+            except WorkerUnavailable as e:
+                self._reply(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)})
+            except RuntimeError as e:
+                self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return Handler
+
+
+def serve(options: ServerOptions) -> None:
+    """Start the worker pool and serve HTTP until SIGINT/SIGTERM, then drain."""
+    pool = WorkerPool(options)
+    pool.start()
+    httpd = ThreadingHTTPServer((options.host, options.port), _make_handler(pool))
+    httpd.daemon_threads = True
+
+    def shutdown(signum, frame):
+        logger.info("Received signal %s, draining", signum)
+        # serve_forever() must be stopped from another thread.
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    logger.info("Serving on %s:%s with %d workers", options.host, options.port, options.workers)
+    try:
+        httpd.serve_forever()
+    finally:
+        pool.drain()
+        httpd.server_close()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    defaults = ServerOptions()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--workers", type=int, default=defaults.workers)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--max-queue", type=int, default=defaults.max_queue)
+    parser.add_argument("--route-by", choices=["user_id", "thread_id"], default=defaults.route_by)
+    parser.add_argument("--request-timeout", type=float, default=defaults.request_timeout)
+    parser.add_argument("--drain-timeout", type=float, default=defaults.drain_timeout)
+    parser.add_argument("--health-check-interval", type=float, default=defaults.health_check_interval)
+    parser.add_argument("--store-path", default=None)
+    parser.add_argument("--checkpoint-path", default=None)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    serve(ServerOptions(**vars(args)))
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["ServerOptions", "WorkerPool", "WorkerUnavailable", "serve"]
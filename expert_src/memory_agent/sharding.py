@@ -0,0 +1,260 @@
+"""Spread user memory namespaces across several stores with consistent hashing."""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal, Optional
+
+from langgraph.store.base import (
+    NOT_PROVIDED,
+    BaseStore,
+    GetOp,
+    Item,
+    ListNamespacesOp,
+    NotProvided,
+    Op,
+    PutOp,
+    Result,
+    SearchOp,
+)
+
+from memory_agent.hashring import HashRing
+
+logger = logging.getLogger(__name__)
+
+
+def _routing_key(namespace: tuple[str, ...]) -> Optional[str]:
+    """Return the key a namespace is sharded on, or None for the root namespace.
+
+    Namespaces follow ``(kind, user_id, ...)``, e.g. ``("memories", user_id,
+    category)``, so everything belonging to a user lands on the same shard.
+    """
+    if len(namespace) >= 2:
+        return f"{namespace[0]}/{namespace[1]}"
+    if len(namespace) == 1:
+        return namespace[0]
+    return None
+
+
+class ShardedStore(BaseStore):
+    """A store that routes each user's namespaces to one of N underlying stores.
+
+    Operations are grouped per shard and each group runs as a single batch, with
+    the shards running concurrently. Searches and namespace listings that are
+    not scoped to a user fan out to every shard and are merged.
+
+    Shards can be added online with `aadd_shard`: reads consult both the new
+    and the previous owner until the moved namespaces have been copied over.
+    """
+
+    def __init__(self, shards: Sequence[BaseStore], *, replicas: int = 128) -> None:
+        if not shards:
+            raise ValueError("ShardedStore needs at least one shard")
+        self.shards: list[BaseStore] = list(shards)
+        self._ring: HashRing[int] = HashRing(range(len(self.shards)), replicas=replicas)
+        self._previous: Optional[HashRing[int]] = None
+        self._executor = ThreadPoolExecutor(max_workers=len(self.shards))
+
+    def _owner(self, namespace: tuple[str, ...]) -> Optional[int]:
+        key = _routing_key(namespace)
+        return None if key is None else self._ring.get(key)
+
+    def _previous_owner(self, namespace: tuple[str, ...]) -> Optional[int]:
+        key = _routing_key(namespace)
+        if key is None or self._previous is None:
+            return None
+        owner = self._previous.get(key)
+        return None if owner == self._ring.get(key) else owner
+
+    def _plan(self, ops: Sequence[Op]) -> dict[int, list[tuple[int, Op]]]:
+        """Split `ops` into per-shard lists of (position, op)."""
+        plan: dict[int, list[tuple[int, Op]]] = defaultdict(list)
+        all_shards = range(len(self.shards))
+        for pos, op in enumerate(ops):
+            if isinstance(op, GetOp):
+                targets = [self._owner(op.namespace), self._previous_owner(op.namespace)]
+            elif isinstance(op, PutOp):
+                # A write during migration also clears the old copy so the
+                # rebalancer never moves a stale value over a fresh one.
+                targets = [self._owner(op.namespace)]
+                old = self._previous_owner(op.namespace)
+                if old is not None:
+                    plan[old].append((pos, PutOp(op.namespace, op.key, None)))
+            elif isinstance(op, SearchOp) and len(op.namespace_prefix) >= 2:
+                targets = [self._owner(op.namespace_prefix), self._previous_owner(op.namespace_prefix)]
+            else:
+                targets = list(all_shards)
+            targets = [t for t in targets if t is not None]
+            for shard in targets:
+                plan[shard].append((pos, self._widen(op, len(targets) > 1)))
+        return plan
+
+    @staticmethod
+    def _widen(op: Op, fanned_out: bool) -> Op:
+        """Ask every shard for offset+limit rows so the merged page is correct."""
+        if not fanned_out:
+            return op
+        if isinstance(op, SearchOp):
+            return SearchOp(
+                op.namespace_prefix,
+                op.filter,
+                op.limit + op.offset,
+                0,
+                op.query,
+                op.refresh_ttl,
+            )
+        if isinstance(op, ListNamespacesOp):
+            return ListNamespacesOp(op.match_conditions, op.max_depth, op.limit + op.offset, 0)
+        return op
+
+    def _merge(self, ops: Sequence[Op], partials: dict[int, list[tuple[int, Any]]]) -> list[Result]:
+        results: list[Result] = []
+        for pos, op in enumerate(ops):
+            by_shard = partials.get(pos, [])
+            parts = [result for _, result in by_shard]
+            if isinstance(op, GetOp):
+                # During migration prefer the new owner's copy over the old one.
+                owner = self._owner(op.namespace)
+                found = [(s, r) for s, r in by_shard if r is not None]
+                results.append(min(found, key=lambda f: f[0] != owner)[1] if found else None)
+            elif isinstance(op, PutOp):
+                results.append(None)
+            elif isinstance(op, SearchOp):
+                seen: dict[tuple, Item] = {}
+                for items in parts:
+                    for item in items:
+                        seen.setdefault((item.namespace, item.key), item)
+                merged = list(seen.values())
+                if op.query:
+                    merged.sort(key=lambda i: i.score if i.score is not None else float("-inf"), reverse=True)
+                elif len(parts) > 1:
+                    merged.sort(key=lambda i: i.updated_at, reverse=True)
+                results.append(merged[op.offset : op.offset + op.limit] if len(parts) > 1 else merged)
+            elif isinstance(op, ListNamespacesOp):
+                merged_ns = sorted({ns for namespaces in parts for ns in namespaces})
+                results.append(merged_ns[op.offset : op.offset + op.limit] if len(parts) > 1 else merged_ns)
+            else:
+                raise ValueError(f"Unknown operation type: {type(op)}")
+        return results
+
+    @staticmethod
+    def _collect(
+        plan: dict[int, list[tuple[int, Op]]], shard_results: Iterable[tuple[int, list[Result]]]
+    ) -> dict[int, list[tuple[int, Any]]]:
+        partials: dict[int, list[tuple[int, Any]]] = defaultdict(list)
+        for shard, results in shard_results:
+            for (pos, op), result in zip(plan[shard], results):
+                if not isinstance(op, PutOp):
+                    partials[pos].append((shard, result))
+        return partials
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        ops = list(ops)
+        plan = self._plan(ops)
+        futures = {
+            shard: self._executor.submit(self.shards[shard].batch, [op for _, op in shard_ops])
+            for shard, shard_ops in plan.items()
+        }
+        return self._merge(ops, self._collect(plan, ((s, f.result()) for s, f in futures.items())))
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        ops = list(ops)
+        plan = self._plan(ops)
+        shards = list(plan)
+        results = await asyncio.gather(
+            *(self.shards[shard].abatch([op for _, op in plan[shard]]) for shard in shards)
+        )
+        return self._merge(ops, self._collect(plan, zip(shards, results)))
+
+    async def aadd_shard(
+        self,
+        store: BaseStore,
+        *,
+        batch_size: int = 500,
+        index: Literal[False] | list[str] | None = None,
+        ttl: float | None | NotProvided = NOT_PROVIDED,
+    ) -> int:
+        """Add a shard and move the namespaces it now owns onto it.
+
+        The store keeps serving reads and writes while data moves. Returns the
+        number of items moved. `index` and `ttl` are passed to `arebalance`.
+        """
+        self._previous = HashRing(self._ring.nodes, replicas=self._ring.replicas)
+        self.shards.append(store)
+        self._ring.add(len(self.shards) - 1)
+        old_executor, self._executor = self._executor, ThreadPoolExecutor(max_workers=len(self.shards))
+        # Batches already submitted to the old executor still run to completion.
+        old_executor.shutdown(wait=False)
+        try:
+            return await self.arebalance(batch_size=batch_size, index=index, ttl=ttl)
+        finally:
+            self._previous = None
+
+    async def arebalance(
+        self,
+        *,
+        batch_size: int = 500,
+        index: Literal[False] | list[str] | None = None,
+        ttl: float | None | NotProvided = NOT_PROVIDED,
+    ) -> int:
+        """Move every namespace that lives on a shard other than its owner.
+
+        Items do not record how they were indexed or when they expire, so moved
+        items are re-put with `index` (pass what the application uses for its
+        puts) and `ttl` in minutes. By default the target shard's `default_ttl`
+        is used, so remaining lifetimes restart on the new shard.
+        """
+        moved = await asyncio.gather(
+            *(self._drain_shard(i, batch_size, index, ttl) for i in range(len(self.shards)))
+        )
+        return sum(moved)
+
+    @staticmethod
+    def _ttl_for(store: BaseStore, ttl: float | None | NotProvided) -> Optional[float]:
+        if not store.supports_ttl:
+            return None
+        if isinstance(ttl, NotProvided):
+            return (store.ttl_config or {}).get("default_ttl")
+        return ttl
+
+    async def _drain_shard(
+        self,
+        index: int,
+        batch_size: int,
+        put_index: Literal[False] | list[str] | None,
+        ttl: float | None | NotProvided,
+    ) -> int:
+        shard = self.shards[index]
+        prefixes = {ns[:2] for ns in await shard.alist_namespaces(max_depth=2, limit=1_000_000)}
+        moved = 0
+        for prefix in sorted(prefixes):
+            if len(prefix) >= 2 and self._owner(prefix) == index:
+                continue
+            offset = 0
+            while batch := await shard.asearch(prefix, limit=batch_size, offset=offset):
+                by_owner: dict[int, list[Item]] = defaultdict(list)
+                for item in batch:
+                    if (owner := self._owner(item.namespace)) != index:
+                        by_owner[owner].append(item)
+                for owner, items in by_owner.items():
+                    existing = await self.shards[owner].abatch(
+                        [GetOp(i.namespace, i.key) for i in items]
+                    )
+                    target = self.shards[owner]
+                    await target.abatch(
+                        [
+                            PutOp(i.namespace, i.key, i.value, index=put_index, ttl=self._ttl_for(target, ttl))
+                            for i, e in zip(items, existing)
+                            if e is None
+                        ]
+                    )
+                    await shard.abatch([PutOp(i.namespace, i.key, None) for i in items])
+                    moved += len(items)
+                # Moved items are gone from this shard; only skip past the rest.
+                offset += len(batch) - sum(len(items) for items in by_owner.values())
+            logger.info("Rebalanced namespace %s off shard %d", prefix, index)
+        return moved
+
+__all__ = ["ShardedStore"]
@@ -0,0 +1,60 @@
+"""Coalesce identical in-flight async calls into a single request."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight task between concurrent callers that use the same key.
+
+    The first caller for a key starts the work; every caller that arrives while
+    it is still running awaits the same task instead of starting its own. Once
+    the task finishes the key is forgotten, so later calls run fresh.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` for `key`, or join the call already in flight for it."""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+            logger.debug("%s: coalesced call for key %r", self.name, key)
+        else:
+            self.calls += 1
+            task = loop.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        # Shield the shared task so one caller being cancelled does not cancel
+        # the work for everyone else waiting on it.
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, Any]:
+        """Return how many calls were issued and how many were coalesced."""
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+
+__all__ = ["SingleFlight"]
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 from langchain_core.messages import AnyMessage
 from langgraph.graph import add_messages
@@ -16,6 +17,15 @@ class State:
     messages: Annotated[list[AnyMessage], add_messages]
     """The messages in the conversation."""
 
+    category: Optional[str] = None
+    """The memory category of the current topic, as last classified."""
+
+    topic_terms: dict[str, float] = field(default_factory=dict)
+    """Decayed term weights of the current topic, used to detect topic drift."""
+
+    classified_message_id: Optional[str] = None
+    """ID of the human message the category was last checked against."""
+
 
 __all__ = [
     "State",
@@ -7,6 +7,10 @@ from langchain_core.tools import InjectedToolArg
 from langgraph.store.base import BaseStore
 from langgraph.types import interrupt
 
+from memory_agent import digest
+from memory_agent.policy import ApprovalPolicy, Proposal
+from memory_agent.tracing import span
+
 
 async def upsert_memory(
     content: str,
@@ -17,6 +21,8 @@ async def upsert_memory(
     # Hide these arguments from the model.
     user_id: Annotated[str, InjectedToolArg],
     store: Annotated[BaseStore, InjectedToolArg],
+    policy: Annotated[Optional[ApprovalPolicy], InjectedToolArg] = None,
+    tool_call_id: Annotated[Optional[str], InjectedToolArg] = None,
 ):
     """Upsert a memory in the database.
 
@@ -36,16 +42,29 @@ async def upsert_memory(
         memory_id: ONLY PROVIDE IF UPDATING AN EXISTING MEMORY.
         The memory to overwrite.
     """
-    response = interrupt(f"Saving the following memory: {content} in the category: {category}. Please reply with 'accept' or 'reject'")
+    decision = None
+    if policy is not None:
+        with span("store_memory", "policy"):
+            # Keyed by the tool call, so the re-run after a resumed interrupt reuses this decision.
+            decision = policy.decide(
+                Proposal(user_id=user_id, content=content, context=context, category=category),
+                call_id=tool_call_id,
+            )
+    # Only proposals the policy could not settle are sent to a human.
+    response = decision or interrupt(f"Saving the following memory: {content} in the category: {category}. Please reply with 'accept' or 'reject'")
     if response == "accept":
         pass
     else:
         return f"Rejected memory: {content} in the category: {category}"
 
     mem_id = memory_id or uuid.uuid4()
-    await store.aput(
-        ("memories", user_id, category),
-        key=str(mem_id),
-        value={"content": content, "context": context},
-    )
+    value = {"content": content, "context": context}
+    with span("store_memory", "upsert"):
+        await store.aput(
+            ("memories", user_id, category),
+            key=str(mem_id),
+            value=value,
+        )
+    with span("store_memory", "digest"):
+        await digest.update_digest(store, user_id, category, str(mem_id), value)
     return f"Stored memory {mem_id}"
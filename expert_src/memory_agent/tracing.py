@@ -0,0 +1,192 @@
+"""Lightweight span timing for the memory graph.
+
+Spans are grouped by node and stage (e.g. ``call_model``/``search``) into
+in-process histograms with p50/p95/p99, which can be exported as Prometheus text
+over HTTP or appended to a JSONL trace file.
+
+Tracing is off unless ``MEMORY_AGENT_TRACING=1`` is set or `enable()` is called;
+``MEMORY_AGENT_TRACE_FILE`` additionally names a JSONL file to append spans to.
+While off, `span()` returns a shared no-op context manager.
+"""
+
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Prometheus-style bucket bounds, in seconds.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RESERVOIR_SIZE = 4096
+
+_NOOP = contextlib.nullcontext()
+
+
+class Histogram:
+    """Bucketed latency histogram that also keeps recent samples for percentiles."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.recent: deque[float] = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the q-th percentile (0-100) of the recent samples."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class Tracer:
+    """Collects span durations per (node, stage)."""
+
+    def __init__(self) -> None:
+        self.enabled = os.environ.get("MEMORY_AGENT_TRACING", "").lower() in ("1", "true", "yes")
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self._trace_file: Optional[IO[str]] = None
+
+    def record(self, node: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.histograms.get((node, stage))
+            if hist is None:
+                hist = self.histograms[(node, stage)] = Histogram()
+            hist.observe(seconds)
+            if self._trace_file is not None:
+                self._trace_file.write(
+                    json.dumps({"ts": time.time(), "node": node, "stage": stage, "seconds": seconds}) + "\n"
+                )
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return count, mean and p50/p95/p99 per ``node.stage``."""
+        with self._lock:
+            return {
+                f"{node}.{stage}": {
+                    "count": h.count,
+                    "mean": h.total / h.count,
+                    "p50": h.percentile(50),
+                    "p95": h.percentile(95),
+                    "p99": h.percentile(99),
+                }
+                for (node, stage), h in sorted(self.histograms.items())
+            }
+
+    def render_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        name = "memory_agent_stage_seconds"
+        lines = [f"# HELP {name} Latency of memory graph stages.", f"# TYPE {name} histogram"]
+        with self._lock:
+            for (node, stage), h in sorted(self.histograms.items()):
+                labels = f'node="{node}",stage="{stage}"'
+                cumulative = 0
+                for bound, n in zip((*BUCKETS, float("inf")), h.buckets):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {h.total}")
+                lines.append(f"{name}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+
+tracer = Tracer()
+
+
+class _Span:
+    __slots__ = ("node", "stage", "start")
+
+    def __init__(self, node: str, stage: str) -> None:
+        self.node = node
+        self.stage = stage
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        tracer.record(self.node, self.stage, time.perf_counter() - self.start)
+
+
+def span(node: str, stage: str) -> contextlib.AbstractContextManager:
+    """Time the enclosed block as `stage` of `node`."""
+    if not tracer.enabled:
+        return _NOOP
+    return _Span(node, stage)
+
+
+def traced_node(func: F) -> F:
+    """Record the total duration of an async graph node under its own name."""
+    node = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(node, "total"):
+            return await func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def enable(trace_path: Optional[str] = None) -> None:
+    """Turn tracing on, optionally appending every span to a JSONL file."""
+    tracer.enabled = True
+    if trace_path is not None:
+        with tracer._lock:
+            tracer._trace_file = open(trace_path, "a", buffering=1)
+
+
+def disable() -> None:
+    """Turn tracing off and close the trace file, keeping collected histograms."""
+    tracer.enabled = False
+    with tracer._lock:
+        if tracer._trace_file is not None:
+            tracer._trace_file.close()
+            tracer._trace_file = None
+
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` in Prometheus text format from a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = tracer.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="memory-agent-metrics", daemon=True).start()
+    return server
+
+
+if tracer.enabled and os.environ.get("MEMORY_AGENT_TRACE_FILE"):
+    enable(os.environ["MEMORY_AGENT_TRACE_FILE"])
+
+
+__all__ = ["disable", "enable", "serve_metrics", "span", "traced_node", "tracer"]
@@ -0,0 +1,232 @@
+"""Stream memories between a store and JSONL files for backups and migrations.
+
+Each line holds one memory::
+
+    {"user_id": "...", "category": "personal", "key": "...", "value": {...},
+     "created_at": "...", "updated_at": "..."}
+
+Legacy memories stored directly under ``("memories", user_id)`` are exported
+with ``"category": null`` and imported back to the same place.
+
+Usage:
+    python -m memory_agent.transfer export --db memories.sqlite --out backup.jsonl.gz
+    python -m memory_agent.transfer import --db memories.sqlite --in backup.jsonl.gz --resume
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gzip
+import json
+import logging
+import pathlib
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from typing import IO, Optional
+
+from langgraph.store.base import BaseStore, Item, PutOp
+
+from memory_agent import digest
+
+logger = logging.getLogger(__name__)
+
+
+def open_jsonl(path: pathlib.Path, mode: str) -> IO[str]:
+    """Open a JSONL file for text reading or writing, gzip-compressed if it ends in .gz."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+async def iter_memory_namespaces(
+    store: BaseStore,
+    *,
+    user_ids: Optional[Iterable[str]] = None,
+    categories: Optional[Iterable[str]] = None,
+    page_size: int = 1000,
+) -> AsyncIterator[tuple[str, ...]]:
+    """Yield ``("memories", user_id[, category])`` namespaces page by page."""
+    wanted_users = set(user_ids) if user_ids is not None else None
+    wanted_categories = set(categories) if categories is not None else None
+    prefixes = [("memories", u) for u in sorted(wanted_users)] if wanted_users else [("memories",)]
+    for prefix in prefixes:
+        offset = 0
+        while namespaces := await store.alist_namespaces(
+            prefix=prefix, max_depth=3, limit=page_size, offset=offset
+        ):
+            offset += len(namespaces)
+            for ns in namespaces:
+                if len(ns) < 2 or (wanted_users is not None and ns[1] not in wanted_users):
+                    continue
+                category = ns[2] if len(ns) > 2 else None
+                if wanted_categories is not None and category not in wanted_categories:
+                    continue
+                yield ns
+
+
+async def iter_namespace_items(
+    store: BaseStore, namespace: tuple[str, ...], *, page_size: int = 500
+) -> AsyncIterator[Item]:
+    """Yield the items stored directly in `namespace`, one page in memory at a time."""
+    offset = 0
+    while page := await store.asearch(namespace, limit=page_size, offset=offset):
+        offset += len(page)
+        for item in page:
+            # Prefix search also returns items of nested namespaces.
+            if item.namespace == namespace:
+                yield item
+
+
+def _to_record(item: Item) -> dict:
+    return {
+        "user_id": item.namespace[1],
+        "category": item.namespace[2] if len(item.namespace) > 2 else None,
+        "key": item.key,
+        "value": item.value,
+        "created_at": item.created_at.isoformat(),
+        "updated_at": item.updated_at.isoformat(),
+    }
+
+
+def _to_put(record: dict) -> PutOp:
+    namespace = ("memories", record["user_id"])
+    if record.get("category"):
+        namespace += (record["category"],)
+    return PutOp(namespace, str(record["key"]), record["value"])
+
+
+async def export_memories(
+    store: BaseStore,
+    out: IO[str],
+    *,
+    user_ids: Optional[Iterable[str]] = None,
+    categories: Optional[Iterable[str]] = None,
+    page_size: int = 500,
+) -> int:
+    """Write memories as JSONL to `out` and return how many were written."""
+    written = 0
+    async for ns in iter_memory_namespaces(store, user_ids=user_ids, categories=categories):
+        async for item in iter_namespace_items(store, ns, page_size=page_size):
+            out.write(json.dumps(_to_record(item), ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def _numbered(lines: Iterable[str], start: int) -> Iterator[tuple[int, str]]:
+    for lineno, line in enumerate(lines):
+        if lineno >= start:
+            yield lineno, line
+
+
+async def _write(store: BaseStore, puts: list[PutOp]) -> None:
+    await store.abatch(puts)
+    # Legacy memories have no category and so no digest.
+    await digest.update_digests(
+        store, [(op.namespace[1], op.namespace[2], op.key, op.value) for op in puts if len(op.namespace) > 2]
+    )
+
+
+async def import_memories(
+    store: BaseStore,
+    lines: Iterable[str],
+    *,
+    batch_size: int = 500,
+    start: int = 0,
+    on_commit: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Write JSONL memory records to `store` in batches and return the next offset.
+
+    Lines before `start` are skipped, so a job can resume from the offset last
+    passed to `on_commit`, which is called after every batch is written.
+    Profile digests are updated along with each batch.
+    """
+    batch: list[PutOp] = []
+    offset = start
+    for lineno, line in _numbered(lines, start):
+        offset = lineno + 1
+        if not line.strip():
+            continue
+        batch.append(_to_put(json.loads(line)))
+        if len(batch) >= batch_size:
+            await _write(store, batch)
+            batch = []
+            if on_commit is not None:
+                on_commit(offset)
+    if batch:
+        await _write(store, batch)
+    if on_commit is not None:
+        on_commit(offset)
+    return offset
+
+
+@contextlib.asynccontextmanager
+async def open_sqlite_store(db: str):
+    """Open (and create if needed) a SQLite-backed store."""
+    from langgraph.store.sqlite.aio import AsyncSqliteStore
+
+    async with AsyncSqliteStore.from_conn_string(db) as store:
+        await store.setup()
+        yield store
+
+
+async def _run(args: argparse.Namespace) -> None:
+    async with open_sqlite_store(args.db) as store:
+        if args.command == "export":
+            with open_jsonl(pathlib.Path(args.out), "w") as out:
+                count = await export_memories(
+                    store,
+                    out,
+                    user_ids=args.user,
+                    categories=args.category,
+                    page_size=args.batch_size,
+                )
+            logger.info("Exported %d memories to %s", count, args.out)
+            return
+
+        path = pathlib.Path(args.input)
+        offset_path = path.with_name(path.name + ".offset")
+        start = int(offset_path.read_text()) if args.resume and offset_path.exists() else 0
+
+        def commit(offset: int) -> None:
+            offset_path.write_text(str(offset))
+
+        with open_jsonl(path, "r") as lines:
+            end = await import_memories(
+                store, lines, batch_size=args.batch_size, start=start, on_commit=commit
+            )
+        logger.info("Imported lines %d-%d from %s", start, end, path)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import/export memories as JSONL.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="stream memories from the store to JSONL")
+    export.add_argument("--out", required=True, help="output file (.jsonl or .jsonl.gz)")
+    export.add_argument("--user", action="append", help="only export this user (repeatable)")
+    export.add_argument("--category", action="append", help="only export this category (repeatable)")
+
+    imp = sub.add_parser("import", help="write JSONL memories into the store")
+    imp.add_argument("--in", dest="input", required=True, help="input file (.jsonl or .jsonl.gz)")
+    imp.add_argument("--resume", action="store_true", help="continue from the last committed offset")
+
+    for p in (export, imp):
+        p.add_argument("--db", required=True, help="SQLite store file")
+        p.add_argument("--batch-size", type=int, default=500)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = [
+    "export_memories",
+    "import_memories",
+    "iter_memory_namespaces",
+    "iter_namespace_items",
+    "open_jsonl",
+    "open_sqlite_store",
+]
@@ -0,0 +1,210 @@
+"""Token usage and cost accounting per call site, user and thread.
+
+`call_model` records the ``usage_metadata`` of the classification call
+(``classify``) and of the main tool-bound call (``respond``) into the module
+level `tracker`. Totals can be read per user or thread, optionally appended to a
+JSONL file (``MEMORY_AGENT_USAGE_FILE``), and checked against per-user budgets
+(``MEMORY_AGENT_USAGE_BUDGET_USD`` sets the default budget).
+
+Only the most recently active threads keep in-memory totals; the JSONL file
+has every call. File writes happen on a background thread, off the model call
+path.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# USD per million (input, output) tokens, matched by model name prefix.
+PRICES_PER_MTOK: dict[str, tuple[float, float]] = {
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-opus": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-opus-4": (15.0, 75.0),
+}
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Return the estimated USD cost of a call, or 0 for unknown models."""
+    for prefix, (input_price, output_price) in PRICES_PER_MTOK.items():
+        if model.startswith(prefix):
+            return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+    return 0.0
+
+
+@dataclass(kw_only=True)
+class UsageTotals:
+    """Accumulated usage for one aggregation key."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, input_tokens: int, output_tokens: int, cost: float) -> None:
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost_usd += cost
+
+
+class UsageTracker:
+    """Aggregate model usage by (user, call site) and (thread, call site).
+
+    Per-thread totals are kept for the `max_threads` most recently active
+    threads.
+    """
+
+    def __init__(self, *, persist_path: Optional[str] = None, max_threads: int = 10_000) -> None:
+        self.by_user: dict[str, dict[str, UsageTotals]] = defaultdict(lambda: defaultdict(UsageTotals))
+        self.by_thread: OrderedDict[str, dict[str, UsageTotals]] = OrderedDict()
+        self.max_threads = max_threads
+        self.budgets: dict[str, float] = {}
+        self.default_budget: Optional[float] = None
+        self.on_budget_exceeded: Optional[Callable[[str, float, float], None]] = None
+        self._alarmed: set[str] = set()
+        self._lock = threading.Lock()
+        self._persist_path = persist_path
+        self._pending: queue.Queue[str] = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def set_budget(self, user_id: Optional[str], usd: float) -> None:
+        """Set a USD budget for `user_id`, or the default for all users when None."""
+        if user_id is None:
+            self.default_budget = usd
+            self._alarmed.clear()
+        else:
+            self.budgets[user_id] = usd
+            self._alarmed.discard(user_id)
+
+    def record(self, call_site: str, message: Any, *, user_id: str, thread_id: Optional[str]) -> None:
+        """Add the usage reported on `message` (an AIMessage) to the totals."""
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            return
+        model = (getattr(message, "response_metadata", None) or {}).get("model_name", "")
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        cost = estimate_cost(model, input_tokens, output_tokens)
+
+        with self._lock:
+            self.by_user[user_id][call_site].add(input_tokens, output_tokens, cost)
+            if thread_id is not None:
+                sites = self.by_thread.get(thread_id)
+                if sites is None:
+                    sites = self.by_thread[thread_id] = defaultdict(UsageTotals)
+                    if len(self.by_thread) > self.max_threads:
+                        self.by_thread.popitem(last=False)
+                else:
+                    self.by_thread.move_to_end(thread_id)
+                sites[call_site].add(input_tokens, output_tokens, cost)
+            spent = sum(t.cost_usd for t in self.by_user[user_id].values())
+        if self._persist_path:
+            self._persist(
+                {
+                    "ts": time.time(),
+                    "call_site": call_site,
+                    "user_id": user_id,
+                    "thread_id": thread_id,
+                    "model": model,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cost_usd": cost,
+                }
+            )
+        self._check_budget(user_id, spent)
+
+    def _persist(self, record: dict) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="memory-agent-usage", daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+        self._pending.put(json.dumps(record) + "\n")
+
+    def _write_loop(self) -> None:
+        while True:
+            lines = [self._pending.get()]
+            with contextlib.suppress(queue.Empty):
+                while len(lines) < 1000:
+                    lines.append(self._pending.get_nowait())
+            try:
+                with open(self._persist_path, "a") as f:
+                    f.write("".join(lines))
+            except OSError:
+                logger.exception("Dropped %d usage records: cannot write %s", len(lines), self._persist_path)
+            finally:
+                for _ in lines:
+                    self._pending.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait up to `timeout` seconds for recorded calls to reach the usage file.
+
+        Returns whether everything queued so far has been handled.
+        """
+        if self._writer is None:
+            return True
+        done = self._pending.all_tasks_done
+        with done:
+            return done.wait_for(
+                lambda: not self._pending.unfinished_tasks or not self._writer.is_alive(), timeout=timeout
+            ) and not self._pending.unfinished_tasks
+
+    def _check_budget(self, user_id: str, spent: float) -> None:
+        budget = self.budgets.get(user_id, self.default_budget)
+        if budget is None or spent <= budget or user_id in self._alarmed:
+            return
+        self._alarmed.add(user_id)
+        logger.warning("User %s exceeded usage budget: $%.4f > $%.4f", user_id, spent, budget)
+        if self.on_budget_exceeded is not None:
+            self.on_budget_exceeded(user_id, spent, budget)
+
+    def user_totals(self, user_id: str) -> dict[str, dict[str, Any]]:
+        """Return usage per call site for a user."""
+        with self._lock:
+            return {site: asdict(t) for site, t in self.by_user.get(user_id, {}).items()}
+
+    def thread_totals(self, thread_id: str) -> dict[str, dict[str, Any]]:
+        """Return usage per call site for a thread."""
+        with self._lock:
+            return {site: asdict(t) for site, t in self.by_thread.get(thread_id, {}).items()}
+
+    def top_users(self, n: int = 10) -> list[tuple[str, float]]:
+        """Return the `n` users with the highest estimated spend."""
+        with self._lock:
+            spend = {u: sum(t.cost_usd for t in sites.values()) for u, sites in self.by_user.items()}
+        return sorted(spend.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def call_site_totals(self) -> dict[str, dict[str, Any]]:
+        """Return usage per call site across all users."""
+        totals: dict[str, UsageTotals] = defaultdict(UsageTotals)
+        with self._lock:
+            for sites in self.by_user.values():
+                for site, t in sites.items():
+                    agg = totals[site]
+                    agg.calls += t.calls
+                    agg.input_tokens += t.input_tokens
+                    agg.output_tokens += t.output_tokens
+                    agg.cost_usd += t.cost_usd
+        return {site: asdict(t) for site, t in totals.items()}
+
+
+tracker = UsageTracker(persist_path=os.environ.get("MEMORY_AGENT_USAGE_FILE"))
+if os.environ.get("MEMORY_AGENT_USAGE_BUDGET_USD"):
+    tracker.set_budget(None, float(os.environ["MEMORY_AGENT_USAGE_BUDGET_USD"]))
+
+
+__all__ = ["PRICES_PER_MTOK", "UsageTotals", "UsageTracker", "estimate_cost", "tracker"]
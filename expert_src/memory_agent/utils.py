@@ -1,8 +1,15 @@
 """Utility functions used in our graph."""
 
+import re
+
 from langchain_core.messages import HumanMessage
-from typing import Literal
-from .prompts import CATEGORY_PROMPT
+from typing import Literal, Optional
+from .prompts import BATCH_CATEGORY_PROMPT, CATEGORY_PROMPT
+from .singleflight import SingleFlight
+
+# Identical classification prompts issued concurrently (retries, double-submits,
+# resume storms) share a single model call.
+category_flight = SingleFlight("get_memory_category")
 
 
 def split_model_and_provider(fully_specified_name: str) -> dict:
@@ -15,15 +22,25 @@ def split_model_and_provider(fully_specified_name: str) -> dict:
     return {"model": model, "provider": provider}
 
 
-async def get_memory_category(messages, llm) -> Literal["personal", "professional", "other"]:
-    """Get the category of the memory based on the messages."""
+async def get_memory_category(messages, llm, on_response=None) -> Literal["personal", "professional", "other"]:
+    """Get the category of the memory based on the messages.
+
+    `on_response` is called with the model response, once per model call made
+    (coalesced callers do not see it).
+    """
 
     try:
         recent_messages = [m.content for m in messages[-3:]]
 
         category_prompt = CATEGORY_PROMPT.format(messages=recent_messages)
 
-        response = await llm.ainvoke([HumanMessage(content=category_prompt)])
+        async def classify():
+            response = await llm.ainvoke([HumanMessage(content=category_prompt)])
+            if on_response is not None:
+                on_response(response)
+            return response
+
+        response = await category_flight.do((id(llm), category_prompt), classify)
 
         category = response.content.strip()
 
@@ -33,3 +50,26 @@ async def get_memory_category(messages, llm) -> Literal["personal", "professiona
         return "personal"
 
     return category
+
+
+async def get_memory_categories(contents: list[str], llm) -> list[Optional[Literal["personal", "professional", "other"]]]:
+    """Get the categories of several memories with a single LLM call.
+
+    Memories the response does not classify, or all of them if the call
+    fails, get None so the caller can leave them for a later attempt.
+    """
+    categories: list[Optional[Literal["personal", "professional", "other"]]] = [None] * len(contents)
+    if not contents:
+        return categories
+
+    listing = "\n".join(f"{i}. {' '.join(content.split())}" for i, content in enumerate(contents, start=1))
+    try:
+        response = await llm.ainvoke([HumanMessage(content=BATCH_CATEGORY_PROMPT.format(memories=listing))])
+    except Exception:
+        return categories
+
+    for match in re.finditer(r"^\s*(\d+)\s*[:.)-]\s*(personal|professional|other)\b", response.content, re.M | re.I):
+        index = int(match.group(1)) - 1
+        if 0 <= index < len(contents):
+            categories[index] = match.group(2).lower()
+    return categories
@@ -0,0 +1,269 @@
+"""
+Roll up `results/{bucket}_{candidate}.json` score files into statistics and a leaderboard.
+
+Parsed files are kept in an index (`.aggregate_index.json` in the results
+directory). A file is re-read only when its size or mtime changed, and
+re-parsed only when its content hash changed too. Adding one run therefore
+parses one file, not the whole directory.
+
+Runs are grouped by candidate. `test_utils.runner` records the candidate and
+repeat of every run it names in `.runs.json`; for other runs a `-N` suffix is
+taken as a repeat only when a `-1` run shares the base (`claude-mcp-1`,
+`claude-mcp-2` -> `claude-mcp`), so model names such as `gpt-4` stay intact.
+For each bucket and each check key we compute n/mean/stdev/min/max, counting a
+check a run did not report as 0 points. The output is a long-format CSV
+(`summary.csv`) plus a leaderboard (`leaderboard.md`). The leaderboard ranks
+candidates by the fraction of available points they scored, so a candidate
+missing a bucket is not ranked below one that ran more buckets. Buckets other
+candidates have but this one lacks are listed as missing, and every bucket
+shows how many runs its mean is based on.
+
+Usage:
+    python -m test_utils.aggregate --results results
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import pathlib
+import re
+import statistics
+from collections import defaultdict
+from collections.abc import Iterable
+
+INDEX_NAME = ".aggregate_index.json"
+RUNS_NAME = ".runs.json"
+KNOWN_BUCKETS = ("code_quality", "scenarios", "memory", "smoke")
+TOTAL_KEY = "__total__"
+_REPEAT = re.compile(r"^(?P<base>.+)-(?P<repeat>\d+)$")
+
+
+def split_name(stem: str) -> tuple[str, str]:
+    """Split a result file stem into (bucket prefix, run name)."""
+    for bucket in KNOWN_BUCKETS:
+        if stem.startswith(bucket + "_"):
+            return bucket, stem[len(bucket) + 1 :]
+    bucket, _, run = stem.partition("_")
+    return bucket, run
+
+
+def split_repeat(run: str) -> tuple[str, int | None]:
+    """`claude-mcp-2` -> (`claude-mcp`, 2); names without a suffix have no repeat."""
+    match = _REPEAT.match(run)
+    if match:
+        return match["base"], int(match["repeat"])
+    return run, None
+
+
+def load_runs(results_dir: pathlib.Path) -> dict[str, tuple[str, int]]:
+    """Return the runner's run name -> (candidate, repeat) records for `results_dir`."""
+    try:
+        recorded = json.loads((results_dir / RUNS_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    return {run: (entry["candidate"], entry["repeat"]) for run, entry in recorded.items()}
+
+
+def record_runs(results_dir: pathlib.Path, runs: Iterable[tuple[str, str, int]]) -> None:
+    """Add (run name, candidate, repeat) records to `results_dir`, keeping earlier ones."""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    recorded = {run: {"candidate": c, "repeat": r} for run, (c, r) in load_runs(results_dir).items()}
+    recorded.update({run: {"candidate": c, "repeat": r} for run, c, r in runs})
+    path = results_dir / RUNS_NAME
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(recorded, indent=2))
+    os.replace(tmp, path)
+
+
+def resolve_candidates(runs: Iterable[str], recorded: dict[str, tuple[str, int]]) -> dict[str, tuple[str, int | None]]:
+    """Map run names to (candidate, repeat).
+
+    Runner records win. Otherwise `-N` is a repeat only when the base also has
+    a `-1` run and at least two runs share it.
+    """
+    runs = set(runs)
+    siblings: dict[str, set[int]] = defaultdict(set)
+    for run in runs - recorded.keys():
+        base, repeat = split_repeat(run)
+        if repeat is not None:
+            siblings[base].add(repeat)
+    resolved = {}
+    for run in runs:
+        if run in recorded:
+            resolved[run] = recorded[run]
+            continue
+        base, repeat = split_repeat(run)
+        repeats = siblings.get(base, set())
+        resolved[run] = (base, repeat) if len(repeats) > 1 and 1 in repeats else (run, None)
+    return resolved
+
+
+def parse_result(path: pathlib.Path, data: bytes) -> dict | None:
+    try:
+        score = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(score, dict) or "points" not in score or "details" not in score:
+        return None
+    bucket, run = split_name(path.stem)
+    checks: dict[str, float] = defaultdict(float)
+    try:
+        for detail in score["details"]:
+            checks[detail["key"]] += detail.get("points") or 0
+    except (KeyError, TypeError):
+        return None
+    return {
+        "bucket": bucket,
+        "run": run,
+        "points": score["points"],
+        "max_points": score.get("max_points"),
+        "checks": dict(checks),
+    }
+
+
+def update_index(results_dir: pathlib.Path) -> tuple[dict, dict]:
+    """Bring the index up to date with `results_dir`; return it and what changed."""
+    index_path = results_dir / INDEX_NAME
+    index = json.loads(index_path.read_text()) if index_path.exists() else {}
+    changes = {"parsed": 0, "touched": 0, "unchanged": 0, "removed": 0}
+
+    seen = set()
+    for path in sorted(results_dir.glob("*.json")):
+        if path.name == INDEX_NAME:
+            continue
+        seen.add(path.name)
+        stat = path.stat()
+        entry = index.get(path.name)
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            changes["unchanged"] += 1
+            continue
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry and entry["sha256"] == digest:
+            changes["touched"] += 1
+        else:
+            entry = {"sha256": digest, "result": parse_result(path, data)}
+            changes["parsed"] += 1
+        entry.update(mtime=stat.st_mtime, size=stat.st_size)
+        index[path.name] = entry
+
+    for name in set(index) - seen:
+        del index[name]
+        changes["removed"] += 1
+
+    tmp = index_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(index))
+    os.replace(tmp, index_path)
+    return index, changes
+
+
+def _stats(values: list[float]) -> dict:
+    return {
+        "n": len(values),
+        "mean": statistics.fmean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+def summarize(index: dict, recorded: dict[str, tuple[str, int]] | None = None) -> list[dict]:
+    """One row per (candidate, bucket, key), with key TOTAL_KEY for bucket totals.
+
+    `recorded` maps run names to (candidate, repeat), as returned by `load_runs`.
+    """
+    results = [entry["result"] for entry in index.values() if entry["result"] is not None]
+    candidates = resolve_candidates((r["run"] for r in results), recorded or {})
+    groups: dict[tuple[str, str], list[dict]] = defaultdict(list)
+    max_points: dict[tuple[str, str], float] = {}
+    for result in results:
+        group = (candidates[result["run"]][0], result["bucket"])
+        groups[group].append(result)
+        if result["max_points"] is not None:
+            max_points[group] = result["max_points"]
+    samples: dict[tuple[str, str, str], list[float]] = {}
+    for group, runs in groups.items():
+        samples[(*group, TOTAL_KEY)] = [r["points"] for r in runs]
+        # A check missing from a run (e.g. it failed before reaching it) scored 0 there.
+        for key in {key for r in runs for key in r["checks"]}:
+            samples[(*group, key)] = [r["checks"].get(key, 0) for r in runs]
+    return [
+        {"candidate": c, "bucket": b, "key": k, "max_points": max_points.get((c, b)), **_stats(v)}
+        for (c, b, k), v in sorted(samples.items())
+    ]
+
+
+def leaderboard(rows: list[dict]) -> list[dict]:
+    """Rank candidates by the share of available points they scored over their buckets.
+
+    Each entry has the summed mean `points` and `max_points`, their `ratio`,
+    per-bucket `{"mean", "n"}`, and the buckets other candidates ran but this
+    one is `missing`.
+    """
+    board: dict[str, dict] = defaultdict(lambda: {"points": 0.0, "max_points": 0.0, "buckets": {}})
+    for row in rows:
+        if row["key"] != TOTAL_KEY:
+            continue
+        entry = board[row["candidate"]]
+        entry["points"] += row["mean"]
+        entry["max_points"] += row["max_points"] or 0
+        entry["buckets"][row["bucket"]] = {"mean": row["mean"], "n": row["n"]}
+    all_buckets = {b for entry in board.values() for b in entry["buckets"]}
+    for entry in board.values():
+        entry["ratio"] = entry["points"] / entry["max_points"] if entry["max_points"] else 0.0
+        entry["missing"] = sorted(all_buckets - entry["buckets"].keys())
+    ranked = sorted(board.items(), key=lambda kv: kv[1]["ratio"], reverse=True)
+    return [{"rank": i, "candidate": name, **entry} for i, (name, entry) in enumerate(ranked, start=1)]
+
+
+def write_outputs(results_dir: pathlib.Path, rows: list[dict], board: list[dict]) -> None:
+    with open(results_dir / "summary.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["candidate", "bucket", "key", "n", "mean", "stdev", "min", "max", "max_points"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    buckets = sorted({b for entry in board for b in entry["buckets"]})
+    lines = [
+        "| rank | candidate | score | points | " + " | ".join(buckets) + " |",
+        "|---" * (4 + len(buckets)) + "|",
+    ]
+    for entry in board:
+        cells = [
+            f"{entry['buckets'][b]['mean']:.2f} (n={entry['buckets'][b]['n']})" if b in entry["buckets"] else "missing"
+            for b in buckets
+        ]
+        lines.append(
+            f"| {entry['rank']} | {entry['candidate']} | {entry['ratio']:.1%} | "
+            f"{entry['points']:.2f}/{entry['max_points']:g} | " + " | ".join(cells) + " |"
+        )
+    (results_dir / "leaderboard.md").write_text("\n".join(lines) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate eval result files into statistics and a leaderboard.")
+    parser.add_argument("--results", default="results", help="directory holding {bucket}_{candidate}.json files")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the existing index")
+    args = parser.parse_args(argv)
+
+    results_dir = pathlib.Path(args.results)
+    if args.rebuild:
+        (results_dir / INDEX_NAME).unlink(missing_ok=True)
+    index, changes = update_index(results_dir)
+    rows = summarize(index, load_runs(results_dir))
+    board = leaderboard(rows)
+    write_outputs(results_dir, rows, board)
+
+    print(f"index: {changes}")
+    for entry in board:
+        runs = ", ".join(f"{b} n={s['n']}" for b, s in sorted(entry["buckets"].items()))
+        missing = f"; missing {', '.join(entry['missing'])}" if entry["missing"] else ""
+        print(
+            f"{entry['rank']:>3}. {entry['candidate']:<24} {entry['ratio']:6.1%} "
+            f"{entry['points']:7.2f}/{entry['max_points']:g}  ({runs}{missing})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Record/replay cache for chat model calls made by the eval suite.
+
+`CassetteCache` is installed as langchain's global LLM cache, so it records
+every chat model in the process, including the ones a candidate agent builds
+itself. `CassetteChatModel` wraps one model explicitly (the judge). Either way
+each call is keyed by a stable hash of the model's parameters, the messages
+and the bound tools, and the response is stored as one JSON file per key under
+LLM_CASSETTE_DIR (default `cassettes/`). Timestamps and UUIDs are masked before
+hashing, because the memory agent's system prompt embeds the current time and
+stored memory keys.
+
+LLM_CASSETTE selects the mode:
+    off          - call the model directly (default)
+    record-new   - replay recorded calls, record the ones not seen before
+    replay-only  - replay recorded calls, fail on anything new
+    refresh      - always call the model and overwrite the recording
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import re
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+MODES = ("off", "record-new", "replay-only", "refresh")
+DEFAULT_AGENT_MODEL = "anthropic:claude-3-5-sonnet-latest"
+
+_VOLATILE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[+-]\d{2}:\d{2}|Z)?"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+    re.I,
+)
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay-only mode when a call has no recording."""
+
+
+def cassette_mode() -> str:
+    """Return the mode selected by LLM_CASSETTE."""
+    mode = os.getenv("LLM_CASSETTE", "off").lower()
+    if mode not in MODES:
+        raise ValueError(f"LLM_CASSETTE must be one of {MODES}, got {mode!r}")
+    return mode
+
+
+def _mask(text: str) -> str:
+    return _VOLATILE.sub("<volatile>", text)
+
+
+def call_key(model_params: dict, messages: list[BaseMessage], call_kwargs: dict) -> str:
+    """Return the stable hash identifying a model call."""
+    payload = {
+        "model": model_params,
+        # Message ids are random per run, so only the content is hashed.
+        "messages": [
+            {
+                "type": m.type,
+                "content": m.content,
+                "tool_calls": getattr(m, "tool_calls", None) or None,
+                "tool_call_id": getattr(m, "tool_call_id", None),
+            }
+            for m in messages
+        ],
+        "kwargs": call_kwargs,
+    }
+    text = _mask(json.dumps(payload, sort_keys=True, default=str))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model that records responses of `inner` to disk and replays them."""
+
+    inner: BaseChatModel
+    """The real model to call on cache misses."""
+
+    mode: str = "record-new"
+    """One of `MODES`."""
+
+    directory: str = "cassettes"
+    """Where recordings are stored, one JSON file per call."""
+
+    hits: int = 0
+    """Calls answered from a recording."""
+
+    misses: int = 0
+    """Calls sent to `inner`."""
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.inner._llm_type}"
+
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        # Tools are normalized to JSON schemas so they can be hashed and passed
+        # through to `inner.bind_tools` on a miss.
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _path(self, key: str) -> pathlib.Path:
+        return pathlib.Path(self.directory) / key[:2] / f"{key}.json"
+
+    def _lookup(self, messages: list[BaseMessage], kwargs: dict) -> tuple[pathlib.Path, Optional[AIMessage]]:
+        key = call_key(self.inner._identifying_params, messages, kwargs)
+        path = self._path(key)
+        if self.mode != "refresh" and path.exists():
+            self.hits += 1
+            return path, messages_from_dict([json.loads(path.read_text())["response"]])[0]
+        if self.mode == "replay-only":
+            raise CassetteMiss(f"No recording for call {key} in {self.directory}")
+        self.misses += 1
+        return path, None
+
+    def _save(self, path: pathlib.Path, message: BaseMessage) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"response": message_to_dict(message)}, indent=2))
+        os.replace(tmp, path)
+
+    def _runnable(self, kwargs: dict):
+        kwargs = dict(kwargs)
+        tools = kwargs.pop("tools", None)
+        if tools:
+            return self.inner.bind_tools(tools, **kwargs)
+        return self.inner.bind(**kwargs) if kwargs else self.inner
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        path, message = self._lookup(messages, kwargs)
+        if message is None:
+            message = self._runnable(kwargs).invoke(messages, stop=stop)
+            self._save(path, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        path, message = self._lookup(messages, kwargs)
+        if message is None:
+            message = await self._runnable(kwargs).ainvoke(messages, stop=stop)
+            self._save(path, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class CassetteCache(BaseCache):
+    """Global LLM cache that records chat model responses to disk and replays them."""
+
+    def __init__(self, *, mode: str = "record-new", directory: str = "cassettes") -> None:
+        self.mode = mode
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, prompt: str, llm_string: str) -> pathlib.Path:
+        key = hashlib.sha256(_mask(llm_string + "\x1f" + prompt).encode()).hexdigest()
+        return pathlib.Path(self.directory) / key[:2] / f"{key}.json"
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        path = self._path(prompt, llm_string)
+        if self.mode != "refresh" and path.exists():
+            self.hits += 1
+            return loads(json.loads(path.read_text())["generations"])
+        if self.mode == "replay-only":
+            raise CassetteMiss(f"No recording for call {path.stem} in {self.directory}")
+        self.misses += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        path = self._path(prompt, llm_string)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"generations": dumps(return_val)}))
+        os.replace(tmp, path)
+
+    def clear(self, **kwargs: Any) -> None:
+        pass
+
+
+def install_cassette() -> Optional[CassetteCache]:
+    """Record or replay every chat model in this process according to LLM_CASSETTE."""
+    mode = cassette_mode()
+    if mode == "off":
+        return None
+    cache = get_llm_cache()
+    directory = os.getenv("LLM_CASSETTE_DIR", "cassettes")
+    if not (isinstance(cache, CassetteCache) and cache.mode == mode and cache.directory == directory):
+        cache = CassetteCache(mode=mode, directory=directory)
+        set_llm_cache(cache)
+    return cache
+
+
+def wrap(model: BaseChatModel) -> BaseChatModel:
+    """Wrap `model` in a cassette according to LLM_CASSETTE, or return it unchanged."""
+    mode = cassette_mode()
+    if mode == "off":
+        return model
+    return CassetteChatModel(inner=model, mode=mode, directory=os.getenv("LLM_CASSETTE_DIR", "cassettes"))
+
+
+def accepts_chat_model(context_cls: type) -> bool:
+    """Whether the agent's `Context` has a `chat_model` field tests can fill in."""
+    return dataclasses.is_dataclass(context_cls) and "chat_model" in {f.name for f in dataclasses.fields(context_cls)}
+
+
+def cassette_context(context_cls: Optional[type] = None, model: str = DEFAULT_AGENT_MODEL) -> dict:
+    """Install the cassette when enabled and return `Context` kwargs for the agent's model.
+
+    The cassette records the agent's own model, whatever its `Context` looks
+    like. Under the multi-candidate runner, agents whose `Context` has a
+    `chat_model` field also get a model that draws from the shared rate limit;
+    for the others only the judge is rate limited.
+    """
+    from test_utils.rate_limit import shared_rate_limiter
+
+    install_cassette()
+    if context_cls is not None and not accepts_chat_model(context_cls):
+        return {}
+    rate_limiter = shared_rate_limiter()
+    if rate_limiter is None:
+        return {}
+    from langchain.chat_models import init_chat_model
+
+    return {"chat_model": init_chat_model(model, rate_limiter=rate_limiter)}
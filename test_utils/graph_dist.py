@@ -3,55 +3,232 @@ Graph Distance Comparison for LangGraphs
 
 This module provides utilities to compare LangGraph workflows using
 various graph distance algorithms and similarity metrics.
+
+Exact graph edit distance is exponential in the worst case, so every
+comparison first computes cheap bounds: a lower bound from the node and edge
+counts, and an upper bound from matching nodes by name. When the bounds agree,
+or when only an approximation was asked for, no search runs. Otherwise the
+search is capped at the upper bound. Results are cached by Weisfeiler-Lehman
+fingerprint, so a graph structure is compared only once per pair. Searches
+that hit their timeout are not cached, and the cache keeps only the
+MAX_CACHE_ENTRIES most recently used distances.
 """
 
-import networkx as nx
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, Tuple
+
+import networkx as nx
 import numpy as np
 
-def langgraph_to_networkx(app) -> nx.DiGraph:
+MAX_CACHE_ENTRIES = 4096
+
+_cache: "OrderedDict[Tuple[str, str, bool], float]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def langgraph_to_networkx(app, verbose: bool = False) -> nx.DiGraph:
     """Convert LangGraph to NetworkX directed graph"""
     G = nx.DiGraph()
-    
+
     # Get graph information
     graph_info = app.get_graph()
-    
+
     # Add nodes with attributes
     for node_id, node_data in graph_info.nodes.items():
-        node_type = type(node_data.data).__name__ if node_data.data else "None"
-        #id='__start__', name='__start__', data=RunnableCallable(tags=None, recurse=True, explode_args=False, func_accepts={}), metadata=None
-        print(f"Node {node_id} has type {node_type}")
+        if verbose:
+            node_type = type(node_data.data).__name__ if node_data.data else "None"
+            print(f"Node {node_id} has type {node_type}")
         G.add_node(
-            node_id, 
+            node_id,
             name=node_data.name,
             is_start=node_id == "__start__",
             is_end=node_id == "__end__"
         )
-    
+
     # Add edges with attributes
     for edge in graph_info.edges:
         G.add_edge(
-            edge.source, 
-            edge.target, 
+            edge.source,
+            edge.target,
             conditional=edge.conditional,
         )
-    
+
     return G
 
-def compute_graph_distances(app1, app2) -> float:
+
+def graph_fingerprint(G: nx.DiGraph, iterations: int = 3) -> str:
+    """Weisfeiler-Lehman hash over node names and edge conditionality.
+
+    Labelled graphs that hash equal are, in practice, identical, so the hash
+    is a safe cache key for the (unlabelled) edit distance.
+    """
+    H = nx.DiGraph()
+    H.add_nodes_from((n, {"label": str(d.get("name", n))}) for n, d in G.nodes(data=True))
+    H.add_edges_from((u, v, {"label": str(bool(d.get("conditional")))}) for u, v, d in G.edges(data=True))
+    return nx.weisfeiler_lehman_graph_hash(H, node_attr="label", edge_attr="label", iterations=iterations)
+
+
+def same_graph(G1: nx.DiGraph, G2: nx.DiGraph) -> bool:
+    """Whether two graphs are isomorphic with matching node names and edge conditionality."""
+    return nx.is_isomorphic(
+        G1,
+        G2,
+        node_match=lambda a, b: a.get("name") == b.get("name"),
+        edge_match=lambda a, b: bool(a.get("conditional")) == bool(b.get("conditional")),
+    )
+
+
+def edit_distance_bounds(G1: nx.DiGraph, G2: nx.DiGraph) -> Tuple[int, int]:
+    """Lower and upper bounds on the unit-cost graph edit distance.
+
+    Any node mapping yields an upper bound; mapping nodes with the same id
+    onto each other is the natural one for LangGraph workflows.
+    """
+    lower = abs(G1.number_of_nodes() - G2.number_of_nodes()) + abs(G1.number_of_edges() - G2.number_of_edges())
+    nodes1, nodes2 = set(G1.nodes), set(G2.nodes)
+    edges1, edges2 = set(G1.edges), set(G2.edges)
+    upper = len(nodes1 ^ nodes2) + len(edges1 ^ edges2)
+    return lower, upper
+
+
+def _cache_key(G1: nx.DiGraph, G2: nx.DiGraph, exact: bool) -> Tuple[str, str, bool] | None:
+    """Cache key for a pair; None when the fingerprints match, as the key could not tell pairs apart."""
+    fp1, fp2 = sorted((graph_fingerprint(G1), graph_fingerprint(G2)))
+    return None if fp1 == fp2 else (fp1, fp2, exact)
+
+
+def _cache_get(key: Tuple[str, str, bool] | None) -> float | None:
+    if key is None:
+        return None
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _cache_put(key: Tuple[str, str, bool] | None, distance: float) -> None:
+    if key is None:
+        return
+    with _cache_lock:
+        _cache[key] = distance
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def _search(G1: nx.DiGraph, G2: nx.DiGraph, exact: bool, timeout: float) -> Tuple[float, bool]:
+    """Return the distance and whether it is final (the search did not time out)."""
+    lower, upper = edit_distance_bounds(G1, G2)
+    if not exact or lower == upper:
+        return float(upper), True
+    start = time.monotonic()
+    found = nx.graph_edit_distance(G1, G2, upper_bound=upper, timeout=timeout)
+    complete = time.monotonic() - start < timeout
+    return float(upper if found is None else found), complete
+
+
+def graph_distance(G1: nx.DiGraph, G2: nx.DiGraph, exact: bool = True, timeout: float = 60) -> float:
+    """Edit distance between two graphs, cached by fingerprint.
+
+    With `exact=False` the upper bound is returned straight away. With
+    `exact=True` the search only runs when the bounds disagree, is pruned at
+    the upper bound, and falls back to the best distance found on timeout.
+    """
+    key = _cache_key(G1, G2, exact)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    distance, complete = _search(G1, G2, exact, timeout)
+    if complete:
+        _cache_put(key, distance)
+    return distance
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def _pair_distance(args) -> Tuple[float, bool]:
+    G1, G2, exact, timeout = args
+    cached = _cache_get(_cache_key(G1, G2, exact))
+    if cached is not None:
+        return cached, True
+    return _search(G1, G2, exact, timeout)
+
+
+def pairwise_distance_matrix(
+    apps: Dict[str, Any], exact: bool = False, timeout: float = 60, max_workers: int | None = None
+) -> Tuple[list, np.ndarray]:
+    """Symmetric distance matrix over all apps (or networkx graphs), keyed by name.
+
+    Graphs that share a fingerprint and are isomorphic are compared once.
+    Exact searches run in a process pool; approximate distances are cheap
+    enough to run inline.
+    """
+    names = list(apps)
+    graphs = {
+        name: app if isinstance(app, nx.DiGraph) else langgraph_to_networkx(app)
+        for name, app in apps.items()
+    }
+    fingerprints = {name: graph_fingerprint(G) for name, G in graphs.items()}
+
+    # Each graph is represented by the first isomorphic graph with its fingerprint.
+    representative = {}
+    for name in names:
+        representative[name] = next(
+            (
+                r
+                for r in dict.fromkeys(representative.values())
+                if fingerprints[r] == fingerprints[name] and same_graph(graphs[r], graphs[name])
+            ),
+            name,
+        )
+    unique = list(dict.fromkeys(representative.values()))
+    pairs = [(a, b) for i, a in enumerate(unique) for b in unique[i + 1 :]]
+
+    jobs = [(graphs[a], graphs[b], exact, timeout) for a, b in pairs]
+    if exact and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_pair_distance, jobs))
+    else:
+        results = [_pair_distance(job) for job in jobs]
+    # Workers fill their own caches; keep the final results in this process too.
+    for (G1, G2, _, _), (d, complete) in zip(jobs, results):
+        if complete:
+            _cache_put(_cache_key(G1, G2, exact), d)
+
+    by_pair = {}
+    for (a, b), (d, _) in zip(pairs, results):
+        by_pair[(a, b)] = by_pair[(b, a)] = d
+
+    matrix = np.zeros((len(names), len(names)))
+    for i, a in enumerate(names):
+        for j, b in enumerate(names):
+            if representative[a] != representative[b]:
+                matrix[i, j] = by_pair[(representative[a], representative[b])]
+    return names, matrix
+
+
+def compute_graph_distances(app1, app2, verbose: bool = False) -> float:
     """Compute various distance metrics between two LangGraphs"""
-    G1 = langgraph_to_networkx(app1)
-    G2 = langgraph_to_networkx(app2)
-    
+    G1 = langgraph_to_networkx(app1, verbose=verbose)
+    G2 = langgraph_to_networkx(app2, verbose=verbose)
+
     results = {}
-    
-    # 1. Graph Edit Distance (if graphs are small enough)
+
+    # 1. Graph Edit Distance, bounded and cached
     try:
-        edit_dist = nx.graph_edit_distance(G1, G2, timeout=60)
-        print(f"Edit distance: {edit_dist}")
+        edit_dist = graph_distance(G1, G2, exact=True, timeout=60)
+        if verbose:
+            print(f"Edit distance: {edit_dist}")
         results['edit_distance'] = edit_dist
     except Exception as e:
         print(f"Edit distance failed: {e}")
         results['edit_distance'] = float('inf')
-    
-    return results['edit_distance']
\ No newline at end of file
+
+    return results['edit_distance']
@@ -0,0 +1,94 @@
+"""
+Content-addressed cache for LLM-as-judge results.
+
+A judge result depends only on the rendered judge prompt and the judge model.
+It is stored as `<JUDGE_CACHE_DIR>/<sha256(model, prompt)>.json`, so re-running
+the judge on an unchanged candidate, or on another candidate with identical code
+(same code fingerprint), reuses the stored result instead of calling the model.
+Set JUDGE_CACHE=off to always call the judge.
+
+Entries are written atomically and never rewritten on reuse: candidates that
+reuse an entry are appended to a `<key>.candidates` file next to it, so
+concurrent runs cannot lose each other's updates. An unreadable entry counts as
+a miss and is replaced by the next `put`.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import time
+from typing import Optional
+
+
+def code_fingerprint(code: str) -> str:
+    """Hash of the candidate code as shown to the judge."""
+    return hashlib.sha256(code.encode()).hexdigest()[:16]
+
+
+def judge_key(prompt: str, model: str) -> str:
+    """Cache key for a judge call."""
+    return hashlib.sha256(f"{model}\x00{prompt}".encode()).hexdigest()
+
+
+class JudgeCache:
+    """Judge outputs on disk, one JSON file per (prompt, model) key."""
+
+    def __init__(self, directory: Optional[str] = None, enabled: Optional[bool] = None):
+        self.directory = pathlib.Path(directory or os.getenv("JUDGE_CACHE_DIR", "judge_cache"))
+        if enabled is None:
+            enabled = os.getenv("JUDGE_CACHE", "on").lower() not in ("0", "off", "false", "no")
+        self.enabled = enabled
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str, candidate: str) -> Optional[dict]:
+        """Return the cached entry for `key`, noting that `candidate` reused it.
+
+        Missing, truncated or otherwise unreadable entries are misses.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "output" not in entry or not isinstance(entry.get("candidates"), list):
+            return None
+        reusers = path.with_suffix(".candidates")
+        with contextlib.suppress(OSError):
+            seen = reusers.read_text().splitlines() if reusers.exists() else []
+            if candidate not in entry["candidates"] and candidate not in seen:
+                # Single short appends do not interleave, unlike rewriting the entry.
+                with open(reusers, "a", encoding="utf-8") as f:
+                    f.write(candidate + "\n")
+                seen.append(candidate)
+            entry["candidates"] = list(dict.fromkeys([*entry["candidates"], *seen]))
+        return entry
+
+    def put(self, key: str, output: dict, *, model: str, fingerprint: str, candidate: str) -> None:
+        if not self.enabled:
+            return
+        entry = {
+            "model": model,
+            "code_fingerprint": fingerprint,
+            "created_at": time.time(),
+            "candidates": [candidate],
+            "output": output,
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer, so concurrent puts never share one.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(entry, indent=2))
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
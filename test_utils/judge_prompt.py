@@ -0,0 +1,136 @@
+"""
+Build the LLM-as-judge prompt, either in full or as compact diffs.
+
+The full prompt embeds the expert, base and candidate packages in full, which
+means three near-identical copies of the same files. The diff prompt sends the
+base code once, followed by unified diffs from base to expert and from base to
+candidate. To fit the token budget, diff context is narrowed first, and
+then base files are truncated.
+
+Both builders take the criteria as `instructions`, so the smaller
+`SUBJECTIVE_JUDGE_INSTRUCTIONS` can be combined with either code section.
+
+`EXPERT_CODE` and `BASE_CODE` in test_utils.prompt escape braces as `{{`/`}}`,
+while the candidate's listing is read straight from disk. The diff builder
+unescapes the expert and base listings so that unchanged code diffs clean.
+"""
+
+import difflib
+import re
+
+from test_utils.prompt import DIFF_CODE_SECTION, FULL_CODE_SECTION, JUDGE_INSTRUCTIONS
+
+_FILE_HEADER = re.compile(r"^File Name: (.+?)\s*$", re.M)
+_CONTENT_MARKER = "File Content:"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text) // 4
+
+
+def unescape_braces(listing: str) -> str:
+    """Undo the `{{`/`}}` escaping of a listing stored as a format template."""
+    return listing.replace("{{", "{").replace("}}", "}")
+
+
+def parse_code_listing(listing: str) -> dict[str, str]:
+    """Split a `folder_to_prompt_string`-style listing into {file name: content}."""
+    files = {}
+    headers = list(_FILE_HEADER.finditer(listing))
+    for header, following in zip(headers, headers[1:] + [None]):
+        body = listing[header.end() : following.start() if following else len(listing)]
+        _, _, content = body.partition(_CONTENT_MARKER)
+        files[header.group(1)] = content.strip("\n ") + "\n"
+    return files
+
+
+def unified_diff(base: dict[str, str], other: dict[str, str], context_lines: int = 3) -> str:
+    """Unified diff of every file that differs between two listings."""
+    chunks = []
+    for name in sorted(base.keys() | other.keys()):
+        before, after = base.get(name), other.get(name)
+        if before == after:
+            continue
+        chunks.extend(
+            difflib.unified_diff(
+                (before or "").splitlines(keepends=True),
+                (after or "").splitlines(keepends=True),
+                fromfile=f"a/{name}" if before is not None else "/dev/null",
+                tofile=f"b/{name}" if after is not None else "/dev/null",
+                n=context_lines,
+            )
+        )
+    return "".join(chunks) or "(no changes)\n"
+
+
+def render_listing(files: dict[str, str], max_chars_per_file: int | None = None) -> str:
+    parts = []
+    for name, content in sorted(files.items()):
+        if max_chars_per_file is not None and len(content) > max_chars_per_file:
+            content = content[:max_chars_per_file] + "\n... (truncated to fit the token budget)\n"
+        parts.append(f"File Name: {name}\n-----------------------------\n{content}")
+    return "\n".join(parts)
+
+
+def build_full_prompt(
+    *,
+    user_task: str,
+    expert_code: str,
+    base_code: str,
+    user_code: str,
+    human_notes: str,
+    instructions: str = JUDGE_INSTRUCTIONS,
+) -> tuple[str, dict]:
+    """Return the prompt embedding all three packages in full, and its token count."""
+    prompt = (instructions + FULL_CODE_SECTION).format(
+        user_task=user_task, expert_code=expert_code, user_code=user_code, human_notes=human_notes, base_code=base_code
+    )
+    return prompt, {"mode": "full", "tokens": estimate_tokens(prompt)}
+
+
+def build_diff_prompt(
+    *,
+    user_task: str,
+    expert_code: str,
+    base_code: str,
+    user_code: str,
+    human_notes: str,
+    instructions: str = JUDGE_INSTRUCTIONS,
+    token_budget: int = 60_000,
+) -> tuple[str, dict]:
+    """Return the compact diff prompt and stats about it.
+
+    Stats include the estimated token count and how the budget was met. When
+    even the narrowest diffs and truncated base code exceed the budget, the
+    smallest prompt is returned with `over_budget` set. `expert_code` and
+    `base_code` are brace-escaped listings; `user_code` is taken verbatim.
+    """
+    base = parse_code_listing(unescape_braces(base_code))
+    expert = parse_code_listing(unescape_braces(expert_code))
+    user = parse_code_listing(user_code)
+
+    def render(context_lines: int, max_chars_per_file: int | None) -> str:
+        return (instructions + DIFF_CODE_SECTION).format(
+            user_task=user_task,
+            base_code=render_listing(base, max_chars_per_file),
+            expert_diff=unified_diff(base, expert, context_lines),
+            user_diff=unified_diff(base, user, context_lines),
+            human_notes=human_notes,
+        )
+
+    longest = max((len(c) for c in base.values()), default=0)
+    attempts = [(n, None) for n in (3, 1, 0)] + [(0, longest * f // 4) for f in (3, 2, 1)]
+    for context_lines, max_chars in attempts:
+        prompt = render(context_lines, max_chars)
+        tokens = estimate_tokens(prompt)
+        if tokens <= token_budget:
+            break
+    return prompt, {
+        "mode": "diff",
+        "tokens": tokens,
+        "token_budget": token_budget,
+        "over_budget": tokens > token_budget,
+        "context_lines": context_lines,
+        "base_truncated": max_chars is not None,
+    }
@@ -1,4 +1,4 @@
-LLM_AS_A_JUDGE_PROMPT = '''
+JUDGE_INSTRUCTIONS = '''
 You are an expert coding evaluator for agent that stores memories built using langgraph. You will be provided with a coding agent's implementation and an expert-written implementation that represents the gold standard, alongside the base code that was provided to the coding agent to start with.
 
 The coding agent was provided with a task to modify the existing memory agent code to store memories user id and category wise and have interrupt before saving a memory. Your job is to evaluate the coding agent's implementation for correctness, code quality, and adherence to the expert's architectural and code cleanliness philosophy. 
@@ -65,7 +65,9 @@ everything else.
     {{ "issue": string, "severity": "minor|major|critical" }}
   ]
 }}
+'''
 
+FULL_CODE_SECTION = '''
 Task given to coding agent:
 {user_task}
 
@@ -84,6 +86,77 @@ The human annotator added the following notes when running the code:
 {human_notes}
 '''
 
+# The expert and candidate code as unified diffs against the base code instead
+# of as full copies.
+DIFF_CODE_SECTION = '''
+Task given to coding agent:
+{user_task}
+
+Base code provided to the coding agent:
+{base_code}
+
+
+The implementations below are unified diffs against the base code above. Lines
+starting with "+" were added, lines starting with "-" were removed, and a file
+diffed against /dev/null is new. Judge the code that results from applying each
+diff to the base code.
+
+Expert implementation (gold standard), as a diff from the base code:
+{expert_diff}
+
+
+Coding agent implementation to evaluate, as a diff from the base code:
+{user_diff}
+
+The human annotator added the following notes when running the code:
+{human_notes}
+'''
+
+LLM_AS_A_JUDGE_PROMPT = JUDGE_INSTRUCTIONS + FULL_CODE_SECTION
+LLM_AS_A_JUDGE_DIFF_PROMPT = JUDGE_INSTRUCTIONS + DIFF_CODE_SECTION
+
+# Used when test_utils.static_checks has already settled the mechanical
+# requirements (interrupt presence, category namespaces, LLM categorization,
+# test files); only the fields that need judgement are asked for.
+SUBJECTIVE_JUDGE_INSTRUCTIONS = '''
+You are an expert coding evaluator for agent that stores memories built using langgraph. You will be provided with a coding agent's implementation and an expert-written implementation that represents the gold standard, alongside the base code that was provided to the coding agent to start with.
+
+The coding agent was provided with a task to modify the existing memory agent code to store memories user id and category wise and have interrupt before saving a memory. Structural requirements have already been checked automatically; evaluate only the criteria below.
+
+**CRITICAL RULE - NO DUPLICATE ISSUES**: Each specific issue should only appear ONCE, either in code_correctness_evidence OR code_quality_evidence, never both.
+
+Return your evaluation as a single JSON object.
+
+## Evaluation Criteria
+
+- correct_categories: The code should only store memories in the correct three categories. Personal, Professional, Other. Mark true only if the logic is correct and memories are stored in exactly these categories.
+- functional_interrupt: The interrupt before saving a memory must work: the memory is saved when the user inputs accept and rejected on everything else. The expert code's implementation is the simplest correct one; other correct implementations also count.
+
+**Code Quality Evidence** (architectural/design issues):
+- Separate prompt in the prompt file for llm classification.
+- No unnecessary complexity
+- Correct primitives for Langgraph types such as state, messages (which should be defined as Annotated[list, add_messages] in state), context, etc.
+
+**Code Correctness Evidence** (functional/runtime bugs):
+- No Runtime exceptions or type errors
+- Type errors, import failures
+
+## JSON Response Structure
+
+{{
+  "correct_categories": boolean,
+  "functional_interrupt": boolean,
+  "code_quality_check": boolean,
+  "code_quality_evidence": [
+    {{ "issue": string, "severity": "minor|major|critical" }}
+  ],
+  "code_correctness_check": boolean,
+  "code_correctness_evidence": [
+    {{ "issue": string, "severity": "minor|major|critical" }}
+  ]
+}}
+'''
+
 USER_TASK = '''
 You have been provided code for a memory agent. I want to extend its functionality. Right now, it stores memories user id wise. 
 I want it to store user id and category wise. While storing a memory it should determine if a memory is personal, professional, or other. 
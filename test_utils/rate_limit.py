@@ -0,0 +1,122 @@
+"""
+LLM rate limiting shared across eval worker processes.
+
+The runner (`test_utils.runner`) hosts a single token bucket in its own process
+and serves it over a `multiprocessing` manager. Worker processes find it
+through the LLM_RATE_LIMIT_ADDRESS and LLM_RATE_LIMIT_AUTHKEY environment
+variables. `shared_rate_limiter()` returns a langchain `BaseRateLimiter` that
+draws from that bucket. Pass it as `rate_limiter=` to any chat model the tests
+construct, and all workers together stay under one request rate.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Optional
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until a token is available."""
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        self.rate = requests_per_second
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.granted = 0
+        self._lock = threading.Lock()
+
+    def _try(self) -> float:
+        """Take a token if possible; otherwise return seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.granted += 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, blocking: bool = True) -> bool:
+        while True:
+            wait = self._try()
+            if not wait:
+                return True
+            if not blocking:
+                return False
+            time.sleep(wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"granted": self.granted, "requests_per_second": self.rate, "burst": self.capacity}
+
+
+class RateLimitManager(BaseManager):
+    pass
+
+
+_bucket: Optional[TokenBucket] = None
+
+
+def _get_bucket() -> TokenBucket:
+    return _bucket
+
+
+RateLimitManager.register("bucket", callable=_get_bucket)
+
+
+def serve(requests_per_second: float, burst: int = 1) -> tuple[RateLimitManager, dict]:
+    """Start serving a token bucket; return the manager and the env vars workers need."""
+    global _bucket
+    _bucket = TokenBucket(requests_per_second, burst)
+    authkey = os.urandom(16)
+    manager = RateLimitManager(address=("127.0.0.1", 0), authkey=authkey)
+    # The bucket must live in this process so that `stats()` sees every grant;
+    # a started manager would run it in a child process, so run the server in a thread.
+    server = manager.get_server()
+    threading.Thread(target=server.serve_forever, name="llm-rate-limit", daemon=True).start()
+    host, port = server.address
+    return manager, {"LLM_RATE_LIMIT_ADDRESS": f"{host}:{port}", "LLM_RATE_LIMIT_AUTHKEY": authkey.hex()}
+
+
+def bucket_stats() -> dict:
+    """Stats of the bucket served by this process."""
+    return _bucket.stats() if _bucket is not None else {}
+
+
+class SharedRateLimiter(BaseRateLimiter):
+    """Rate limiter backed by the runner's shared token bucket."""
+
+    def __init__(self, address: str, authkey: bytes):
+        host, port = address.rsplit(":", 1)
+        self._manager = RateLimitManager(address=(host, int(port)), authkey=authkey)
+        self._manager.connect()
+        self._bucket = self._manager.bucket()
+        self._lock = threading.Lock()
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        # Proxies are not safe to share between threads without a lock.
+        with self._lock:
+            return self._bucket.acquire(blocking)
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        return await asyncio.to_thread(self.acquire, blocking=blocking)
+
+
+_shared: Optional[SharedRateLimiter] = None
+
+
+def shared_rate_limiter() -> Optional[SharedRateLimiter]:
+    """Return the shared limiter when running under the runner, else None."""
+    global _shared
+    address = os.getenv("LLM_RATE_LIMIT_ADDRESS")
+    if not address:
+        return None
+    if _shared is None:
+        _shared = SharedRateLimiter(address, bytes.fromhex(os.environ["LLM_RATE_LIMIT_AUTHKEY"]))
+    return _shared
@@ -0,0 +1,205 @@
+"""
+Run the eval suite for many candidates and repeats in isolated processes.
+
+Each (candidate, repeat) pair runs pytest in its own interpreter, because the
+tests mutate `sys.path` and `sys.modules` and so cannot share a process. Runs
+execute with bounded parallelism and draw LLM calls from one shared token
+bucket (see `test_utils.rate_limit`). A candidate stops receiving new repeats
+once `--min-repeats` runs agree within `--tolerance` points (standard error of
+the total score), or when `--max-repeats` is reached. With more than one repeat
+the judge cache is turned off (JUDGE_CACHE=off), so every repeat asks the judge. Result files of every
+run are copied into one results directory and a summary is written next to
+them.
+
+A candidate is `name=path`, where `path` is this eval repository inside the
+candidate's checkout (the directory pytest runs from). Each run is named
+`<name>-<repeat>` via CANDIDATE_NAME, matching the existing results/ layout, and
+recorded in the results directory's `.runs.json` for `test_utils.aggregate`.
+
+Usage:
+    python -m test_utils.runner --candidate claude-mcp=../../claude-mcp/evals \\
+        --candidate claude-sys=../../claude-sys/evals --parallel 4 --max-repeats 5 --rps 2
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from test_utils.aggregate import record_runs
+from test_utils.rate_limit import bucket_stats, serve
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+@dataclass(kw_only=True)
+class Candidate:
+    name: str
+    workdir: pathlib.Path
+    started: int = 0
+    finished: list[dict] = field(default_factory=list)
+    stopped_early: bool = False
+
+    def totals(self) -> list[float]:
+        return [run["points"] for run in self.finished]
+
+
+def parse_candidate(spec: str) -> Candidate:
+    name, sep, path = spec.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"candidate must be name=path, got {spec!r}")
+    return Candidate(name=name, workdir=pathlib.Path(path).resolve())
+
+
+def run_once(candidate: Candidate, repeat: int, tests: list[str], env: dict, timeout: float) -> dict:
+    """Run the test files once for one candidate repeat and collect its result files."""
+    run_name = f"{candidate.name}-{repeat}"
+    start = time.perf_counter()
+    started_at = time.time()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *tests],
+            cwd=candidate.workdir,
+            env={**os.environ, **env, "CANDIDATE_NAME": run_name},
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+        returncode, tail = proc.returncode, proc.stdout.strip().splitlines()[-1:]
+    except subprocess.TimeoutExpired:
+        returncode, tail = None, ["timeout"]
+
+    results_dir = candidate.workdir / "results"
+    files = [
+        p
+        for p in results_dir.glob(f"*_{run_name}.json")
+        if p.stat().st_mtime >= started_at - 1
+    ]
+    scores = [json.loads(p.read_text()) for p in files]
+    return {
+        "candidate": candidate.name,
+        "repeat": repeat,
+        "run_name": run_name,
+        "returncode": returncode,
+        "pytest": tail[0] if tail else "",
+        "seconds": time.perf_counter() - start,
+        "files": [str(p) for p in files],
+        "points": sum(s.get("points", 0) for s in scores),
+        "max_points": sum(s.get("max_points", 0) for s in scores),
+        "buckets": {s.get("bucket", p.stem): s.get("points", 0) for p, s in zip(files, scores)},
+    }
+
+
+def converged(candidate: Candidate, min_repeats: int, tolerance: float) -> bool:
+    totals = candidate.totals()
+    if len(totals) < min_repeats:
+        return False
+    if len(totals) < 2:
+        return True
+    return statistics.stdev(totals) / len(totals) ** 0.5 <= tolerance
+
+
+def run_all(candidates: list[Candidate], args: argparse.Namespace) -> list[dict]:
+    env = {}
+    if args.max_repeats > 1:
+        # Cached verdicts would make every repeat of a candidate score the same.
+        env["JUDGE_CACHE"] = "off"
+    if args.rps:
+        env.update(serve(args.rps, burst=args.burst)[1])
+
+    runs: list[dict] = []
+    with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        pending = {}
+
+        def schedule() -> None:
+            # Round-robin over candidates so each gets its first repeats early.
+            while len(pending) < args.parallel:
+                open_candidates = [
+                    c for c in candidates if not c.stopped_early and c.started < args.max_repeats
+                ]
+                if not open_candidates:
+                    return
+                candidate = min(open_candidates, key=lambda c: c.started)
+                candidate.started += 1
+                future = pool.submit(run_once, candidate, candidate.started, args.tests, env, args.timeout)
+                pending[future] = candidate
+
+        schedule()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = pending.pop(future)
+                run = future.result()
+                candidate.finished.append(run)
+                runs.append(run)
+                if converged(candidate, args.min_repeats, args.tolerance):
+                    candidate.stopped_early = candidate.started < args.max_repeats
+                print(
+                    f"{run['run_name']:<30} {run['points']:>6.1f}/{run['max_points']:<4} "
+                    f"{run['seconds']:7.1f}s  {run['pytest']}",
+                    flush=True,
+                )
+            schedule()
+    return runs
+
+
+def merge(candidates: list[Candidate], runs: list[dict], out_dir: pathlib.Path, wall: float) -> dict:
+    """Copy every run's result files into `out_dir` and write a summary."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for run in runs:
+        for path in run["files"]:
+            if pathlib.Path(path).parent.resolve() != out_dir.resolve():
+                shutil.copy2(path, out_dir)
+    summary = {
+        "wall_seconds": wall,
+        "rate_limit": bucket_stats(),
+        "candidates": {
+            c.name: {
+                "repeats": len(c.finished),
+                "stopped_early": c.stopped_early,
+                "mean_points": statistics.fmean(c.totals()) if c.finished else None,
+                "stdev_points": statistics.stdev(c.totals()) if len(c.finished) > 1 else 0.0,
+                "runs": sorted(c.finished, key=lambda r: r["repeat"]),
+            }
+            for c in candidates
+        },
+    }
+    # Tells test_utils.aggregate which suffix is a repeat, whatever the candidate is called.
+    record_runs(out_dir, ((run["run_name"], run["candidate"], run["repeat"]) for run in runs))
+    with open(out_dir / "runner_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the eval suite for several candidates and repeats.")
+    parser.add_argument("--candidate", action="append", type=parse_candidate, required=True, help="name=path")
+    parser.add_argument("--tests", nargs="+", default=["tests"], help="test files or directories, relative to each path")
+    parser.add_argument("--parallel", type=int, default=4, help="runs in flight at once")
+    parser.add_argument("--min-repeats", type=int, default=2)
+    parser.add_argument("--max-repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="standard error of total points to stop at")
+    parser.add_argument("--rps", type=float, default=0.0, help="shared LLM requests per second (0 = unlimited)")
+    parser.add_argument("--burst", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=1800.0, help="seconds per run")
+    parser.add_argument("--out", default=str(REPO_ROOT / "results"), help="directory to merge results into")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    runs = run_all(args.candidate, args)
+    summary = merge(args.candidate, runs, pathlib.Path(args.out), time.perf_counter() - start)
+    for name, c in summary["candidates"].items():
+        mean = "n/a" if c["mean_points"] is None else f"{c['mean_points']:.2f}"
+        early = " (stopped early)" if c["stopped_early"] else ""
+        print(f"{name:<24} repeats {c['repeats']}  mean {mean}  stdev {c['stdev_points']:.2f}{early}")
+
+
+if __name__ == "__main__":
+    main()
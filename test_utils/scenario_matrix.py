@@ -0,0 +1,179 @@
+"""
+Data-driven scenario matrix for the memory eval.
+
+Each `EvalCase` is one user message with the category it should be stored under
+and the decision ("accept" or "reject") to resume the interrupt with. The
+cases run concurrently against a single compiled graph. Every case gets its own
+thread ID and user ID, so their memories never mix. `run_matrix` reports
+per-category classification accuracy, interrupt counts and wall time.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+# Resumes per case before it is recorded as an error; one proposal needs one.
+MAX_RESUMES = 3
+
+STATEMENTS = {
+    "professional": [
+        "I work as a data scientist at Google and love my job.",
+        "I work as a software engineer at Microsoft and enjoy coding.",
+        "I just got promoted to engineering manager on the payments team.",
+        "I'm a nurse working night shifts at the city hospital.",
+        "I run a small accounting firm with four employees.",
+        "I'm preparing for my AWS solutions architect certification.",
+        "My team ships the mobile app every two weeks and I lead the releases.",
+        "I teach high school chemistry and coach the robotics club.",
+        "I switched careers from law to product management last year.",
+        "I'm negotiating a raise with my manager next week.",
+    ],
+    "personal": [
+        "My favorite hobby is playing guitar and I practice every evening.",
+        "I have two cats named Miso and Tofu.",
+        "I'm vegetarian and I love cooking Thai food.",
+        "My sister is getting married in June.",
+        "I run marathons and I'm training for Berlin.",
+        "I'm allergic to peanuts.",
+        "My favorite book is One Hundred Years of Solitude.",
+        "I grew up in Lisbon and moved to Toronto as a teenager.",
+        "I'm learning Japanese because I want to visit Kyoto.",
+        "I go rock climbing with my partner every Saturday.",
+    ],
+    "other": [
+        "The weather in Paris was rainy all week.",
+        "The train to the airport was delayed by an hour today.",
+        "There was a power outage in the neighborhood last night.",
+        "The local library is closed for renovation this month.",
+        "The news said the bridge downtown will reopen in spring.",
+        "Traffic on the highway was terrible this morning.",
+        "The museum has a new dinosaur exhibit.",
+        "It snowed for the first time this winter.",
+        "The coffee shop on the corner changed its opening hours.",
+        "The city is adding more bike lanes downtown.",
+    ],
+}
+
+
+@dataclass(kw_only=True)
+class EvalCase:
+    """One scripted conversation turn and its expected outcome."""
+
+    case_id: str
+    message: str
+    expected_category: str
+    decision: str = "accept"
+
+
+@dataclass(kw_only=True)
+class CaseResult:
+    """What happened when a case ran."""
+
+    case: EvalCase
+    interrupts: int = 0
+    stored_categories: list[str] = field(default_factory=list)
+    error: str = ""
+    seconds: float = 0.0
+
+    @property
+    def correct(self) -> bool:
+        """Accepted memories land in the expected category; rejected ones are not stored."""
+        if self.error or not self.interrupts:
+            return False
+        if self.case.decision == "accept":
+            return self.case.expected_category in self.stored_categories
+        return not self.stored_categories
+
+
+def build_matrix(
+    statements: dict[str, list[str]] = STATEMENTS,
+    decisions: tuple[str, ...] = ("accept", "reject"),
+    suffix: str = " Remember this.",
+) -> list[EvalCase]:
+    """Cross every statement with every decision."""
+    return [
+        EvalCase(
+            case_id=f"{category}-{i}-{decision}",
+            message=message + suffix,
+            expected_category=category,
+            decision=decision,
+        )
+        for (category, messages), decision in itertools.product(statements.items(), decisions)
+        for i, message in enumerate(messages)
+    ]
+
+
+async def run_case(graph, store, case: EvalCase, run_id: str, context_factory) -> CaseResult:
+    from langgraph.types import Command
+
+    result = CaseResult(case=case)
+    user_id = f"{run_id}-user-{case.case_id}"
+    config = {"configurable": {"thread_id": f"{run_id}-{case.case_id}"}}
+    context = context_factory(user_id)
+    start = time.perf_counter()
+    try:
+        res = await graph.ainvoke({"messages": [("user", case.message)]}, config, context=context)
+        while "__interrupt__" in res:
+            if result.interrupts >= MAX_RESUMES:
+                raise RuntimeError(f"still interrupted after {MAX_RESUMES} resumes")
+            result.interrupts += 1
+            res = await graph.ainvoke(Command(resume=case.decision), config, context=context)
+        items = await store.asearch(("memories", user_id), limit=100)
+        result.stored_categories = sorted({item.namespace[2] for item in items if len(item.namespace) > 2})
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+async def run_matrix(builder, cases: list[EvalCase], context_factory, *, concurrency: int = 8, run_id: str = "matrix") -> dict:
+    """Run `cases` concurrently and summarize the outcomes.
+
+    `context_factory(user_id)` returns the Context for one case.
+    """
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.store.memory import InMemoryStore
+
+    store = InMemoryStore()
+    graph = builder.compile(store=store, checkpointer=MemorySaver())
+    slots = asyncio.Semaphore(concurrency)
+
+    async def bounded(case: EvalCase) -> CaseResult:
+        async with slots:
+            return await run_case(graph, store, case, run_id, context_factory)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bounded(c) for c in cases))
+    wall = time.perf_counter() - start
+    return summarize(results, wall)
+
+
+def summarize(results: list[CaseResult], wall_seconds: float) -> dict:
+    per_category = defaultdict(Counter)
+    for r in results:
+        if r.case.decision != "accept":
+            continue
+        bucket = per_category[r.case.expected_category]
+        bucket["total"] += 1
+        bucket["correct"] += r.correct
+    rejects = [r for r in results if r.case.decision == "reject"]
+    return {
+        "cases": len(results),
+        "wall_seconds": wall_seconds,
+        "case_seconds_sum": sum(r.seconds for r in results),
+        "accuracy": sum(r.correct for r in results) / len(results) if results else 0.0,
+        "per_category_accuracy": {
+            category: counts["correct"] / counts["total"] for category, counts in sorted(per_category.items())
+        },
+        "interrupts": sum(r.interrupts for r in results),
+        "cases_with_interrupt": sum(1 for r in results if r.interrupts),
+        "reject_respected": sum(r.correct for r in rejects) / len(rejects) if rejects else 1.0,
+        "errors": [f"{r.case.case_id}: {r.error}" for r in results if r.error][:10],
+        "failures": [
+            {"case": r.case.case_id, "expected": r.case.expected_category, "stored": r.stored_categories, "interrupts": r.interrupts}
+            for r in results
+            if not r.correct and not r.error
+        ][:20],
+    }
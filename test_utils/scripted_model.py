@@ -0,0 +1,233 @@
+"""
+Deterministic scripted chat model for running the memory graph offline.
+
+A `ScriptedChatModel` answers from a list of declarative `Scenario`s instead of
+calling a provider:
+
+- without tools bound (the category classifier) it answers with the category
+  of the first scenario whose pattern matches the prompt;
+- with tools bound it emits an `upsert_memory` tool call for the latest user
+  message when the matching scenario says to remember it, and otherwise (or
+  after the tool results come back) replies with the scenario's text.
+
+Latency and failures can be injected to exercise timeouts and error paths, and
+`remember_rate` thins out memory proposals for load tests. Latency jitter is
+drawn from the prompt and seed, and the remember draws from the seed and a
+per-model counter, so a repeated sequential run does the same work and the
+realised rate tracks `remember_rate` however few distinct prompts there are.
+Pass the model to the graph through `Context(chat_model=...)`; tests opt in
+with the SCRIPTED_MODEL=1 environment variable (see `scripted_context`). The
+benchmarks use the same model (see benchmarks/fake_model.py).
+
+Offline runs check plumbing (classification call, interrupt, resume, storage
+namespaces), not classification quality: `DEFAULT_SCENARIOS` is a stand-in
+keyword rule, so category accuracy measured against it says nothing about the
+agent under test.
+"""
+
+import asyncio
+import hashlib
+import os
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+
+@dataclass
+class Scenario:
+    """How the scripted model reacts to user messages matching `pattern`."""
+
+    pattern: str
+    """Regex searched (case-insensitively) in the latest user message or classifier prompt."""
+
+    category: str = "other"
+    """Category word returned to the classifier and used for stored memories."""
+
+    remember: bool = False
+    """Whether to propose storing the user message as a memory."""
+
+    reply: str = "Thanks for telling me!"
+    """Text of the final assistant reply."""
+
+
+class ScriptedModelError(RuntimeError):
+    """Raised by `ScriptedChatModel` when a failure is injected."""
+
+
+# A generic keyword rule built from the category definitions in the agent's
+# prompts (work, skills and achievements vs. preferences, hobbies and
+# relationships), deliberately not tuned to any eval set: offline accuracy on
+# the scenario matrix is whatever this rule scores, not 100% by construction.
+# Messages asking to be remembered always propose a memory, so the interrupt,
+# resume and storage paths are exercised whatever the category.
+DEFAULT_SCENARIOS = [
+    Scenario(
+        pattern=r"\b(work|working|job|career|office|colleagues?|boss|company|employer|skills?|promoted|salary)\b",
+        category="professional",
+        remember=True,
+        reply="Noted, that's great to hear about your work!",
+    ),
+    Scenario(
+        pattern=r"\b(hobby|hobbies|favou?rite|love|likes?|family|friends?|partner|pets?|interests?)\b",
+        category="personal",
+        remember=True,
+        reply="Noted, thanks for sharing that about yourself!",
+    ),
+    Scenario(pattern=r"\bremember\b", category="other", remember=True, reply="Noted!"),
+    Scenario(pattern=r".", category="personal", reply="Nice to meet you! How can I help?"),
+]
+
+
+def stable_fraction(*parts: Any) -> float:
+    """Map the parts to a stable pseudo-random number in [0, 1)."""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return int(digest, 16) / 2**64
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        return " ".join(seg.get("text", "") if isinstance(seg, dict) else str(seg) for seg in content)
+    return str(content)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that follows declarative scenarios, with optional latency and failures."""
+
+    scenarios: list[Scenario] = DEFAULT_SCENARIOS
+    """Scenarios tried in order; the first match wins."""
+
+    latency: float = 0.0
+    """Mean seconds to wait before every response."""
+
+    jitter: float = 0.0
+    """Maximum deviation from `latency`, drawn deterministically per prompt."""
+
+    remember_rate: float = 1.0
+    """Fraction of remembering turns that propose a memory, drawn in call order from `seed`."""
+
+    fail_first: int = 0
+    """Number of initial calls that raise `ScriptedModelError`."""
+
+    error_rate: float = 0.0
+    """Probability that any later call raises `ScriptedModelError`."""
+
+    seed: int = 0
+    """Seed for the injected-error, jitter and remember draws."""
+
+    _calls: int = PrivateAttr(default=0)
+    _remember_draws: int = PrivateAttr(default=0)
+    _rng: random.Random = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def calls(self) -> int:
+        """Number of calls made so far, including failed ones."""
+        return self._calls
+
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        return self.bind(tools=[getattr(t, "__name__", getattr(t, "name", str(t))) for t in tools], **kwargs)
+
+    def scenario_for(self, text: str) -> Optional[Scenario]:
+        """Return the first scenario whose pattern matches `text`."""
+        return next((s for s in self.scenarios if re.search(s.pattern, text, re.I)), None)
+
+    def _delay(self, messages: list[BaseMessage]) -> float:
+        key = _text(messages[-1])
+        return max(0.0, self.latency + (2 * stable_fraction(self.seed, "latency", key) - 1) * self.jitter)
+
+    def _draw_remember(self) -> bool:
+        if self.remember_rate >= 1:
+            return True
+        self._remember_draws += 1
+        return stable_fraction(self.seed, "remember", self._remember_draws) < self.remember_rate
+
+    def _maybe_fail(self) -> None:
+        self._calls += 1
+        if self._calls <= self.fail_first or self._rng.random() < self.error_rate:
+            raise ScriptedModelError(f"Injected failure on call {self._calls}")
+
+    def _respond(self, messages: list[BaseMessage], tools: Optional[list[str]]) -> AIMessage:
+        self._maybe_fail()
+        last = messages[-1]
+        text = _text(last)
+        usage = {"input_tokens": sum(len(_text(m)) for m in messages) // 4, "output_tokens": 8}
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+
+        if not tools:
+            # CATEGORY_PROMPT puts the recent messages on its first line; the
+            # rest is instructions that would match any pattern.
+            subject = next((line for line in text.splitlines() if line.strip()), "")
+            scenario = self.scenario_for(subject)
+            return AIMessage(content=scenario.category if scenario else "other", usage_metadata=usage)
+
+        # Tool results come back as the last message; keep answering the user.
+        human = next((m for m in reversed(messages) if m.type == "human"), last)
+        scenario = self.scenario_for(_text(human))
+        if scenario is None:
+            return AIMessage(content="Okay.", usage_metadata=usage)
+        if last is human and scenario.remember and "upsert_memory" in tools and self._draw_remember():
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "upsert_memory",
+                        "args": {
+                            "content": text,
+                            "context": "The user shared this in conversation.",
+                            "category": scenario.category,
+                        },
+                        "id": f"call_{self._calls}",
+                    }
+                ],
+                usage_metadata=usage,
+            )
+        return AIMessage(content=scenario.reply, usage_metadata=usage)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if delay := self._delay(messages):
+            time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs.get("tools")))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if delay := self._delay(messages):
+            await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs.get("tools")))])
+
+
+def scripted_enabled() -> bool:
+    """Whether tests should use the scripted model instead of the real one."""
+    return os.getenv("SCRIPTED_MODEL", "").lower() in ("1", "true", "yes")
+
+
+def scripted_context(**model_kwargs) -> dict:
+    """Return `Context` kwargs that swap in a scripted model when SCRIPTED_MODEL=1."""
+    if not scripted_enabled():
+        return {}
+    return {"chat_model": ScriptedChatModel(**model_kwargs)}
+
+
+def model_override(context_cls: type) -> dict:
+    """Return `Context` kwargs for the scripted or recorded model, if `context_cls` accepts one.
+
+    Agents whose `Context` has no `chat_model` field run their own model,
+    recorded by the cassette when LLM_CASSETTE is set.
+    """
+    from test_utils.cassette import accepts_chat_model, cassette_context
+
+    if accepts_chat_model(context_cls) and scripted_enabled():
+        return scripted_context()
+    return cassette_context(context_cls)
@@ -0,0 +1,220 @@
+"""
+Static AST checks for the judge requirements that can be decided mechanically.
+
+`analyze_package` inspects a candidate `memory_agent` package without importing
+it and settles:
+
+- presence_of_interrupt: an `interrupt(...)` call exists (preferably in tools.py)
+- user_id_and_category_wise_storage: some `put`/`aput` namespace has a user id
+  element and a category element
+- category_retrieval: some `search`/`asearch` namespace has a category element
+- llm_based_categorization: the category function invokes a model, directly or
+  through helpers defined in the package
+- no_test_files: the package has no test, demo or example files
+
+Each result is {"passed": bool | None, "evidence": str}. "passed" is None when
+the check cannot tell, e.g. a namespace element is a variable with an unfamiliar
+name or no category function exists; the LLM judge decides those fields along
+with the ones that need judgement.
+"""
+
+import ast
+import fnmatch
+from pathlib import Path
+from typing import Optional
+
+STATIC_FIELDS = (
+    "presence_of_interrupt",
+    "user_id_and_category_wise_storage",
+    "category_retrieval",
+    "llm_based_categorization",
+    "no_test_files",
+)
+TEST_FILE_PATTERNS = ("test_*.py", "*_test.py", "tests.py", "conftest.py", "*demo*.py", "example*.py")
+MODEL_CALLS = {"invoke", "ainvoke", "batch", "abatch", "stream", "astream", "with_structured_output"}
+CATEGORIZER_NAMES = ("categor", "classif")
+
+
+def _name(node: ast.AST) -> str:
+    """Dotted source text for names/attributes, lowercased; '' for anything else.
+
+    Constant subscript keys and ``.get("key")`` lookups become path elements, so
+    ``config["configurable"]["user_id"]`` reads as ``config.configurable.user_id``.
+    """
+    if isinstance(node, ast.Name):
+        return node.id.lower()
+    if isinstance(node, ast.Attribute):
+        return f"{_name(node.value)}.{node.attr.lower()}"
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value.lower()
+    if isinstance(node, ast.Subscript):
+        if isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str):
+            return f"{_name(node.value)}.{node.slice.value.lower()}"
+        return _name(node.value)
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "get"
+        and node.args
+        and isinstance(node.args[0], ast.Constant)
+        and isinstance(node.args[0].value, str)
+    ):
+        return f"{_name(node.func.value)}.{node.args[0].value.lower()}"
+    return ""
+
+
+def _call_name(call: ast.Call) -> str:
+    func = call.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return ""
+
+
+def _assignments(func: ast.AST) -> dict[str, ast.AST]:
+    """Last value assigned to each plain name in a function (or module)."""
+    values = {}
+    for node in ast.walk(func):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    values[target.id] = node.value
+    return values
+
+
+def _namespace_elements(call: ast.Call, scope: ast.AST) -> Optional[list[ast.AST]]:
+    """Elements of the namespace passed to a store call, resolving one local variable; None if unresolved."""
+    arg = call.args[0] if call.args else next((k.value for k in call.keywords if k.arg == "namespace"), None)
+    if isinstance(arg, ast.Name):
+        arg = _assignments(scope).get(arg.id, arg)
+    if isinstance(arg, (ast.Tuple, ast.List)):
+        return list(arg.elts)
+    return None
+
+
+def _is_store_call(call: ast.Call, elements: Optional[list[ast.AST]]) -> bool:
+    """Whether a put/search call looks like a store call rather than e.g. a queue put."""
+    if isinstance(call.func, ast.Attribute) and "store" in _name(call.func.value):
+        return True
+    return bool(elements) and isinstance(elements[0], ast.Constant) and isinstance(elements[0].value, str)
+
+
+def _scopes(tree: ast.Module):
+    """Yield (scope, calls inside it) for every function, then the whole module."""
+    functions = [n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    for node in [*functions, tree]:
+        yield node, [n for n in ast.walk(node) if isinstance(n, ast.Call)]
+
+
+def _check_storage(trees: dict[str, ast.Module], methods: set[str], need_user: bool) -> tuple[Optional[bool], str]:
+    seen = []
+    unresolved = []
+    for filename, tree in trees.items():
+        for scope, calls in _scopes(tree):
+            for call in calls:
+                if _call_name(call) not in methods:
+                    continue
+                elements = _namespace_elements(call, scope)
+                if not _is_store_call(call, elements):
+                    continue
+                if not elements:
+                    unresolved.append(f"{filename}:{call.lineno} {_call_name(call)}(?)")
+                    continue
+                names = [_name(e) for e in elements]
+                has_user = any("user" in n for n in names)
+                has_category = any("categor" in n for n in names)
+                where = f"{filename}:{call.lineno} {_call_name(call)}({tuple(names)})"
+                if has_category and (has_user or not need_user):
+                    return True, where
+                # A variable element with an unfamiliar name (say `memory_type`) may still be the category.
+                if any(
+                    not (isinstance(e, ast.Constant) or "user" in n or "categor" in n) for e, n in zip(elements, names)
+                ):
+                    unresolved.append(where)
+                else:
+                    seen.append(where)
+    if unresolved:
+        return None, "left to the judge; could not resolve: " + "; ".join(unresolved[:5])
+    return False, "no namespace with a category element; saw: " + ("; ".join(seen[:5]) or "no store calls")
+
+
+def _check_categorization(trees: dict[str, ast.Module]) -> tuple[Optional[bool], str]:
+    functions = {
+        node.name: (filename, node)
+        for filename, tree in trees.items()
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+    categorizers = [name for name in functions if any(part in name.lower() for part in CATEGORIZER_NAMES)]
+    if not categorizers:
+        return None, "left to the judge; no category or classification function found"
+
+    def model_calls(chain: list[str]) -> list[str]:
+        filename, node = functions[chain[-1]]
+        found = []
+        for call in ast.walk(node):
+            if not isinstance(call, ast.Call):
+                continue
+            name = _call_name(call)
+            if name in MODEL_CALLS:
+                found.append(f"{filename}:{call.lineno} {' -> '.join(chain)} -> .{name}()")
+            elif name in functions and name not in chain:
+                found.extend(model_calls([*chain, name]))
+        return found
+
+    found = [evidence for name in categorizers for evidence in model_calls([name])]
+    if found:
+        return True, "; ".join(dict.fromkeys(found))
+    return False, f"no model call in {categorizers}"
+
+
+def analyze_package(package_dir: Path) -> dict[str, dict]:
+    """Run every static check over the Python files of `package_dir`."""
+    package_dir = Path(package_dir)
+    files = sorted(p for p in package_dir.rglob("*.py") if "__pycache__" not in p.parts)
+    trees = {}
+    unparsed = []
+    results = {}
+    for path in files:
+        try:
+            trees[str(path.relative_to(package_dir))] = ast.parse(path.read_text(encoding="utf-8"))
+        except (SyntaxError, UnicodeDecodeError):
+            unparsed.append(str(path.relative_to(package_dir)))
+
+    # interrupt(...) anywhere; report tools.py first since that's where it belongs.
+    interrupts = [
+        f"{filename}:{node.lineno}"
+        for filename, tree in sorted(trees.items(), key=lambda kv: kv[0] != "tools.py")
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and _call_name(node) == "interrupt"
+    ]
+    results["presence_of_interrupt"] = {
+        "passed": bool(interrupts),
+        "evidence": f"interrupt() called at {', '.join(interrupts)}" if interrupts else "no interrupt() call found",
+    }
+
+    passed, evidence = _check_storage(trees, {"put", "aput"}, need_user=True)
+    results["user_id_and_category_wise_storage"] = {"passed": passed, "evidence": evidence}
+
+    passed, evidence = _check_storage(trees, {"search", "asearch"}, need_user=False)
+    results["category_retrieval"] = {"passed": passed, "evidence": evidence}
+
+    passed, evidence = _check_categorization(trees)
+    results["llm_based_categorization"] = {"passed": passed, "evidence": evidence}
+
+    test_files = [
+        str(p.relative_to(package_dir))
+        for p in files
+        if any(fnmatch.fnmatch(p.name.lower(), pattern) for pattern in TEST_FILE_PATTERNS)
+    ]
+    results["no_test_files"] = {
+        "passed": not test_files,
+        "evidence": f"test/demo files: {test_files}" if test_files else "no test or demo files",
+    }
+
+    if unparsed:
+        for result in results.values():
+            if not result["passed"]:
+                result["evidence"] += f" (could not parse: {', '.join(unparsed)})"
+    return results
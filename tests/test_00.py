@@ -10,12 +10,14 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 import subprocess
 from test_utils.test_state import INITIAL_STATE
 from test_utils.git_branch import get_git_branch
+from test_utils.scripted_model import model_override
 
 
 
 DEFAULT_AGENT_FILENAME = os.getenv("DEFAULT_AGENT_FILENAME", "main.py")
 DEFAULT_AGENT_PATH = pathlib.Path.cwd() / f"../{DEFAULT_AGENT_FILENAME}"
-CANDIDATE_NAME = get_git_branch()
+# The runner names each repeat, e.g. "claude-mcp-2".
+CANDIDATE_NAME = os.getenv("CANDIDATE_NAME") or get_git_branch()
 
 
 def _load_module(agent_py_path: pathlib.Path):
@@ -105,7 +107,7 @@ async def test_smoke(monkeypatch):
         # Set up store and checkpointer like in the example
         mem_store = InMemoryStore()
         checkpointer = MemorySaver()
-        context = Context(user_id="test_user")
+        context = Context(user_id="test_user", **model_override(Context))
         
         # Compile the graph with store and checkpointer like in the example
         graph_with_store = builder.compile(store=mem_store, checkpointer=checkpointer)
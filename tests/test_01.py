@@ -11,11 +11,13 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.store.memory import InMemoryStore
 from langgraph.types import Command
 from test_utils.git_branch import get_git_branch
+from test_utils.scripted_model import model_override
 
 
 DEFAULT_AGENT_FILENAME = os.getenv("DEFAULT_AGENT_FILENAME", "main.py")
 DEFAULT_AGENT_PATH = pathlib.Path.cwd() / f"../{DEFAULT_AGENT_FILENAME}"
-CANDIDATE_NAME = get_git_branch()
+# The runner names each repeat, e.g. "claude-mcp-2".
+CANDIDATE_NAME = os.getenv("CANDIDATE_NAME") or get_git_branch()
 
 def _load_module(agent_py_path: pathlib.Path):
     """Import agent.py as a temporary module; success == compiles/imports."""
@@ -78,6 +80,9 @@ async def test_memory_storage_with_correct_user_and_category():
         mem_store = InMemoryStore()
         checkpointer = MemorySaver()
         graph = builder.compile(store=mem_store, checkpointer=checkpointer)
+        # SCRIPTED_MODEL=1 runs these scenarios offline against a scripted model;
+        # LLM_CASSETTE=record-new replays recorded calls to the real one.
+        overrides = model_override(Context)
 
         # Test 1: Memory storage when accepted (Professional category)
         user_input_accept_1 = "I work as a data scientist at Google and love my job. Remember this."
@@ -88,7 +93,7 @@ async def test_memory_storage_with_correct_user_and_category():
         res = await graph.ainvoke(
             {"messages": [("user", user_input_accept_1)]},
             config_accept_1,
-            context=Context(user_id=user_id_accept_1),
+            context=Context(user_id=user_id_accept_1, **overrides),
         )
         
         if "__interrupt__" not in res:
@@ -101,7 +106,7 @@ async def test_memory_storage_with_correct_user_and_category():
                 res = await graph.ainvoke(
                     Command(resume="accept"),
                     config_accept_1,
-                    context=Context(user_id=user_id_accept_1),
+                    context=Context(user_id=user_id_accept_1, **overrides),
                 )
             
             os.makedirs("txt_dump", exist_ok=True)
@@ -137,7 +142,7 @@ async def test_memory_storage_with_correct_user_and_category():
         res = await graph.ainvoke(
             {"messages": [("user", user_input_accept_2)]},
             config_accept_2,
-            context=Context(user_id=user_id_accept_2),
+            context=Context(user_id=user_id_accept_2, **overrides),
         )
         
         if "__interrupt__" not in res:
@@ -150,7 +155,7 @@ async def test_memory_storage_with_correct_user_and_category():
                 res = await graph.ainvoke(
                     Command(resume="accept"),
                     config_accept_2,
-                    context=Context(user_id=user_id_accept_2),
+                    context=Context(user_id=user_id_accept_2, **overrides),
                 )
             
             with open("txt_dump/accept_personal_post_interrupt.txt", "w") as f:
@@ -184,7 +189,7 @@ async def test_memory_storage_with_correct_user_and_category():
         res = await graph.ainvoke(
             {"messages": [("user", user_input_reject)]},
             config_reject,
-            context=Context(user_id=user_id_reject),
+            context=Context(user_id=user_id_reject, **overrides),
         )
         
         if "__interrupt__" not in res:
@@ -197,7 +202,7 @@ async def test_memory_storage_with_correct_user_and_category():
                 res = await graph.ainvoke(
                     Command(resume="reject"),
                     config_reject,
-                    context=Context(user_id=user_id_reject),
+                    context=Context(user_id=user_id_reject, **overrides),
                 )
             
             with open("txt_dump/reject_test_post_interrupt.txt", "w") as f:
@@ -3,13 +3,25 @@ from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import SystemMessage, HumanMessage
 from pydantic import BaseModel
 from typing import cast, List, Literal
-from test_utils.prompt import LLM_AS_A_JUDGE_PROMPT, USER_TASK, EXPERT_CODE, BASE_CODE
+from test_utils.prompt import USER_TASK, EXPERT_CODE, BASE_CODE, SUBJECTIVE_JUDGE_INSTRUCTIONS, JUDGE_INSTRUCTIONS
+from test_utils.static_checks import analyze_package
+from test_utils.judge_prompt import build_diff_prompt, build_full_prompt
 from test_utils.format_code import folder_to_prompt_string
+from test_utils.cassette import wrap
+from test_utils.rate_limit import shared_rate_limiter
+from test_utils.judge_cache import JudgeCache, code_fingerprint, judge_key
 from test_utils.git_branch import get_git_branch
 
-CANDIDATE_NAME = get_git_branch()
+# The runner names each repeat, e.g. "claude-mcp-2".
+CANDIDATE_NAME = os.getenv("CANDIDATE_NAME") or get_git_branch()
 LLM_AS_JUDGE_MODEL = "claude-sonnet-4-20250514"
+JUDGE_MODEL_NAME = f"anthropic:{LLM_AS_JUDGE_MODEL}"
 CODE_FOLDER = [pathlib.Path("../src/memory_agent")]
+# "full" embeds expert, base and candidate code; "diff" sends base code plus diffs.
+JUDGE_PROMPT_MODE = os.getenv("JUDGE_PROMPT_MODE", "full")
+JUDGE_TOKEN_BUDGET = int(os.getenv("JUDGE_TOKEN_BUDGET", "60000"))
+# Settle the mechanical requirements with AST checks and ask the judge only for the rest.
+JUDGE_STATIC_CHECKS = os.getenv("JUDGE_STATIC_CHECKS", "").lower() in ("1", "true", "yes")
 
 HUMAN_NOTES = """
 1. Local/Deployed testing:
@@ -43,6 +55,47 @@ class LlmAsJudgeOutput(BaseModel):
     code_correctness_check: bool
     code_correctness_evidence: List[LlmAsJudgeEvidence]
 
+class SubjectiveJudgeOutput(BaseModel):
+    correct_categories: bool
+    functional_interrupt: bool
+    code_quality_check: bool
+    code_quality_evidence: List[LlmAsJudgeEvidence]
+    code_correctness_check: bool
+    code_correctness_evidence: List[LlmAsJudgeEvidence]
+
+def _merge_static(judge, static: dict) -> LlmAsJudgeOutput:
+    """Combine AST check results with the judge's answers into the full judge output.
+
+    `judge` is a SubjectiveJudgeOutput when every static check was decided, or a full
+    LlmAsJudgeOutput whose answers are kept for the checks that returned passed=None.
+    """
+    if isinstance(judge, SubjectiveJudgeOutput):
+        # Placeholders; every static field is decided and overwritten below.
+        judge = LlmAsJudgeOutput(
+            basic_requirements=BasicRequirements(
+                presence_of_interrupt=False,
+                user_id_and_category_wise_storage=False,
+                correct_categories=judge.correct_categories,
+                category_retrieval=False,
+            ),
+            good_practices=GoodPractices(
+                functional_interrupt=judge.functional_interrupt,
+                llm_based_categorization=False,
+                no_test_files=False,
+            ),
+            code_quality_check=judge.code_quality_check,
+            code_quality_evidence=judge.code_quality_evidence,
+            code_correctness_check=judge.code_correctness_check,
+            code_correctness_evidence=judge.code_correctness_evidence,
+        )
+    merged = judge.model_copy(deep=True)
+    for field, result in static.items():
+        if result["passed"] is None:
+            continue
+        section = merged.basic_requirements if field in BasicRequirements.model_fields else merged.good_practices
+        setattr(section, field, result["passed"])
+    return merged
+
 def _write_score(score):
     out = pathlib.Path("results"); out.mkdir(parents=True, exist_ok=True)
     with open(out / f"code_quality_{score['candidate']}.json", "w") as f:
@@ -52,14 +105,14 @@ def _add(score, awarded_pts, key, ok, msg=""):
     score["details"].append({"key": key, "points": awarded_pts, "passed": ok, "msg": msg})
     score["points"] += awarded_pts
 
-def _load_judge():
+def _load_judge(schema=LlmAsJudgeOutput):
     """
     Returns a (invoke, model_name) tuple.
     """
-    llm = ChatAnthropic(model=LLM_AS_JUDGE_MODEL, temperature=0)
-    structured_llm = llm.with_structured_output(LlmAsJudgeOutput)
+    llm = wrap(ChatAnthropic(model=LLM_AS_JUDGE_MODEL, temperature=0, rate_limiter=shared_rate_limiter()))
+    structured_llm = llm.with_structured_output(schema)
 
-    return (lambda msgs: structured_llm.invoke(msgs)), f"anthropic:{LLM_AS_JUDGE_MODEL}"
+    return (lambda msgs: structured_llm.invoke(msgs)), JUDGE_MODEL_NAME
 
 def _calculate_score(evidence_list: List[LlmAsJudgeEvidence], max_points: int) -> float:
     """Calculates a score based on a list of evidence items and their severity."""
@@ -85,16 +138,50 @@ def test_best_practices_llm_judge():
         f.write(user_code)
 
     # Prompt the judge with task-specific guidelines
-    system = LLM_AS_A_JUDGE_PROMPT.format(user_task=USER_TASK, expert_code=EXPERT_CODE, user_code=user_code, human_notes=HUMAN_NOTES, base_code=BASE_CODE)
+    static = None
+    schema = LlmAsJudgeOutput
+    if JUDGE_STATIC_CHECKS:
+        static = analyze_package(CODE_FOLDER[0])
+        score["static_checks"] = static
+        # Checks the AST could not settle (passed=None) fall back to the full judge.
+        if all(r["passed"] is not None for r in static.values()):
+            schema = SubjectiveJudgeOutput
+
+    prompt_args = dict(
+        user_task=USER_TASK, expert_code=EXPERT_CODE, user_code=user_code, human_notes=HUMAN_NOTES, base_code=BASE_CODE,
+        instructions=SUBJECTIVE_JUDGE_INSTRUCTIONS if schema is SubjectiveJudgeOutput else JUDGE_INSTRUCTIONS,
+    )
+    if JUDGE_PROMPT_MODE == "diff":
+        system, prompt_stats = build_diff_prompt(**prompt_args, token_budget=JUDGE_TOKEN_BUDGET)
+    else:
+        system, prompt_stats = build_full_prompt(**prompt_args)
+    score["judge_prompt"] = prompt_stats
     user = {
         "role": "user",
         "content": "Return the JSON object evaluating the codebase."
     }
 
+    # Identical prompts (same candidate code) reuse the stored judge result.
+    cache = JudgeCache()
+    key = judge_key(system + user["content"], JUDGE_MODEL_NAME)
+    fingerprint = code_fingerprint(user_code)
     try:
-        invoke, model_name = _load_judge()
-        resp = invoke([SystemMessage(content=system), HumanMessage(content=user["content"])])
-        judge = cast(LlmAsJudgeOutput, resp)
+        cached = cache.get(key, CANDIDATE_NAME)
+        if cached is not None:
+            judge = schema.model_validate(cached["output"])
+        else:
+            invoke, model_name = _load_judge(schema)
+            resp = invoke([SystemMessage(content=system), HumanMessage(content=user["content"])])
+            judge = cast(schema, resp)
+            cache.put(key, judge.model_dump(), model=model_name, fingerprint=fingerprint, candidate=CANDIDATE_NAME)
+        if static is not None:
+            judge = _merge_static(judge, static)
+        score["judge_cache"] = {
+            "hit": cached is not None,
+            "key": key,
+            "code_fingerprint": fingerprint,
+            "shared_with": [c for c in (cached or {}).get("candidates", []) if c != CANDIDATE_NAME],
+        }
     except Exception as e:
         _add(score, 0, "judge_error", False, f"Judge error: {type(e).__name__}: {e}")
         _write_score(score)
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import pathlib
+import pytest
+from test_utils.git_branch import get_git_branch
+from test_utils.scenario_matrix import build_matrix, run_matrix
+from test_utils.scripted_model import model_override
+
+
+DEFAULT_AGENT_FILENAME = os.getenv("DEFAULT_AGENT_FILENAME", "main.py")
+# The runner names each repeat, e.g. "claude-mcp-2".
+CANDIDATE_NAME = os.getenv("CANDIDATE_NAME") or get_git_branch()
+SCENARIO_CONCURRENCY = int(os.getenv("SCENARIO_CONCURRENCY", "8"))
+# Unscored until existing candidates have results for this bucket; opt in with SCENARIO_MATRIX=1.
+SCENARIO_MATRIX = os.getenv("SCENARIO_MATRIX", "").lower() in ("1", "true", "yes")
+
+
+def _write_score(score):
+    out_dir = pathlib.Path("results")
+    out_dir.mkdir(exist_ok=True, parents=True)
+    with open(out_dir / f"scenarios_{score['candidate']}.json", "w") as f:
+        json.dump(score, f, indent=2)
+
+
+def _add(score, pts, key, ok, msg=""):
+    score["details"].append({"key": key, "points": pts, "passed": bool(ok), "msg": msg})
+    score["points"] += pts
+
+
+@pytest.mark.skipif(not SCENARIO_MATRIX, reason="set SCENARIO_MATRIX=1 to run the scenario matrix")
+@pytest.mark.asyncio
+async def test_scenario_matrix():
+    """Run the category/decision matrix concurrently and score accuracy, interrupts and rejections."""
+    score = {"candidate": CANDIDATE_NAME, "bucket": "scenario_matrix", "points": 0, "max_points": 10, "details": []}
+
+    if "expert_src" in str(DEFAULT_AGENT_FILENAME):
+        src_path = os.path.join(os.path.dirname(__file__), "..", "expert_src")
+    else:
+        src_path = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+    if src_path not in sys.path:
+        sys.path.insert(0, src_path)
+
+    from memory_agent.context import Context
+    from memory_agent.graph import builder
+
+    overrides = model_override(Context)
+    cases = build_matrix()
+    summary = await run_matrix(
+        builder,
+        cases,
+        lambda user_id: Context(user_id=user_id, **overrides),
+        concurrency=SCENARIO_CONCURRENCY,
+        run_id=f"{CANDIDATE_NAME}-matrix",
+    )
+    score["summary"] = summary
+
+    # Classification accuracy on accepted memories (6 pts, proportional)
+    per_category = summary["per_category_accuracy"]
+    accuracy = sum(per_category.values()) / len(per_category) if per_category else 0.0
+    _add(score, round(6 * accuracy, 2), "category_accuracy", accuracy >= 0.8, json.dumps(per_category))
+
+    # Every case should pause for approval (2 pts, proportional)
+    interrupt_rate = summary["cases_with_interrupt"] / summary["cases"]
+    _add(score, round(2 * interrupt_rate, 2), "interrupt_rate", interrupt_rate == 1.0, f"{summary['cases_with_interrupt']}/{summary['cases']} cases interrupted")
+
+    # Rejected memories must not be stored (2 pts, proportional)
+    _add(score, round(2 * summary["reject_respected"], 2), "reject_respected", summary["reject_respected"] == 1.0, f"{summary['reject_respected']:.0%} of rejections respected")
+
+    _write_score(score)
+    if summary["errors"]:
+        pytest.fail(" | ".join(summary["errors"]))
@@ -0,0 +1 @@
+# This file makes tests.unit a Python package
@@ -0,0 +1,35 @@
+"""
+Fixtures for the unit tests of expert_src and test_utils.
+
+The scored tests in tests/ import `memory_agent` from the candidate's source
+tree, so these tests import expert_src's `memory_agent` only while a test
+module runs. They put back whatever `memory_agent` was loaded before.
+"""
+
+import importlib
+import pathlib
+import sys
+
+import pytest
+
+EXPERT_SRC = str(pathlib.Path(__file__).resolve().parents[2] / "expert_src")
+
+
+def _agent_modules() -> dict:
+    return {name: mod for name, mod in sys.modules.items() if name == "memory_agent" or name.startswith("memory_agent.")}
+
+
+@pytest.fixture(scope="module")
+def expert_src():
+    """Return `load(name)`, which imports `memory_agent.<name>` from expert_src."""
+    saved = _agent_modules()
+    for name in saved:
+        del sys.modules[name]
+    sys.path.insert(0, EXPERT_SRC)
+    try:
+        yield lambda name: importlib.import_module(f"memory_agent.{name}")
+    finally:
+        sys.path.remove(EXPERT_SRC)
+        for name in _agent_modules():
+            del sys.modules[name]
+        sys.modules.update(saved)
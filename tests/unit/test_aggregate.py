@@ -0,0 +1,131 @@
+import json
+import os
+import pathlib
+
+import pytest
+
+from test_utils import aggregate
+
+
+def _score(points, max_points=10, details=None):
+    return {"points": points, "max_points": max_points, "details": details or [{"key": "check", "points": points}]}
+
+
+def _write(results: pathlib.Path, name: str, score) -> pathlib.Path:
+    path = results / f"{name}.json"
+    path.write_text(json.dumps(score))
+    return path
+
+
+def test_split_name_and_repeat():
+    assert aggregate.split_name("code_quality_claude-mcp-2") == ("code_quality", "claude-mcp-2")
+    assert aggregate.split_name("custom_run") == ("custom", "run")
+    assert aggregate.split_repeat("claude-mcp-2") == ("claude-mcp", 2)
+    assert aggregate.split_repeat("main") == ("main", None)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"not json",
+        b"[]",
+        json.dumps({"points": 1}).encode(),
+        json.dumps({"points": 1, "details": [{"points": 1}]}).encode(),
+        json.dumps({"points": 1, "details": ["check"]}).encode(),
+        json.dumps({"points": 1, "details": None}).encode(),
+    ],
+)
+def test_parse_result_rejects_malformed_files(data):
+    assert aggregate.parse_result(pathlib.Path("smoke_main.json"), data) is None
+
+
+def test_parse_result_sums_points_per_check():
+    score = _score(3, details=[{"key": "a", "points": 1}, {"key": "a", "points": 2}, {"key": "b", "points": None}])
+    result = aggregate.parse_result(pathlib.Path("smoke_cand-2.json"), json.dumps(score).encode())
+
+    assert result["run"] == "cand-2"
+    assert result["checks"] == {"a": 3, "b": 0}
+
+
+def test_repeat_suffix_is_only_stripped_for_runner_or_sibling_runs(tmp_path):
+    aggregate.record_runs(tmp_path, [("claude-3-2", "claude-3", 2)])
+    aggregate.record_runs(tmp_path, [("claude-3-1", "claude-3", 1)])
+    runs = ["gpt-4", "gpt-3", "solo-1", "claude-mcp-1", "claude-mcp-2", "claude-3-1", "claude-3-2", "main"]
+
+    resolved = aggregate.resolve_candidates(runs, aggregate.load_runs(tmp_path))
+
+    assert resolved == {
+        "gpt-4": ("gpt-4", None),
+        "gpt-3": ("gpt-3", None),
+        "solo-1": ("solo-1", None),
+        "claude-mcp-1": ("claude-mcp", 1),
+        "claude-mcp-2": ("claude-mcp", 2),
+        "claude-3-1": ("claude-3", 1),
+        "claude-3-2": ("claude-3", 2),
+        "main": ("main", None),
+    }
+
+
+def test_missing_check_counts_as_zero(tmp_path):
+    _write(tmp_path, "smoke_cand-1", _score(4, details=[{"key": "a", "points": 2}, {"key": "b", "points": 2}]))
+    _write(tmp_path, "smoke_cand-2", _score(2, details=[{"key": "a", "points": 2}]))
+    index, _ = aggregate.update_index(tmp_path)
+
+    rows = {row["key"]: row for row in aggregate.summarize(index)}
+
+    assert (rows["b"]["n"], rows["b"]["mean"], rows["b"]["min"]) == (2, 1.0, 0)
+    assert rows[aggregate.TOTAL_KEY]["mean"] == 3
+
+
+def test_index_only_reparses_changed_files(tmp_path):
+    first = _write(tmp_path, "smoke_cand-1", _score(5))
+    _write(tmp_path, "smoke_cand-2", _score(7))
+    _, changes = aggregate.update_index(tmp_path)
+    assert changes == {"parsed": 2, "touched": 0, "unchanged": 0, "removed": 0}
+
+    os.utime(first, (1, 1))
+    _write(tmp_path, "smoke_cand-2", _score(8))
+    _write(tmp_path, "smoke_cand-3", _score(9))
+    (tmp_path / "smoke_cand-1.json").rename(tmp_path / "smoke_cand-4.json")
+    index, changes = aggregate.update_index(tmp_path)
+
+    assert changes == {"parsed": 3, "touched": 0, "unchanged": 0, "removed": 1}
+    assert sorted(index) == ["smoke_cand-2.json", "smoke_cand-3.json", "smoke_cand-4.json"]
+
+    os.utime(tmp_path / "smoke_cand-3.json", (1, 1))
+    _, changes = aggregate.update_index(tmp_path)
+    assert changes == {"parsed": 0, "touched": 1, "unchanged": 2, "removed": 0}
+
+
+def test_leaderboard_ranks_by_share_of_available_points(tmp_path):
+    for i, points in enumerate((18, 20), start=1):
+        _write(tmp_path, f"memory_full-{i}", _score(points, max_points=20))
+    _write(tmp_path, "smoke_full-1", _score(2))
+    _write(tmp_path, "smoke_partial-1", _score(9))
+    aggregate.record_runs(tmp_path, [("partial-1", "partial", 1)])
+    index, _ = aggregate.update_index(tmp_path)
+
+    board = aggregate.leaderboard(aggregate.summarize(index, aggregate.load_runs(tmp_path)))
+
+    assert [e["candidate"] for e in board] == ["partial", "full"]
+    partial, full = board
+    assert partial["ratio"] == pytest.approx(0.9) and partial["missing"] == ["memory"]
+    assert full["ratio"] == pytest.approx(21 / 30) and full["missing"] == []
+    assert full["buckets"] == {"memory": {"mean": 19, "n": 2}, "smoke": {"mean": 2, "n": 1}}
+
+
+def test_write_outputs_marks_missing_buckets(tmp_path):
+    _write(tmp_path, "memory_full-1", _score(10))
+    _write(tmp_path, "smoke_full-1", _score(5))
+    _write(tmp_path, "smoke_partial-1", _score(9))
+    aggregate.record_runs(tmp_path, [("full-1", "full", 1), ("partial-1", "partial", 1)])
+    index, _ = aggregate.update_index(tmp_path)
+    rows = aggregate.summarize(index, aggregate.load_runs(tmp_path))
+
+    aggregate.write_outputs(tmp_path, rows, aggregate.leaderboard(rows))
+
+    lines = (tmp_path / "leaderboard.md").read_text().splitlines()
+    assert lines[0] == "| rank | candidate | score | points | memory | smoke |"
+    assert lines[2] == "| 1 | partial | 90.0% | 9.00/10 | missing | 9.00 (n=1) |"
+    assert lines[3] == "| 2 | full | 75.0% | 15.00/20 | 10.00 (n=1) | 5.00 (n=1) |"
+    assert (tmp_path / "summary.csv").read_text().startswith("candidate,bucket,key,n,mean")
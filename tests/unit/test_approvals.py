@@ -0,0 +1,72 @@
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.store.memory import InMemoryStore
+
+from test_utils.scripted_model import ScriptedChatModel
+
+STATEMENT = "I work as a data scientist at Google. Remember this."
+
+
+@pytest.fixture(scope="module")
+def agent(expert_src):
+    class Agent:
+        approvals = expert_src("approvals")
+        Context = expert_src("context").Context
+        builder = expert_src("graph").builder
+
+    return Agent
+
+
+async def _pause(agent, graph, model, thread_id, user_id):
+    configurable = {"thread_id": thread_id}
+    if user_id is not None:
+        configurable["user_id"] = user_id
+    out = await graph.ainvoke(
+        {"messages": [("user", STATEMENT)]},
+        {"configurable": configurable},
+        context=agent.Context(user_id=user_id or "ignored", chat_model=model),
+    )
+    assert "__interrupt__" in out
+
+
+@pytest.mark.asyncio
+async def test_list_and_resolve_pending_approvals(agent):
+    model = ScriptedChatModel()
+    store = InMemoryStore()
+    graph = agent.builder.compile(checkpointer=MemorySaver(), store=store)
+    await _pause(agent, graph, model, "t1", "alice")
+    await _pause(agent, graph, model, "t2", "bob")
+
+    pending = [p async for p in agent.approvals.list_pending(graph)]
+    assert sorted((p.thread_id, p.user_id) for p in pending) == [("t1", "alice"), ("t2", "bob")]
+    assert [p.thread_id async for p in agent.approvals.list_pending(graph, user_ids=["bob"])] == ["t2"]
+
+    results = await agent.approvals.resolve_all(
+        graph,
+        "accept",
+        user_ids=["alice"],
+        context_factory=lambda user_id: agent.Context(user_id=user_id, chat_model=model),
+    )
+
+    assert [(r.thread_id, r.ok, r.still_pending) for r in results] == [("t1", True, 0)]
+    assert await store.asearch(("memories", "alice", "professional"))
+    assert not await store.asearch(("memories", "bob"))
+    assert [p.thread_id async for p in agent.approvals.list_pending(graph)] == ["t2"]
+
+
+@pytest.mark.asyncio
+async def test_threads_without_user_are_skipped(agent):
+    model = ScriptedChatModel()
+    store = InMemoryStore()
+    graph = agent.builder.compile(checkpointer=MemorySaver(), store=store)
+    await _pause(agent, graph, model, "anonymous", None)
+
+    results = await agent.approvals.resolve_all(graph, "accept")
+
+    assert [(r.thread_id, r.ok, r.skipped) for r in results] == [("anonymous", False, True)]
+    assert not await store.asearch(("memories",))
+
+
+def test_resolve_requires_store(agent):
+    with pytest.raises(SystemExit):
+        agent.approvals.main(["resolve", "--checkpoints", "c.sqlite", "--decision", "accept"])
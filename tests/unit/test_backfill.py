@@ -0,0 +1,115 @@
+import json
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.store.memory import InMemoryStore
+
+
+class ExtractionModel:
+    """Proposes one memory per transcript, echoing the last user message."""
+
+    def __init__(self, fail_on: str = "", failures: int = 1_000):
+        self.fail_on = fail_on
+        self.failures = failures
+        self.prompts = []
+
+    async def abatch(self, prompts, config=None, return_exceptions=False):
+        self.prompts.extend(prompts)
+        responses = []
+        for prompt in prompts:
+            text = prompt[-1]["content"]
+            if self.fail_on and self.fail_on in text and self.failures > 0:
+                self.failures -= 1
+                responses.append(RuntimeError("model unavailable"))
+                continue
+            category = "professional" if "work" in text else "made-up"
+            args = {"content": text, "context": "backfill", "category": category}
+            responses.append(AIMessage("", tool_calls=[{"name": "upsert_memory", "args": args, "id": "1"}]))
+        return responses
+
+
+def _transcripts(*texts):
+    return [
+        json.dumps({"user_id": "u", "thread_id": f"t{i}", "messages": [{"role": "user", "content": text}]})
+        for i, text in enumerate(texts)
+    ]
+
+
+@pytest.fixture(scope="module")
+def backfill(expert_src):
+    expert_src("graph")
+    return expert_src("backfill")
+
+
+@pytest.mark.asyncio
+async def test_backfill_writes_accepted_memories_and_counts_failures(backfill):
+    store = InMemoryStore()
+    commits = []
+    failures = []
+    lines = _transcripts("I work at a bakery", "I like tea", "boom", "I dislike rain")
+
+    stats = await backfill.backfill(
+        store,
+        lines,
+        model=ExtractionModel(fail_on="boom"),
+        approve=lambda user_id, args: "rain" not in args["content"],
+        chunk_size=2,
+        retries=1,
+        retry_delay=0,
+        on_failure=lambda lineno, transcript, error: failures.append((lineno, transcript["thread_id"], commits[:])),
+        on_commit=commits.append,
+    )
+
+    assert (stats.transcripts, stats.failed, stats.proposed, stats.accepted, stats.rejected) == (4, 1, 3, 2, 1)
+    assert commits == [2, 4]
+    # Failures are handed over before the chunk holding them is committed.
+    assert failures == [(2, "t2", [2])]
+    assert [i.value["content"] for i in await store.asearch(("memories", "u", "professional"))] == ["I work at a bakery"]
+    # Categories outside the known set fall back to "other".
+    assert [i.value["content"] for i in await store.asearch(("memories", "u", "other"))] == ["I like tea"]
+
+
+@pytest.mark.asyncio
+async def test_rerunning_a_chunk_overwrites_instead_of_duplicating(backfill):
+    store = InMemoryStore()
+    lines = _transcripts("I like tea")
+
+    await backfill.backfill(store, lines, model=ExtractionModel())
+    await backfill.backfill(store, lines, model=ExtractionModel())
+
+    assert len(await store.asearch(("memories", "u"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_start_offset(backfill):
+    model = ExtractionModel()
+
+    stats = await backfill.backfill(InMemoryStore(), _transcripts("a", "b", "c"), model=model, start=2)
+
+    assert stats.transcripts == 1
+    assert [p[-1]["content"] for p in model.prompts] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried(backfill):
+    store = InMemoryStore()
+    model = ExtractionModel(fail_on="boom", failures=2)
+
+    stats = await backfill.backfill(store, _transcripts("boom at work", "I like tea"), model=model, retry_delay=0)
+
+    assert (stats.failed, stats.accepted) == (0, 2)
+    assert [p[-1]["content"] for p in model.prompts] == ["boom at work", "I like tea", "boom at work", "boom at work"]
+
+
+def test_cli_writes_failed_transcripts_for_replay(backfill, tmp_path, monkeypatch):
+    source = tmp_path / "transcripts.jsonl"
+    source.write_text("\n".join(_transcripts("I like tea", "boom")) + "\n")
+    graph = sys.modules["memory_agent.graph"]
+    monkeypatch.setattr(graph, "get_llm_with_tools", lambda: ExtractionModel(fail_on="boom"))
+
+    backfill.main(["--in", str(source), "--db", str(tmp_path / "m.sqlite"), "--retries", "0"])
+
+    failed = (tmp_path / "transcripts.jsonl.failed.jsonl").read_text().splitlines()
+    assert [json.loads(line)["messages"][0]["content"] for line in failed] == ["boom"]
+    assert (tmp_path / "transcripts.jsonl.offset").read_text() == "2"
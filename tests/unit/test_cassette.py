@@ -0,0 +1,75 @@
+import dataclasses
+
+import pytest
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from test_utils import cassette, rate_limit
+from test_utils.scripted_model import ScriptedChatModel
+
+
+@dataclasses.dataclass
+class WithoutModel:
+    user_id: str = "u"
+
+
+@pytest.fixture(autouse=True)
+def no_global_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CASSETTE_DIR", str(tmp_path))
+    monkeypatch.setattr(rate_limit, "shared_rate_limiter", lambda: None)
+    yield
+    set_llm_cache(None)
+
+
+def test_no_model_override_for_contexts_without_chat_model(monkeypatch):
+    monkeypatch.setenv("LLM_CASSETTE", "record-new")
+    monkeypatch.setattr(rate_limit, "shared_rate_limiter", lambda: object())
+
+    assert cassette.cassette_context(WithoutModel) == {}
+
+
+def test_off_installs_nothing(monkeypatch):
+    monkeypatch.delenv("LLM_CASSETTE", raising=False)
+
+    assert cassette.cassette_context(WithoutModel) == {}
+    assert get_llm_cache() is None
+
+
+def test_agent_without_chat_model_field_is_replayed(monkeypatch):
+    messages = [SystemMessage("System Time: 2026-10-19T10:00:00+00:00"), HumanMessage("I play guitar")]
+    monkeypatch.setenv("LLM_CASSETTE", "record-new")
+    cassette.cassette_context(WithoutModel)
+    recorded_model = ScriptedChatModel()
+    recorded = recorded_model.bind_tools(["upsert_memory"]).invoke(messages)
+
+    monkeypatch.setenv("LLM_CASSETTE", "replay-only")
+    cassette.cassette_context(WithoutModel)
+    candidate_model = ScriptedChatModel()
+    messages[0] = SystemMessage("System Time: 2026-10-20T11:30:00+00:00")
+    replayed = candidate_model.bind_tools(["upsert_memory"]).invoke(messages)
+
+    assert (recorded_model.calls, candidate_model.calls) == (1, 0)
+    assert replayed.tool_calls == recorded.tool_calls
+    assert get_llm_cache().hits == 1
+    with pytest.raises(cassette.CassetteMiss):
+        candidate_model.invoke([HumanMessage("something new")])
+
+
+def test_call_key_masks_timestamps_and_uuids():
+    def key(time, memory_id, text="I play guitar"):
+        messages = [SystemMessage(f"System Time: {time}\n[{memory_id}]: likes tea"), HumanMessage(text)]
+        return cassette.call_key({"model": "m"}, messages, {})
+
+    first = key("2026-10-19T10:00:00.123+00:00", "0f8fad5b-d9cb-469f-a165-70867728950e")
+    assert first == key("2025-01-01 08:15:00Z", "7c9e6679-7425-40de-944b-e07fc1f90ae7")
+    assert first != key("2026-10-19T10:00:00.123+00:00", "0f8fad5b-d9cb-469f-a165-70867728950e", text="I sing")
+
+
+def test_record_then_replay(tmp_path):
+    recorder = cassette.CassetteChatModel(inner=ScriptedChatModel(), mode="record-new", directory=str(tmp_path))
+    first = recorder.invoke([HumanMessage("I play guitar")])
+    replayed = cassette.CassetteChatModel(inner=ScriptedChatModel(), mode="replay-only", directory=str(tmp_path))
+
+    assert replayed.invoke([HumanMessage("I play guitar")]).content == first.content == "personal"
+    assert (recorder.misses, replayed.hits) == (1, 1)
+    assert isinstance(first, AIMessage)
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langgraph.store.memory import InMemoryStore
+
+
+@pytest.fixture(scope="module")
+def digest(expert_src):
+    return expert_src("digest")
+
+
+@pytest.mark.asyncio
+async def test_digest_keeps_memory_ids_and_latest_content(digest):
+    store = InMemoryStore()
+    await digest.update_digest(store, "u", "personal", "m1", {"content": "likes  tea"})
+    await digest.update_digest(store, "u", "personal", "m2", {"content": "has a cat"})
+    await digest.update_digest(store, "u", "personal", "m1", {"content": "likes coffee"})
+
+    text = await digest.load_digest(store, "u", "personal", [HumanMessage("hi")], max_age=60)
+
+    assert text == "- [m2] has a cat\n- [m1] likes coffee"
+
+
+@pytest.mark.asyncio
+async def test_update_digests_groups_and_evicts_oldest(digest):
+    store = InMemoryStore()
+    memories = [("u", "personal", f"m{i}", {"content": f"fact {i}"}) for i in range(digest.MAX_ENTRIES + 5)]
+    memories.append(("u", "professional", "w", {"content": "nurse"}))
+
+    await digest.update_digests(store, memories)
+
+    personal = (await store.aget((digest.DIGEST_NAMESPACE, "u"), "personal")).value
+    assert len(personal["entries"]) == digest.MAX_ENTRIES
+    assert "m0" not in personal["entries"] and f"m{digest.MAX_ENTRIES + 4}" in personal["entries"]
+    assert (await store.aget((digest.DIGEST_NAMESPACE, "u"), "professional")).value["entries"] == {"w": "nurse"}
+
+
+@pytest.mark.asyncio
+async def test_load_digest_falls_back_when_missing_stale_or_detailed(digest):
+    store = InMemoryStore()
+    messages = [HumanMessage("hello")]
+    assert await digest.load_digest(store, "u", "personal", messages, max_age=60) is None
+
+    await digest.update_digest(store, "u", "personal", "m1", {"content": "likes tea"})
+    assert await digest.load_digest(store, "u", "personal", messages, max_age=-1) is None
+    assert await digest.load_digest(store, "u", "personal", [HumanMessage("Do you remember my cat?")], max_age=60) is None
+    assert await digest.load_digest(store, "u", "personal", messages, max_age=60) == "- [m1] likes tea"
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_updates_digest(expert_src, digest):
+    transfer = expert_src("transfer")
+    store = InMemoryStore()
+    lines = [
+        json.dumps({"user_id": "u", "category": "personal", "key": "m1", "value": {"content": "likes tea"}}),
+        json.dumps({"user_id": "u", "category": None, "key": "old", "value": {"content": "legacy"}}),
+    ]
+
+    await transfer.import_memories(store, lines)
+
+    text = await digest.load_digest(store, "u", "personal", [HumanMessage("hi")], max_age=60)
+    assert text == "- [m1] likes tea"
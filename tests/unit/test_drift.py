@@ -0,0 +1,69 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+
+@pytest.fixture(scope="module")
+def drift(expert_src):
+    return expert_src("drift")
+
+
+@pytest.fixture(scope="module")
+def State(expert_src):
+    return expert_src("state").State
+
+
+def _state(State, text, *, category="professional", topic=None, classified=None):
+    return State(
+        messages=[HumanMessage(text, id="m2")],
+        category=category,
+        topic_terms=topic or {},
+        classified_message_id=classified,
+    )
+
+
+def test_terms_drop_stopwords_and_short_words(drift):
+    assert drift.terms("I work as an engineer and I love the work") == {"work": 2, "engineer": 1, "love": 1}
+
+
+def test_similarity(drift):
+    assert drift.similarity({"a": 1.0}, {"a": 2.0}) == pytest.approx(1.0)
+    assert drift.similarity({"a": 1.0}, {"b": 1.0}) == 0.0
+    assert drift.similarity({}, {"a": 1.0}) == 0.0
+
+
+def test_first_message_is_classified(drift, State):
+    assert drift.check(_state(State, "I work at a bank", category=None), 0.8).reclassify
+
+
+def test_on_topic_message_is_not_reclassified(drift, State):
+    topic = {"work": 2.0, "bank": 1.0, "engineer": 1.0}
+    assert not drift.check(_state(State, "My work at the bank is busy", topic=topic), 0.8).reclassify
+
+
+def test_off_topic_message_is_reclassified(drift, State):
+    check = drift.check(_state(State, "My cat loves tuna", topic={"work": 2.0, "bank": 1.0}), 0.8)
+
+    assert check.reclassify
+    assert check.update("personal")["topic_terms"] == {"cat": 1, "loves": 1, "tuna": 1}
+
+
+@pytest.mark.parametrize("text", ["ok", "thanks!", "Yes, it is."])
+def test_message_without_terms_keeps_category(drift, State, text):
+    check = drift.check(_state(State, text, topic={"work": 2.0}), 0.8)
+
+    assert not check.reclassify
+    assert check.update("professional") == {
+        "category": "professional",
+        "topic_terms": {"work": 2.0},
+        "classified_message_id": "m2",
+    }
+
+
+def test_same_turn_is_not_reclassified(drift, State):
+    state = State(
+        messages=[HumanMessage("My cat loves tuna", id="m1"), AIMessage("Noted")],
+        category="professional",
+        topic_terms={"work": 1.0},
+        classified_message_id="m1",
+    )
+    assert not drift.check(state, 0.8).reclassify
@@ -0,0 +1,32 @@
+import pytest
+
+from test_utils.scripted_model import ScriptedChatModel
+
+
+@pytest.fixture(scope="module")
+def graph(expert_src):
+    return expert_src("graph")
+
+
+@pytest.fixture(scope="module")
+def Context(expert_src):
+    return expert_src("context").Context
+
+
+def test_bound_models_are_reused(graph, Context):
+    model = ScriptedChatModel()
+    first = graph.get_models(Context(chat_model=model))
+    second = graph.get_models(Context(chat_model=model))
+
+    assert first[0] is model
+    assert second[1] is first[1]
+
+
+def test_bound_models_cache_is_bounded(graph, Context, monkeypatch):
+    monkeypatch.setattr(graph, "MAX_BOUND_MODELS", 2)
+    graph._bound_models.clear()
+    a, b, c = ScriptedChatModel(), ScriptedChatModel(), ScriptedChatModel()
+    for model in (a, b, a, c):
+        graph.get_models(Context(chat_model=model))
+
+    assert [m for m, _ in graph._bound_models.values()] == [a, c]
@@ -0,0 +1,94 @@
+import itertools
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from test_utils import graph_dist
+
+
+def _graph(edges, conditional=()):
+    G = nx.DiGraph()
+    for u, v in edges:
+        G.add_node(u, name=u)
+        G.add_node(v, name=v)
+        G.add_edge(u, v, conditional=(u, v) in conditional)
+    return G
+
+
+GRAPHS = {
+    "chain": _graph([("start", "a"), ("a", "b"), ("b", "end")]),
+    "branch": _graph([("start", "a"), ("a", "b"), ("a", "end"), ("b", "end")], conditional={("a", "b")}),
+    "loop": _graph([("start", "a"), ("a", "b"), ("b", "a"), ("b", "end")]),
+    "renamed": _graph([("start", "x"), ("x", "b"), ("b", "end")]),
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    graph_dist.clear_cache()
+    yield
+    graph_dist.clear_cache()
+
+
+@pytest.mark.parametrize("first, second", list(itertools.combinations(GRAPHS, 2)))
+def test_exact_distance_lies_within_bounds(first, second):
+    G1, G2 = GRAPHS[first], GRAPHS[second]
+    lower, upper = graph_dist.edit_distance_bounds(G1, G2)
+
+    exact = graph_dist.graph_distance(G1, G2, exact=True)
+
+    assert lower <= exact <= upper
+    assert exact == nx.graph_edit_distance(G1, G2)
+    assert graph_dist.graph_distance(G1, G2, exact=False) == upper
+
+
+def test_results_are_cached(monkeypatch):
+    G1, G2 = GRAPHS["chain"], GRAPHS["renamed"]
+    first = graph_dist.graph_distance(G1, G2)
+    monkeypatch.setattr(nx, "graph_edit_distance", lambda *a, **k: pytest.fail("searched again"))
+
+    assert graph_dist.graph_distance(G2, G1) == first
+
+
+def test_timed_out_searches_are_not_cached(monkeypatch):
+    calls = []
+    monkeypatch.setattr(nx, "graph_edit_distance", lambda *a, **k: calls.append(k["timeout"]))
+    G1, G2 = GRAPHS["chain"], GRAPHS["renamed"]
+
+    fallback = graph_dist.graph_distance(G1, G2, timeout=0)
+    assert fallback == graph_dist.edit_distance_bounds(G1, G2)[1]
+    graph_dist.graph_distance(G1, G2, timeout=0)
+
+    assert calls == [0, 0]
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(graph_dist, "MAX_CACHE_ENTRIES", 2)
+    for first, second in itertools.combinations(GRAPHS, 2):
+        graph_dist.graph_distance(GRAPHS[first], GRAPHS[second], exact=False)
+
+    assert len(graph_dist._cache) == 2
+
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_matrix_is_symmetric_with_zero_diagonal(exact):
+    apps = {**GRAPHS, "chain-copy": _graph([("start", "a"), ("a", "b"), ("b", "end")])}
+
+    names, matrix = graph_dist.pairwise_distance_matrix(apps, exact=exact, max_workers=2)
+
+    assert names == list(apps)
+    assert np.array_equal(matrix, matrix.T)
+    assert not matrix.diagonal().any()
+    assert matrix[names.index("chain"), names.index("chain-copy")] == 0
+    for (i, a), (j, b) in itertools.combinations(enumerate(names), 2):
+        if {a, b} != {"chain", "chain-copy"}:
+            assert matrix[i, j] == graph_dist.graph_distance(apps[a], apps[b], exact=exact)
+
+
+def test_fingerprint_collisions_are_still_compared(monkeypatch):
+    monkeypatch.setattr(graph_dist, "graph_fingerprint", lambda G, iterations=3: "same")
+
+    names, matrix = graph_dist.pairwise_distance_matrix({"chain": GRAPHS["chain"], "loop": GRAPHS["loop"]})
+
+    assert matrix[0, 1] == matrix[1, 0] == graph_dist.edit_distance_bounds(GRAPHS["chain"], GRAPHS["loop"])[1]
@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def HashRing(expert_src):
+    return expert_src("hashring").HashRing
+
+
+def test_routing_is_stable(HashRing):
+    a, b = HashRing(range(4)), HashRing(range(4))
+    keys = [f"user-{i}" for i in range(200)]
+
+    assert [a.get(k) for k in keys] == [b.get(k) for k in keys]
+    assert set(a.get(k) for k in keys) == {0, 1, 2, 3}
+
+
+def test_adding_a_node_only_moves_keys_to_it(HashRing):
+    ring = HashRing(range(4))
+    keys = [f"user-{i}" for i in range(1000)]
+    before = {k: ring.get(k) for k in keys}
+
+    ring.add(4)
+    moved = {k for k in keys if ring.get(k) != before[k]}
+
+    assert moved
+    assert all(ring.get(k) == 4 for k in moved)
+    assert len(moved) < len(keys) / 2
+
+
+def test_removing_a_node_only_moves_its_keys(HashRing):
+    ring = HashRing(range(4))
+    keys = [f"user-{i}" for i in range(1000)]
+    before = {k: ring.get(k) for k in keys}
+
+    ring.remove(2)
+
+    assert ring.nodes == [0, 1, 3]
+    for k in keys:
+        if before[k] != 2:
+            assert ring.get(k) == before[k]
+        else:
+            assert ring.get(k) != 2
+
+
+def test_add_and_remove_are_idempotent(HashRing):
+    ring = HashRing(["a"], replicas=8)
+    ring.add("a")
+    ring.remove("b")
+
+    assert len(ring) == 1
+    assert len(ring._points) == 8
+
+
+def test_empty_ring_raises(HashRing):
+    with pytest.raises(LookupError):
+        HashRing().get("anything")
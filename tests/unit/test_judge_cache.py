@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from test_utils.judge_cache import JudgeCache, judge_key
+
+KEY = judge_key("prompt", "anthropic:judge")
+
+
+def _put(cache, candidate="a"):
+    cache.put(KEY, {"code_quality_check": True}, model="anthropic:judge", fingerprint="f", candidate=candidate)
+
+
+def test_put_then_get_is_a_hit_and_records_reuse(tmp_path):
+    cache = JudgeCache(str(tmp_path), enabled=True)
+    _put(cache)
+
+    entry = cache.get(KEY, "b")
+
+    assert entry["output"] == {"code_quality_check": True}
+    assert entry["candidates"] == ["a", "b"]
+    assert JudgeCache(str(tmp_path), enabled=True).get(KEY, "a")["candidates"] == ["a", "b"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_unknown_key_is_a_miss(tmp_path):
+    assert JudgeCache(str(tmp_path), enabled=True).get(KEY, "a") is None
+
+
+@pytest.mark.parametrize("content", ["", '{"model": "anthropic:ju', "[]", '{"candidates": []}'])
+def test_unreadable_entry_is_a_miss_and_can_be_replaced(tmp_path, content):
+    cache = JudgeCache(str(tmp_path), enabled=True)
+    (tmp_path / f"{KEY}.json").write_text(content)
+
+    assert cache.get(KEY, "a") is None
+    _put(cache)
+    assert cache.get(KEY, "a")["output"] == {"code_quality_check": True}
+
+
+def test_disabled_cache_neither_reads_nor_writes(tmp_path, monkeypatch):
+    monkeypatch.setenv("JUDGE_CACHE", "off")
+    _put(JudgeCache(str(tmp_path), enabled=True))
+
+    cache = JudgeCache(str(tmp_path))
+    _put(cache)
+
+    assert not cache.enabled
+    assert cache.get(KEY, "b") is None
+    assert JudgeCache(str(tmp_path), enabled=True).get(KEY, "c")["candidates"] == ["a", "c"]
+
+
+def test_concurrent_reuse_keeps_every_candidate(tmp_path):
+    cache = JudgeCache(str(tmp_path), enabled=True)
+    _put(cache)
+    names = [f"c{i}" for i in range(16)]
+    threads = [threading.Thread(target=cache.get, args=(KEY, name)) for name in names]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(cache.get(KEY, "a")["candidates"]) == sorted(["a", *names])
@@ -0,0 +1,62 @@
+from test_utils.format_code import folder_to_prompt_string
+from test_utils.judge_prompt import (
+    build_diff_prompt,
+    estimate_tokens,
+    parse_code_listing,
+    render_listing,
+    unescape_braces,
+    unified_diff,
+)
+from test_utils.prompt import BASE_CODE, EXPERT_CODE
+
+
+def _write_package(tmp_path, files: dict[str, str]):
+    for name, content in files.items():
+        (tmp_path / name).write_text(content)
+    return folder_to_prompt_string([tmp_path])
+
+
+def test_parse_code_listing_reads_folder_listings(tmp_path):
+    files = {"a.py": "x = 1\n", "b.py": "def f():\n    return {}\n"}
+    assert parse_code_listing(_write_package(tmp_path, files)) == files
+
+
+def test_render_listing_truncates_long_files():
+    listing = render_listing({"a.py": "x" * 100}, max_chars_per_file=10)
+    assert "x" * 11 not in listing
+    assert "truncated" in listing
+
+
+def test_base_listing_parses_into_files():
+    files = parse_code_listing(unescape_braces(BASE_CODE))
+    assert "graph.py" in files
+    assert "{{" not in files["graph.py"]
+
+
+def test_identical_code_gives_empty_diff(tmp_path):
+    base = parse_code_listing(unescape_braces(BASE_CODE))
+    user_code = _write_package(tmp_path, base)
+
+    assert unified_diff(base, parse_code_listing(user_code)) == "(no changes)\n"
+    prompt, _ = build_diff_prompt(
+        user_task="task", expert_code=EXPERT_CODE, base_code=BASE_CODE, user_code=user_code, human_notes=""
+    )
+    assert "Coding agent implementation to evaluate, as a diff from the base code:\n(no changes)\n" in prompt
+
+
+def test_unified_diff_marks_new_and_removed_files():
+    diff = unified_diff({"old.py": "a\n", "same.py": "s\n"}, {"new.py": "b\n", "same.py": "s\n"})
+
+    assert "--- /dev/null\n+++ b/new.py" in diff
+    assert "--- a/old.py\n+++ /dev/null" in diff
+    assert "same.py" not in diff
+
+
+def test_diff_prompt_shrinks_to_budget():
+    args = dict(user_task="task", expert_code=EXPERT_CODE, base_code=BASE_CODE, user_code=EXPERT_CODE, human_notes="")
+    _, roomy = build_diff_prompt(**args, token_budget=1_000_000)
+    prompt, tight = build_diff_prompt(**args, token_budget=roomy["tokens"] // 2)
+
+    assert roomy["context_lines"] == 3 and not roomy["base_truncated"]
+    assert tight["tokens"] == estimate_tokens(prompt) < roomy["tokens"]
+    assert tight["context_lines"] == 0
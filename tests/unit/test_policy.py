@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def policy(expert_src):
+    return expert_src("policy")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _proposal(policy, content="likes tea", category="personal", user_id="alice"):
+    return policy.Proposal(user_id=user_id, content=content, context="chat", category=category)
+
+
+def test_first_deciding_rule_wins(policy):
+    p = policy.ApprovalPolicy(
+        [policy.DenyPatterns(patterns=["(?i)password"]), policy.AutoAcceptCategories(categories=frozenset({"personal"}))]
+    )
+
+    assert p.decide(_proposal(policy, "my password is hunter2")) == "reject"
+    assert p.decide(_proposal(policy)) == "accept"
+    assert p.decide(_proposal(policy, category="professional")) is None
+    assert p.stats() == {"deny_patterns:reject": 1, "reject": 1, "auto_accept:accept": 1, "accept": 1, "undecided": 1}
+
+
+def test_auto_accept_respects_opted_in_users(policy):
+    rule = policy.AutoAcceptCategories(categories=frozenset({"personal"}), user_ids=frozenset({"alice"}))
+
+    assert rule.evaluate(_proposal(policy)) == "accept"
+    assert rule.evaluate(_proposal(policy, user_id="bob")) is None
+
+
+def test_rate_limit_is_not_memoized(policy):
+    clock = Clock()
+    p = policy.ApprovalPolicy([policy.RateLimit(max_proposals=1, window_seconds=10, clock=clock)])
+
+    assert p.decide(_proposal(policy, "first")) is None
+    assert p.decide(_proposal(policy, "second")) == "reject"
+    clock.now = 11
+    # The same proposal is evaluated again once the window has room.
+    assert p.decide(_proposal(policy, "second")) is None
+    assert p.decide(_proposal(policy, "third")) == "reject"
+
+
+def test_repeated_call_id_reuses_the_first_decision(policy):
+    clock = Clock()
+    p = policy.ApprovalPolicy([policy.RateLimit(max_proposals=1, window_seconds=10, clock=clock)])
+
+    assert p.decide(_proposal(policy, "first"), call_id="call_1") is None
+    # upsert_memory re-runs when the interrupt is resumed, after the window has moved on.
+    clock.now = 5
+    assert p.decide(_proposal(policy, "second")) == "reject"
+    assert p.decide(_proposal(policy, "first"), call_id="call_1") is None
+    assert p.stats() == {"undecided": 1, "rate_limit:reject": 1, "reject": 1}
+
+
+def test_memoized_stateless_decision_still_runs_earlier_rate_limit(policy):
+    clock = Clock()
+    p = policy.ApprovalPolicy(
+        [
+            policy.RateLimit(max_proposals=2, window_seconds=10, clock=clock),
+            policy.AutoAcceptCategories(categories=frozenset({"personal"})),
+        ]
+    )
+
+    assert p.decide(_proposal(policy, "a")) == "accept"
+    assert p.decide(_proposal(policy, "b")) == "accept"
+    assert p.decide(_proposal(policy, "a")) == "reject"
+    clock.now = 11
+    assert p.decide(_proposal(policy, "a")) == "accept"
+
+
+@pytest.mark.asyncio
+async def test_resumed_interrupt_is_not_decided_again(policy, expert_src):
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.store.memory import InMemoryStore
+    from langgraph.types import Command
+
+    from test_utils.scripted_model import ScriptedChatModel
+
+    clock = Clock()
+    p = policy.ApprovalPolicy([policy.RateLimit(max_proposals=1, window_seconds=10, clock=clock)])
+    store = InMemoryStore()
+    graph = expert_src("graph").builder.compile(checkpointer=MemorySaver(), store=store)
+    context = expert_src("context").Context(user_id="alice", chat_model=ScriptedChatModel(), approval_policy=p)
+    config = {"configurable": {"thread_id": "t1"}}
+
+    out = await graph.ainvoke({"messages": [("user", "I work at a bank. Remember this.")]}, config, context=context)
+    assert "__interrupt__" in out
+    # The human answers after the rate-limit window has expired and refilled.
+    clock.now = 11
+    assert p.decide(_proposal(policy, "someone else's")) is None
+    await graph.ainvoke(Command(resume="accept"), config, context=context)
+
+    assert len(await store.asearch(("memories", "alice", "professional"))) == 1
+    assert p.stats() == {"undecided": 2}
+
+
+def test_from_file_builds_rules(policy, tmp_path):
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps({"rules": [{"type": "auto_accept", "categories": ["personal"]}]}))
+
+    p = policy.ApprovalPolicy.from_file(path)
+
+    assert p.approver(undecided="reject")("alice", {"content": "x", "category": "personal"})
+    assert not p.approver(undecided="reject")("alice", {"content": "x", "category": "other"})
+    with pytest.raises(ValueError):
+        policy.ApprovalPolicy.from_dict({"rules": [{"type": "nope"}]})
+
+
+def test_context_env_overrides_parse_objects_and_skip_models(expert_src, monkeypatch, tmp_path):
+    context = expert_src("context")
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps({"rules": [{"type": "deny_patterns", "patterns": ["x"]}]}))
+    monkeypatch.setenv("APPROVAL_POLICY", str(path))
+    monkeypatch.setenv("CHAT_MODEL", "not-a-model")
+    monkeypatch.setenv("TOPIC_DRIFT_THRESHOLD", "0.5")
+    context._env_overrides.cache_clear()
+    try:
+        ctx = context.Context()
+    finally:
+        context._env_overrides.cache_clear()
+
+    assert isinstance(ctx.approval_policy, expert_src("policy").ApprovalPolicy)
+    assert ctx.chat_model is None
+    assert ctx.topic_drift_threshold == 0.5
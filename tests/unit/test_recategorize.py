@@ -0,0 +1,58 @@
+import re
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.store.memory import InMemoryStore
+
+
+class BatchClassifier:
+    """Answers the batch category prompt, leaving out memories that mention "???"."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        lines = []
+        for number, text in re.findall(r"^(\d+)\. (.*)$", messages[-1].content, re.M):
+            if "???" not in text:
+                lines.append(f"{number}: {'professional' if 'work' in text else 'personal'}")
+        return AIMessage("\n".join(lines))
+
+
+@pytest.fixture(scope="module")
+def recategorize(expert_src):
+    return expert_src("recategorize")
+
+
+async def _seed(store, *contents):
+    for i, content in enumerate(contents):
+        await store.aput(("memories", "u"), f"k{i}", {"content": content})
+
+
+@pytest.mark.asyncio
+async def test_unclassified_memories_stay_for_retry(recategorize):
+    store = InMemoryStore()
+    await _seed(store, "I work at a bank", "I like tea", "??? garbled", "my work is remote", "I have a dog")
+
+    stats = await recategorize.migrate(store, llm=BatchClassifier(), batch_size=2)
+
+    assert (stats.users, stats.migrated, stats.unclassified, stats.llm_calls) == (1, 4, 1, 3)
+    legacy = [i for i in await store.asearch(("memories", "u"), limit=100) if i.namespace == ("memories", "u")]
+    assert [i.key for i in legacy] == ["k2"]
+    assert sorted(i.key for i in await store.asearch(("memories", "u", "professional"))) == ["k0", "k3"]
+
+
+@pytest.mark.asyncio
+async def test_failed_llm_call_moves_nothing(recategorize):
+    store = InMemoryStore()
+    await _seed(store, "I like tea", "I have a dog")
+
+    stats = await recategorize.migrate(store, llm=BatchClassifier(fail=True))
+
+    assert (stats.migrated, stats.unclassified) == (0, 2)
+    assert len(await store.asearch(("memories", "u"))) == 2
+    assert not await store.asearch(("memories", "u", "personal"))
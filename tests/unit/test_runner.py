@@ -0,0 +1,83 @@
+import argparse
+import json
+import textwrap
+
+import pytest
+
+from test_utils import runner
+
+SCORING_TEST = textwrap.dedent(
+    """
+    import json, os, pathlib
+
+    def test_score():
+        out = pathlib.Path("results")
+        out.mkdir(exist_ok=True)
+        name = os.environ["CANDIDATE_NAME"]
+        score = {"bucket": "smoke", "points": 7, "max_points": 10, "judge_cache": os.environ.get("JUDGE_CACHE")}
+        (out / f"smoke_{name}.json").write_text(json.dumps(score))
+    """
+)
+
+
+def _args(**overrides):
+    defaults = dict(
+        tests=["tests"], parallel=2, min_repeats=2, max_repeats=3, tolerance=0.5, rps=0.0, burst=4, timeout=60.0
+    )
+    return argparse.Namespace(**{**defaults, **overrides})
+
+
+def _candidate(tmp_path, name="cand"):
+    workdir = tmp_path / name
+    (workdir / "tests").mkdir(parents=True)
+    (workdir / "tests" / "test_score.py").write_text(SCORING_TEST)
+    return runner.parse_candidate(f"{name}={workdir}")
+
+
+def test_parse_candidate():
+    candidate = runner.parse_candidate("claude-mcp=evals")
+    assert candidate.name == "claude-mcp"
+    assert candidate.workdir.is_absolute()
+    with pytest.raises(argparse.ArgumentTypeError):
+        runner.parse_candidate("evals")
+
+
+@pytest.mark.parametrize(
+    "totals, expected",
+    [([], False), ([5.0], False), ([5.0, 5.2], True), ([2.0, 8.0], False), ([2.0, 8.0, 5.0, 5.0, 5.0], False)],
+)
+def test_converged(totals, expected):
+    candidate = runner.Candidate(name="c", workdir=None, finished=[{"points": t} for t in totals])
+    assert runner.converged(candidate, min_repeats=2, tolerance=0.5) is expected
+
+
+def test_run_once_collects_result_files(tmp_path):
+    run = runner.run_once(_candidate(tmp_path), 1, ["tests"], {}, timeout=60)
+
+    assert run["returncode"] == 0
+    assert run["run_name"] == "cand-1"
+    assert (run["points"], run["max_points"]) == (7, 10)
+    assert run["buckets"] == {"smoke": 7}
+
+
+@pytest.mark.parametrize("rps", [0.0, 5.0])
+def test_repeats_run_without_the_judge_cache(tmp_path, rps):
+    candidate = _candidate(tmp_path)
+    runs = runner.run_all([candidate], _args(min_repeats=2, max_repeats=2, rps=rps))
+
+    assert sorted(r["repeat"] for r in runs) == [1, 2]
+    assert all(json.loads(open(r["files"][0]).read())["judge_cache"] == "off" for r in runs)
+
+
+def test_merge_copies_results_and_writes_summary(tmp_path):
+    candidate = _candidate(tmp_path)
+    runs = runner.run_all([candidate], _args(max_repeats=1, min_repeats=1))
+    out = tmp_path / "merged"
+
+    summary = runner.merge([candidate], runs, out, wall=1.0)
+
+    assert (out / "smoke_cand-1.json").exists()
+    assert json.loads((out / "runner_summary.json").read_text()) == summary
+    assert summary["candidates"]["cand"]["repeats"] == 1
+    assert summary["candidates"]["cand"]["mean_points"] == 7
+    assert json.loads((out / "smoke_cand-1.json").read_text())["judge_cache"] is None
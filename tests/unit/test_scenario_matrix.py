@@ -0,0 +1,26 @@
+import pytest
+from langgraph.store.memory import InMemoryStore
+
+from test_utils.scenario_matrix import MAX_RESUMES, EvalCase, run_case
+
+
+class AlwaysInterrupting:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, *args, **kwargs):
+        self.calls += 1
+        return {"__interrupt__": ["Saving the following memory"]}
+
+
+@pytest.mark.asyncio
+async def test_endless_interrupts_are_recorded_as_an_error():
+    graph = AlwaysInterrupting()
+    case = EvalCase(case_id="loop", message="I like tea. Remember this.", expected_category="personal")
+
+    result = await run_case(graph, InMemoryStore(), case, "run", lambda user_id: None)
+
+    assert result.interrupts == MAX_RESUMES
+    assert graph.calls == MAX_RESUMES + 1
+    assert result.error == f"RuntimeError: still interrupted after {MAX_RESUMES} resumes"
+    assert not result.correct
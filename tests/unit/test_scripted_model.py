@@ -0,0 +1,82 @@
+import dataclasses
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fake_model import benchmark_model
+from test_utils.scenario_matrix import build_matrix
+from test_utils.scripted_model import ScriptedChatModel, model_override
+
+ENGINEERS = [f"I work as engineer number {i}." for i in range(200)]
+
+
+def _proposes_memory(model, text: str) -> bool:
+    return bool(model.bind_tools(["upsert_memory"]).invoke([HumanMessage(text)]).tool_calls)
+
+
+def test_classifier_uses_first_line():
+    model = ScriptedChatModel()
+    assert model.invoke("I play guitar\nwork job engineer").content == "personal"
+
+
+@pytest.mark.parametrize("case", build_matrix(decisions=("accept",)), ids=lambda c: c.case_id)
+def test_matrix_cases_exercise_the_memory_path(case):
+    model = ScriptedChatModel()
+    scenario = model.scenario_for(case.message)
+
+    assert scenario.remember
+    assert model.invoke(case.message).content in ("personal", "professional", "other")
+
+
+def test_default_scenarios_are_not_fitted_to_the_matrix():
+    model = ScriptedChatModel()
+    cases = build_matrix(decisions=("accept",))
+    correct = sum(model.scenario_for(c.message).category == c.expected_category for c in cases)
+
+    assert correct < len(cases)
+
+
+def test_remember_rate_is_deterministic():
+    model = ScriptedChatModel(remember_rate=0.3, seed=7)
+    picked = [_proposes_memory(model, text) for text in ENGINEERS]
+
+    replay = ScriptedChatModel(remember_rate=0.3, seed=7)
+    assert picked == [_proposes_memory(replay, text) for text in ENGINEERS]
+    assert 0.2 < sum(picked) / len(picked) < 0.4
+    assert all(_proposes_memory(ScriptedChatModel(), text) for text in ENGINEERS[:10])
+
+
+def test_remember_rate_tracks_the_request_with_few_prompts():
+    utterances = ["I work at a bank.", "I love my cat.", "Remember the train was late."]
+    model = ScriptedChatModel(remember_rate=0.3)
+    picked = [_proposes_memory(model, utterances[i % len(utterances)]) for i in range(600)]
+
+    assert 0.25 < sum(picked) / len(picked) < 0.35
+
+
+def test_jitter_stays_within_bounds():
+    model = ScriptedChatModel(latency=0.05, jitter=0.02)
+    delays = [model._delay([HumanMessage(text)]) for text in ENGINEERS]
+
+    assert all(0.03 <= d <= 0.07 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_benchmark_model_remembers_unmatched_turns():
+    model = benchmark_model(tool_call_rate=1.0)
+    assert _proposes_memory(model, "I read a book about the history of maps.")
+
+
+def test_model_override_needs_a_chat_model_field(monkeypatch):
+    @dataclasses.dataclass
+    class WithModel:
+        user_id: str = "u"
+        chat_model: object = None
+
+    @dataclasses.dataclass
+    class WithoutModel:
+        user_id: str = "u"
+
+    monkeypatch.setenv("SCRIPTED_MODEL", "1")
+    assert isinstance(model_override(WithModel)["chat_model"], ScriptedChatModel)
+    assert model_override(WithoutModel) == {}
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def server(expert_src):
+    return expert_src("server")
+
+
+def test_dead_worker_fails_pending_requests_and_is_respawned(server):
+    # Checks run only when the test asks, so nothing respawns behind its back.
+    pool = server.WorkerPool(server.ServerOptions(workers=1, health_check_interval=60, drain_timeout=10))
+    pool.start()
+    try:
+        dead = pool._procs[0]
+        dead.kill()
+        dead.join()
+        fut = pool.submit({"thread_id": "t", "user_id": "u", "messages": []})
+
+        assert pool.check_workers() == [0]
+        with pytest.raises(server.WorkerUnavailable):
+            fut.result(timeout=1)
+        assert pool._procs[0] is not dead and pool._procs[0].is_alive()
+        assert pool.in_flight() == 0
+        assert pool.snapshot()["worker_restarts_total"] == 1
+        assert pool.check_workers() == []
+    finally:
+        pool.drain()
+
+
+def test_dead_worker_is_detected_under_steady_traffic(server):
+    pool = server.WorkerPool(server.ServerOptions(workers=2, health_check_interval=0.2, drain_timeout=10))
+    pool.start()
+    stop = threading.Event()
+    answered = []
+    users = {pool._ring.get(f"u{i}"): f"u{i}" for i in range(50)}
+
+    def traffic():
+        # Jobs without messages fail before reaching the model, so the healthy
+        # worker answers quickly and never leaves the outbox idle.
+        while not stop.is_set():
+            answered.append(pool.submit({"thread_id": "t", "user_id": users[1]}).exception(timeout=10))
+
+    chatter = threading.Thread(target=traffic)
+    try:
+        chatter.start()
+        deadline = time.monotonic() + 60
+        while len(answered) < 5 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        before = len(answered)
+        dead = pool._procs[0]
+        dead.kill()
+        dead.join()
+        fut = pool.submit({"thread_id": "t", "user_id": users[0]})
+
+        with pytest.raises(server.WorkerUnavailable):
+            fut.result(timeout=5)
+        assert pool.snapshot()["worker_restarts_total"] == 1
+        assert len(answered) > before >= 5
+        assert not any(isinstance(e, server.WorkerUnavailable) for e in answered)
+    finally:
+        stop.set()
+        chatter.join()
+        pool.drain()
@@ -0,0 +1,55 @@
+import pytest
+from langgraph.store.base import PutOp
+from langgraph.store.memory import InMemoryStore
+
+
+class RecordingStore(InMemoryStore):
+    """InMemoryStore that remembers the puts it received."""
+
+    def __init__(self):
+        super().__init__()
+        self.puts = []
+
+    async def abatch(self, ops):
+        ops = list(ops)
+        self.puts.extend(op for op in ops if isinstance(op, PutOp) and op.value is not None)
+        return await super().abatch(ops)
+
+
+@pytest.fixture(scope="module")
+def ShardedStore(expert_src):
+    return expert_src("sharding").ShardedStore
+
+
+def _namespaces(n):
+    return [("memories", f"user-{i}", "personal") for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_users_stay_on_one_shard_and_reads_fan_in(ShardedStore):
+    shards = [InMemoryStore(), InMemoryStore()]
+    store = ShardedStore(shards)
+    for ns in _namespaces(20):
+        await store.aput(ns, "k", {"content": ns[1]})
+
+    assert all(sum(bool(s.search(ns)) for s in shards) == 1 for ns in _namespaces(20))
+    assert (await store.aget(("memories", "user-3", "personal"), "k")).value == {"content": "user-3"}
+    assert len(await store.asearch(("memories",), limit=100)) == 20
+
+
+@pytest.mark.asyncio
+async def test_add_shard_moves_items_with_index_and_shuts_down_old_executor(ShardedStore):
+    store = ShardedStore([InMemoryStore(), InMemoryStore()])
+    for ns in _namespaces(50):
+        await store.aput(ns, "k", {"content": ns[1]})
+    old_executor = store._executor
+    new_shard = RecordingStore()
+
+    moved = await store.aadd_shard(new_shard, batch_size=7, index=["content"])
+
+    assert moved == len(new_shard.puts) > 0
+    assert all(op.index == ["content"] and op.ttl is None for op in new_shard.puts)
+    assert old_executor._shutdown and store._executor is not old_executor
+    for ns in _namespaces(50):
+        assert (await store.aget(ns, "k")).value == {"content": ns[1]}
+    assert len(await store.asearch(("memories",), limit=100)) == 50
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def SingleFlight(expert_src):
+    return expert_src("singleflight").SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_task(SingleFlight):
+    flight = SingleFlight("test")
+    started = 0
+
+    async def work():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert started == 1
+    assert flight.stats() == {"name": "test", "calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_distinct_keys_and_later_calls_run_fresh(SingleFlight):
+    flight = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0)
+        return object()
+
+    a, b = await asyncio.gather(flight.do("a", work), flight.do("b", work))
+    c = await flight.do("a", work)
+
+    assert a is not b and a is not c
+    assert flight.calls == 3 and flight.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter(SingleFlight):
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+
+    assert [type(r) for r in results] == [ValueError, ValueError]
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_work(SingleFlight):
+    flight = SingleFlight("test")
+    gate = asyncio.Event()
+
+    async def work():
+        await gate.wait()
+        return 42
+
+    first = asyncio.ensure_future(flight.do("k", work))
+    second = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    gate.set()
+
+    assert await second == 42
@@ -0,0 +1,95 @@
+import textwrap
+
+from test_utils.judge_prompt import parse_code_listing, unescape_braces
+from test_utils.prompt import BASE_CODE
+from test_utils.static_checks import STATIC_FIELDS, analyze_package
+
+from .conftest import EXPERT_SRC
+
+GOOD_TOOLS = textwrap.dedent(
+    """
+    from langgraph.types import interrupt
+
+    async def upsert_memory(content, category, *, user_id, store):
+        answer = interrupt(f"Save {content}?")
+        namespace = ("memories", user_id, category)
+        await store.aput(namespace, "key", {"content": content})
+    """
+)
+GOOD_GRAPH = textwrap.dedent(
+    """
+    async def get_memory_category(messages, llm):
+        return (await llm.ainvoke(messages)).content
+
+    async def call_model(state, store, user_id, category):
+        return await store.asearch(("memories", user_id, category), query="x")
+    """
+)
+
+
+def _package(tmp_path, files: dict[str, str]):
+    for name, content in files.items():
+        (tmp_path / name).write_text(content)
+    return tmp_path
+
+
+def test_expert_package_passes_every_check():
+    results = analyze_package(f"{EXPERT_SRC}/memory_agent")
+
+    assert set(results) == set(STATIC_FIELDS)
+    assert {field: r["passed"] for field, r in results.items()} == dict.fromkeys(STATIC_FIELDS, True)
+
+
+def test_base_package_fails_the_new_requirements(tmp_path):
+    results = analyze_package(_package(tmp_path, parse_code_listing(unescape_braces(BASE_CODE))))
+
+    assert results["presence_of_interrupt"]["passed"] is False
+    assert results["user_id_and_category_wise_storage"]["passed"] is False
+    assert results["category_retrieval"]["passed"] is False
+    assert results["llm_based_categorization"]["passed"] is None
+    assert results["no_test_files"]["passed"]
+
+
+def test_minimal_package_passes_with_evidence(tmp_path):
+    results = analyze_package(_package(tmp_path, {"tools.py": GOOD_TOOLS, "graph.py": GOOD_GRAPH}))
+
+    assert all(r["passed"] for r in results.values())
+    assert results["presence_of_interrupt"]["evidence"].startswith("interrupt() called at tools.py:")
+    assert "aput(('memories', 'user_id', 'category'))" in results["user_id_and_category_wise_storage"]["evidence"]
+    assert "get_memory_category -> .ainvoke()" in results["llm_based_categorization"]["evidence"]
+
+
+def test_storage_without_category_fails(tmp_path):
+    tools = GOOD_TOOLS.replace('("memories", user_id, category)', '("memories", user_id)')
+    results = analyze_package(_package(tmp_path, {"tools.py": tools}))
+
+    assert results["user_id_and_category_wise_storage"]["passed"] is False
+    assert "aput(('memories', 'user_id'))" in results["user_id_and_category_wise_storage"]["evidence"]
+
+
+def test_config_subscripts_and_helper_model_calls_are_resolved(tmp_path):
+    tools = GOOD_TOOLS.replace("user_id, category)", 'config["configurable"]["user_id"], category)')
+    graph = GOOD_GRAPH.replace(
+        "return (await llm.ainvoke(messages)).content", "return await classify(messages, llm)"
+    ) + "\nasync def classify(messages, llm):\n    return (await llm.ainvoke(messages)).content\n"
+    results = analyze_package(_package(tmp_path, {"tools.py": tools, "graph.py": graph}))
+
+    assert "('memories', 'config.configurable.user_id', 'category')" in results["user_id_and_category_wise_storage"]["evidence"]
+    assert results["user_id_and_category_wise_storage"]["passed"] is True
+    assert "get_memory_category -> classify -> .ainvoke()" in results["llm_based_categorization"]["evidence"]
+
+
+def test_unfamiliar_namespace_names_are_left_to_the_judge(tmp_path):
+    tools = GOOD_TOOLS.replace("category)", "memory_type)")
+    results = analyze_package(_package(tmp_path, {"tools.py": tools}))
+
+    assert results["user_id_and_category_wise_storage"]["passed"] is None
+    assert "memory_type" in results["user_id_and_category_wise_storage"]["evidence"]
+    assert results["llm_based_categorization"]["passed"] is None
+
+
+def test_test_files_and_parse_errors_are_reported(tmp_path):
+    results = analyze_package(_package(tmp_path, {"test_graph.py": "", "broken.py": "def ("}))
+
+    assert results["no_test_files"]["evidence"].startswith("test/demo files: ['test_graph.py']")
+    assert "could not parse: broken.py" in results["presence_of_interrupt"]["evidence"]
@@ -0,0 +1,82 @@
+import json
+import urllib.request
+
+import pytest
+
+
+@pytest.fixture
+def tracing(expert_src):
+    tracing = expert_src("tracing")
+    was_enabled = tracing.tracer.enabled
+    tracing.tracer.reset()
+    yield tracing
+    tracing.disable()
+    tracing.tracer.enabled = was_enabled
+    tracing.tracer.reset()
+
+
+def test_histogram_buckets_and_percentiles(tracing):
+    hist = tracing.Histogram()
+    for ms in range(1, 101):
+        hist.observe(ms / 1000)
+
+    assert hist.count == 100
+    assert hist.percentile(50) == pytest.approx(0.051)
+    assert hist.percentile(99) == pytest.approx(0.1)
+    assert sum(hist.buckets) == 100
+    assert hist.buckets[0] == 1  # only 1ms is <= the first bound
+    assert tracing.Histogram().percentile(50) is None
+
+
+def test_span_is_a_no_op_while_disabled(tracing):
+    tracing.disable()
+    with tracing.span("node", "stage"):
+        pass
+
+    assert tracing.tracer.snapshot() == {}
+
+
+@pytest.mark.asyncio
+async def test_enabled_spans_are_recorded_and_written(tracing, tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracing.enable(str(path))
+
+    @tracing.traced_node
+    async def call_model():
+        with tracing.span("call_model", "search"):
+            pass
+        return "done"
+
+    assert await call_model() == "done"
+    tracing.disable()
+
+    snapshot = tracing.tracer.snapshot()
+    assert set(snapshot) == {"call_model.search", "call_model.total"}
+    assert snapshot["call_model.total"]["count"] == 1
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(s["node"], s["stage"]) for s in spans] == [("call_model", "search"), ("call_model", "total")]
+
+
+def test_prometheus_rendering_is_cumulative(tracing):
+    tracing.tracer.record("n", "s", 0.002)
+    tracing.tracer.record("n", "s", 100.0)
+
+    text = tracing.tracer.render_prometheus()
+
+    assert 'memory_agent_stage_seconds_bucket{node="n",stage="s",le="0.001"} 0' in text
+    assert 'memory_agent_stage_seconds_bucket{node="n",stage="s",le="0.0025"} 1' in text
+    assert 'memory_agent_stage_seconds_bucket{node="n",stage="s",le="60.0"} 1' in text
+    assert 'memory_agent_stage_seconds_bucket{node="n",stage="s",le="+Inf"} 2' in text
+    assert 'memory_agent_stage_seconds_count{node="n",stage="s"} 2' in text
+
+
+def test_metrics_endpoint(tracing):
+    tracing.tracer.record("n", "s", 0.01)
+    server = tracing.serve_metrics(port=0)
+    try:
+        host, port = server.server_address[:2]
+        body = urllib.request.urlopen(f"http://{host}:{port}/metrics").read().decode()
+    finally:
+        server.shutdown()
+
+    assert body == tracing.tracer.render_prometheus()
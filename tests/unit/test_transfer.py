@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+from langgraph.store.memory import InMemoryStore
+
+
+@pytest.fixture(scope="module")
+def transfer(expert_src):
+    return expert_src("transfer")
+
+
+async def _seed(store):
+    await store.aput(("memories", "alice", "personal"), "m1", {"content": "likes tea"})
+    await store.aput(("memories", "alice", "professional"), "m2", {"content": "is a nurse"})
+    await store.aput(("memories", "alice"), "legacy", {"content": "old memory"})
+    await store.aput(("memories", "bob", "personal"), "m3", {"content": "has a cat"})
+
+
+@pytest.mark.asyncio
+async def test_export_import_round_trip(transfer):
+    source, target = InMemoryStore(), InMemoryStore()
+    await _seed(source)
+    out = io.StringIO()
+
+    written = await transfer.export_memories(source, out, page_size=1)
+    lines = out.getvalue().splitlines()
+    await transfer.import_memories(target, lines, batch_size=2)
+
+    assert written == len(lines) == 4
+    records = {r["key"]: r for r in map(json.loads, lines)}
+    assert records["legacy"]["category"] is None
+    assert records["m2"] == {**records["m2"], "user_id": "alice", "category": "professional"}
+    assert (await target.aget(("memories", "alice"), "legacy")).value == {"content": "old memory"}
+    assert (await target.aget(("memories", "bob", "personal"), "m3")).value == {"content": "has a cat"}
+
+
+@pytest.mark.asyncio
+async def test_export_filters_by_user_and_category(transfer):
+    store = InMemoryStore()
+    await _seed(store)
+    out = io.StringIO()
+
+    written = await transfer.export_memories(store, out, user_ids=["alice"], categories=["personal"])
+
+    assert written == 1
+    assert json.loads(out.getvalue())["key"] == "m1"
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_from_committed_offset(transfer):
+    record = {"user_id": "u", "category": "personal", "value": {"content": "x"}}
+    lines = [json.dumps({**record, "key": str(i)}) for i in range(5)]
+    commits = []
+
+    store = InMemoryStore()
+    end = await transfer.import_memories(store, lines, batch_size=2, start=3, on_commit=commits.append)
+
+    assert end == 5 and commits[-1] == 5
+    assert sorted(i.key for i in await store.asearch(("memories", "u"))) == ["3", "4"]
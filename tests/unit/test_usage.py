@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+
+@pytest.fixture(scope="module")
+def usage(expert_src):
+    return expert_src("usage")
+
+
+def _message(input_tokens=1_000_000, output_tokens=0, model="claude-3-5-sonnet-20240620"):
+    return AIMessage(
+        "",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+        response_metadata={"model_name": model},
+    )
+
+
+def test_estimate_cost(usage):
+    assert usage.estimate_cost("claude-3-5-sonnet-20240620", 1_000_000, 1_000_000) == pytest.approx(18.0)
+    assert usage.estimate_cost("unknown-model", 1_000_000, 1_000_000) == 0.0
+
+
+def test_totals_per_user_thread_and_call_site(usage):
+    tracker = usage.UsageTracker()
+    tracker.record("classify", _message(), user_id="alice", thread_id="t1")
+    tracker.record("respond", _message(output_tokens=1_000_000), user_id="alice", thread_id="t1")
+    tracker.record("respond", _message(), user_id="bob", thread_id=None)
+    tracker.record("respond", AIMessage("no usage"), user_id="bob", thread_id=None)
+
+    assert tracker.user_totals("alice")["respond"] == {
+        "calls": 1,
+        "input_tokens": 1_000_000,
+        "output_tokens": 1_000_000,
+        "cost_usd": pytest.approx(18.0),
+    }
+    assert set(tracker.thread_totals("t1")) == {"classify", "respond"}
+    assert tracker.call_site_totals()["respond"]["calls"] == 2
+    assert [user for user, _ in tracker.top_users()] == ["alice", "bob"]
+
+
+def test_thread_totals_are_bounded(usage):
+    tracker = usage.UsageTracker(max_threads=2)
+    for thread_id in ("t1", "t2", "t1", "t3"):
+        tracker.record("respond", _message(), user_id="u", thread_id=thread_id)
+
+    assert list(tracker.by_thread) == ["t1", "t3"]
+    assert tracker.thread_totals("t2") == {}
+    assert tracker.user_totals("u")["respond"]["calls"] == 4
+
+
+def test_budget_alarm_fires_once(usage):
+    tracker = usage.UsageTracker()
+    alarms = []
+    tracker.on_budget_exceeded = lambda *args: alarms.append(args)
+    tracker.set_budget("alice", 5.0)
+
+    for _ in range(3):
+        tracker.record("respond", _message(), user_id="alice", thread_id=None)
+
+    assert alarms == [("alice", pytest.approx(6.0), 5.0)]
+
+
+def test_records_are_written_in_the_background(usage, tmp_path):
+    path = tmp_path / "usage.jsonl"
+    tracker = usage.UsageTracker(persist_path=str(path))
+    for i in range(5):
+        tracker.record("respond", _message(input_tokens=i), user_id="u", thread_id="t")
+
+    tracker.flush()
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["input_tokens"] for row in rows] == [0, 1, 2, 3, 4]
+    assert rows[0]["model"] == "claude-3-5-sonnet-20240620"
+
+
+def test_unwritable_usage_file_does_not_block(usage, tmp_path, caplog):
+    tracker = usage.UsageTracker(persist_path=str(tmp_path / "missing" / "usage.jsonl"))
+    tracker.record("respond", _message(), user_id="u", thread_id="t")
+
+    assert tracker.flush(timeout=5)
+    assert tracker._writer.is_alive()
+    assert "Dropped 1 usage records" in caplog.text
+    assert tracker.user_totals("u")["respond"]["calls"] == 1